@@ -30,6 +30,7 @@ from mismo.joins import join_condition as join_condition
 from mismo.joins import left as left
 from mismo.joins import right as right
 from mismo.linkage import Linkage as Linkage
+from mismo.linker import EmbeddingLinker as EmbeddingLinker
 from mismo.linker import EmptyLinker as EmptyLinker
 from mismo.linker import FullLinker as FullLinker
 from mismo.linker import IDLinker as IDLinker
@@ -42,6 +43,7 @@ from mismo.types import DiffStats as DiffStats
 from mismo.types import LinkCountsTable as LinkCountsTable
 from mismo.types import LinkedTable as LinkedTable
 from mismo.types import LinksTable as LinksTable
+from mismo.types import TableStats as TableStats
 from mismo.types import UnionTable as UnionTable
 from mismo.types import Updates as Updates
 
@@ -7,6 +7,7 @@ import ibis
 from ibis import _
 from ibis.expr import types as ir
 
+from mismo.types._stats import TableStats
 from mismo.types._wrapper import TableWrapper
 
 if TYPE_CHECKING:
@@ -42,6 +43,10 @@ class CountsTable(TableWrapper):
         raw = self.n.sum().execute()
         return int(raw) if raw is not None else 0
 
+    def stats(self) -> TableStats:
+        """Row count and null counts, computed in one query and cached."""
+        return TableStats.of(self.__wrapped__)
+
     def chart(self) -> alt.Chart:
         return _counts_chart(self, hist_spec=self._HIST_SPEC)
 
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import atexit
 import base64
+from collections import OrderedDict
 from collections.abc import Iterable, Mapping, Sequence
 from contextlib import contextmanager
 import datetime
 import decimal
+import functools
+import os
 from typing import Any, Callable, Literal, TypeVar, cast, overload
 import uuid
 import warnings
@@ -512,6 +516,143 @@ def _check_collisions(collisions, on_collision, rename_as, columns):
         f()
 
 
+def distinct_udf(
+    func: Callable[[Any], Any],
+    *,
+    input_type: dt.DataType | str,
+    output_type: dt.DataType | str,
+    cache_size: int | None = 2**16,
+    batched: bool = False,
+) -> Callable[[ir.Value], ir.Value]:
+    """Wrap a python function of one value into a vectorized, memoized UDF.
+
+    The returned UDF receives whole pyarrow batches of values.
+    Within each batch, `func` is only called once per distinct non-null value,
+    and results are remembered between batches in an LRU cache
+    of up to `cache_size` entries (unbounded if None).
+    NULL inputs return NULL without calling `func`.
+
+    If `batched` is True, `func` is instead called once per batch
+    with a list of all the distinct values that aren't already cached,
+    and must return a list of results in the same order.
+    This is useful when `func` has a fast path for many inputs at once,
+    eg a spaCy model's `nlp.pipe()`.
+
+    `func` must return python objects that pyarrow can convert to `output_type`.
+    """
+    input_type = dt.dtype(input_type)
+    output_type = dt.dtype(output_type)
+    cache = _LRUCache(cache_size)
+
+    def compute_batch(values: list) -> list:
+        in_batch: dict[Any, Any] = {}
+        misses: dict[Any, Any] = {}
+        for v in values:
+            if v is None:
+                continue
+            k = _freeze(v)
+            if k in in_batch or k in misses:
+                continue
+            result = cache.get(k, NOT_SET)
+            if result is NOT_SET:
+                misses[k] = v
+            else:
+                in_batch[k] = result
+        if batched:
+            computed = func(list(misses.values())) if misses else []
+        else:
+            computed = [func(v) for v in misses.values()]
+        for k, result in zip(misses, computed, strict=True):
+            cache.put(k, result)
+            in_batch[k] = result
+        return [None if v is None else in_batch[_freeze(v)] for v in values]
+
+    def udf_impl(arr):
+        import pyarrow as pa
+
+        results = compute_batch(arr.to_pylist())
+        return pa.array(results, type=output_type.to_pyarrow())
+
+    udf_impl.__name__ = getattr(func, "__name__", "distinct_udf")
+    return ibis.udf.scalar.pyarrow(
+        udf_impl, signature=((input_type,), output_type), name=unique_name()
+    )
+
+
+def map_chunks(
+    func: Callable[[list], list],
+    values: list,
+    *,
+    chunk_size: int,
+    n_process: int = 1,
+    initializer: Callable[[], Any] | None = None,
+) -> list:
+    """Apply a list->list `func` to `values` in chunks, maybe in worker processes.
+
+    If `n_process` is 1, this runs in the current process.
+    Otherwise, chunks are spread across a pool of `n_process` worker processes
+    (all CPUs if `n_process` is -1).
+    The pool is created the first time it is needed and then reused,
+    so `initializer`, eg loading a model, only runs once per worker.
+    `initializer` is not run when everything happens in the current process.
+    `func` and `initializer` must be picklable, eg module-level functions.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    if n_process == -1:
+        n_process = os.cpu_count() or 1
+    if n_process < 1:
+        raise ValueError(f"n_process must be -1 or at least 1, got {n_process}")
+    chunks = [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
+    if n_process == 1 or len(chunks) <= 1:
+        results = [func(chunk) for chunk in chunks]
+    else:
+        results = list(_process_pool(n_process, initializer).map(func, chunks))
+    return [r for chunk_result in results for r in chunk_result]
+
+
+@functools.cache
+def _process_pool(n_process: int, initializer: Callable[[], Any] | None):
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    # Don't fork, we are probably inside a multithreaded backend like duckdb.
+    context = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(
+        max_workers=n_process, mp_context=context, initializer=initializer
+    )
+    atexit.register(pool.shutdown)
+    return pool
+
+
+class _LRUCache:
+    def __init__(self, maxsize: int | None) -> None:
+        self._maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def put(self, key, value) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self._maxsize is not None and len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+
+def _freeze(v: Any) -> Any:
+    """Make a python value from pyarrow.to_pylist() hashable."""
+    if isinstance(v, dict):
+        return tuple((k, _freeze(x)) for k, x in v.items())
+    if isinstance(v, list):
+        return tuple(_freeze(x) for x in v)
+    return v
+
+
 def check_schemas_equal(
     a: ibis.Schema | ibis.Table, b: ibis.Schema | ibis.Table, /
 ) -> None:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from mismo.arrays._array import array_best_match as array_best_match
 from mismo.arrays._array import array_choice as array_choice
 from mismo.arrays._array import array_combinations as array_combinations
 from mismo.arrays._array import (
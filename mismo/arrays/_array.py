@@ -4,11 +4,11 @@ from collections.abc import Iterable
 from typing import Callable
 
 import ibis
-from ibis import _
 from ibis.expr import datatypes as dt
 from ibis.expr import types as ir
 
 from mismo import _util
+from mismo.arrays._builtins import array_min as _array_min
 
 
 def array_combinations(left: ir.ArrayValue, right: ir.ArrayValue) -> ir.ArrayValue:
@@ -76,6 +76,89 @@ def array_combinations_first_n(
     return results
 
 
+def array_best_match(
+    left: ir.ArrayValue,
+    right: ir.ArrayValue,
+    level: Callable[[ir.Value, ir.Value], ir.IntegerValue],
+    *,
+    key: Callable[[ir.Value], ir.Value | ir.ArrayValue] | None = None,
+    key_level: int | None = None,
+) -> ir.IntegerValue:
+    """The best (lowest) `level` between any element of `left` and any of `right`.
+
+    Without `key`, this is the same as
+    `array_min(array_combinations(left, right).map(lambda p: level(p.l, p.r)))`,
+    which evaluates `level` for all `len(left) * len(right)` combinations.
+
+    Often the best possible level is an exact match that is much cheaper to find,
+    eg two email addresses being identical.
+    If you give a `key`, then first the keys of the two arrays are intersected,
+    and if they share any key, the result is `key_level`,
+    without evaluating `level` at all.
+    Only the rows with no shared key fall through to the full cross product.
+    So `key` must be chosen such that if two elements have the same key,
+    then `level` would give `key_level`, and no combination can do better.
+
+    Parameters
+    ----------
+    left
+        The first array.
+    right
+        The second array.
+    level
+        A function that takes an element of `left` and an element of `right`
+        and returns an integer level, where lower is better.
+    key
+        A function that takes an element of either array and returns its key,
+        or an array of keys. NULL keys never match, so if a key is a struct,
+        make the whole struct NULL when any of its fields are NULL.
+    key_level
+        The level to return when the arrays share a key.
+        Required if `key` is given.
+
+    Returns
+    -------
+    best_level
+        NULL if either array is NULL or empty.
+
+    Examples
+    --------
+    >>> import ibis
+    >>> from mismo.arrays import array_best_match
+    >>> left = ibis.literal(["alice", "bob"])
+    >>> right = ibis.literal(["bobby", "alice"])
+    >>> def level(a, b):
+    ...     return (a == b).ifelse(0, a.levenshtein(b))
+    >>> array_best_match(left, right, level, key=lambda x: x, key_level=0).execute()
+    0
+    >>> array_best_match(left, ibis.literal(["bobby"]), level).execute()
+    2
+    """
+    combos = array_combinations(left, right)
+    best = _array_min(combos.map(lambda pair: level(pair.l, pair.r)))
+    if key is None:
+        return best
+    if key_level is None:
+        raise ValueError("key_level must be given if key is given")
+    shares_key = _list_has_any(_keys(left, key), _keys(right, key))
+    return _util.cases(
+        (shares_key, ibis.literal(key_level, type=best.type())),
+        else_=best,
+    )
+
+
+def _keys(array: ir.ArrayValue, key: Callable) -> ir.ArrayValue:
+    keys = array.map(key)
+    if keys.type().value_type.is_array():
+        keys = keys.flatten()
+    return keys
+
+
+@ibis.udf.scalar.builtin(name="list_has_any")
+def _list_has_any(a, b) -> bool:
+    """Whether the arrays share a non-NULL element. Uses a hash set internally."""
+
+
 def array_filter_isin_other(
     t: ir.Table,
     array: ir.ArrayColumn | str,
@@ -91,6 +174,15 @@ def array_filter_isin_other(
 
     See [issues/32](https://github.com/NickCrews/mismo/issues/32) for more info.
 
+    Instead, `other` is executed once, right away, and its distinct values
+    are held in memory as a hash set.
+    Then each array is filtered in place in a single vectorized pass,
+    without unnesting the arrays and joining them back.
+    So `other` should fit comfortably in memory.
+
+    The order of the kept elements is preserved.
+    NULL elements are always kept, and NULL arrays stay NULL.
+
     Parameters
     ----------
     t :
@@ -111,28 +203,44 @@ def array_filter_isin_other(
         filtered array.
     """  # noqa E501
     array_val = _util.bind_one(t, array)
-    t = t.mutate(__array=array_val, __id=ibis.row_number())
-    temp = t.select("__id", __unnested=_.__array.unnest())
-    # When we re-.collect() items below, the order matters,
-    # but the .filter() can mess up the order, so we need to
-    # add a sortable key before the filter
-    filtered = temp.mutate(elem_id=ibis.row_number()).filter(
-        temp.__unnested.isin(other) | temp.__unnested.isnull()
-    )
-    re_agged = filtered.group_by("__id").agg(
-        __filtered=filtered.__unnested.collect(include_null=True, order_by="elem_id")
-    )
-    re_joined = t.left_join(re_agged, "__id").drop("__id", "__id_right")
-    # when we unnested, both [] and NULL rows disappeared.
-    # Once we join back, they all come back as NULL,
-    # so we need to adjust some of them back to [].
-    re_joined = re_joined.mutate(
-        __filtered=(_.__array.notnull() & _.__filtered.isnull()).ifelse(
-            [], _.__filtered
-        )
-    ).drop("__array")
+    value_set = other.to_pyarrow()
     result_name = result_format.format(name=array_val.get_name())
-    return re_joined.rename({result_name: "__filtered"})
+    filtered = _filter_isin_udf(array_val.type(), value_set)(array_val)
+    return t.mutate(filtered.name(result_name))
+
+
+def _filter_isin_udf(array_type: dt.Array, values):
+    """A UDF that keeps the elements of each array that are in `values` (or NULL)."""
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    value_type = array_type.value_type.to_pyarrow()
+    if hasattr(values, "combine_chunks"):
+        values = values.combine_chunks()
+    value_set = pc.unique(values.drop_null()).cast(value_type)
+
+    def filter_isin(arr):
+        if hasattr(arr, "combine_chunks"):
+            arr = arr.combine_chunks()
+        flat = pc.list_flatten(arr)
+        keep = pc.or_kleene(pc.is_in(flat, value_set=value_set), pc.is_null(flat))
+        keep = keep.to_numpy(zero_copy_only=False)
+        parents = pc.list_parent_indices(arr).to_numpy(zero_copy_only=False)
+        n_kept = np.bincount(parents[keep], minlength=len(arr))
+        offsets = np.zeros(len(arr) + 1, dtype="int32")
+        offsets[1:] = np.cumsum(n_kept)
+        return pa.ListArray.from_arrays(
+            pa.array(offsets),
+            flat.filter(pa.array(keep)),
+            mask=arr.is_null(),
+        )
+
+    return ibis.udf.scalar.pyarrow(
+        filter_isin,
+        signature=((array_type,), array_type),
+        name=_util.unique_name("filter_isin"),
+    )
 
 
 def _list_select(x: ir.ArrayValue, indexes: ir.ArrayValue) -> ir.ArrayValue:
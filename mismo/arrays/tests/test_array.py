@@ -201,3 +201,49 @@ def test_array_filter_isin_other(table_factory, column_factory, inp, other):
 
     assert len(df) == len(pairs)
     assert df.filtered.tolist() == [baseline(x) for x in df.inp.tolist()]
+
+
+def test_array_filter_isin_other_many_rows(table_factory):
+    inp = [["c", "a", "b"], None, ["b", None, "d", "a"], [], ["d", "c"]] * 100
+    t = table_factory({"id": range(len(inp)), "inp": inp})
+    other = table_factory({"x": ["a", "c", "c", None, "z"]}).x
+    filtered = arrays.array_filter_isin_other(t, t.inp, other).order_by("id")
+    assert filtered.columns == ("id", "inp", "inp_filtered")
+    expected = [["c", "a"], None, [None, "a"], [], ["c"]] * 100
+    assert filtered.inp_filtered.execute().tolist() == expected
+
+
+@pytest.mark.parametrize(
+    "left,right,expected",
+    [
+        pytest.param(["ab", "cd"], ["cd", "xy"], 0, id="shared"),
+        pytest.param(["ab", "cd"], ["ax", "zz"], 1, id="near"),
+        pytest.param(["ab"], ["zz", "yy"], 2, id="far"),
+        pytest.param(["ab", None], [None, "zz"], 2, id="nulls_dont_match"),
+        pytest.param([], ["ab"], None, id="empty"),
+        pytest.param(None, ["ab"], None, id="null"),
+    ],
+)
+@pytest.mark.parametrize("use_key", [False, True])
+def test_array_best_match(table_factory, left, right, expected, use_key):
+    t = table_factory(
+        {"left": [left], "right": [right]},
+        schema={"left": "array<string>", "right": "array<string>"},
+    )
+
+    def level(a, b):
+        return ibis.cases((a == b, 0), (a[0] == b[0], 1), else_=2)
+
+    kwargs = dict(key=lambda x: x, key_level=0) if use_key else {}
+    result = arrays.array_best_match(t.left, t.right, level, **kwargs)
+    result = result.as_scalar().execute()
+    if expected is None:
+        assert pd.isna(result)
+    else:
+        assert result == expected
+
+
+def test_array_best_match_needs_key_level():
+    a = ibis.literal(["a"])
+    with pytest.raises(ValueError, match="key_level"):
+        arrays.array_best_match(a, a, lambda x, y: 0, key=lambda x: x)
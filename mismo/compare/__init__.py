@@ -7,6 +7,8 @@ from __future__ import annotations
 
 from ibis_enum import IbisEnum as IbisEnum
 
+from mismo.compare._cache import CachedComparer as CachedComparer
 from mismo.compare._comparer import PComparer as PComparer
+from mismo.compare._distinct import DistinctPairsComparer as DistinctPairsComparer
 from mismo.compare._enum_comparer import EnumComparer as EnumComparer
 from mismo.compare._plot import compared_dashboard as compared_dashboard
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Generic, Literal
+
+import ibis
+from ibis.expr import types as ir
+
+from mismo import _util
+from mismo.compare._enum_comparer import EnumComparer, IbisEnumT
+
+
+class CachedComparer(Generic[IbisEnumT]):
+    """Wraps an [EnumComparer][mismo.compare.EnumComparer] with a persistent cache.
+
+    The results of the wrapped comparer are stored in a directory of parquet
+    files, keyed by (fingerprint of left record, fingerprint of right record).
+    A fingerprint is a hash of the record's columns, so if neither record
+    in a pair has changed since the last run, the level is read from the
+    cache instead of being recomputed.
+    Only pairs with new or changed records are run through the wrapped comparer,
+    and those results are appended to the cache.
+
+    The cache for a comparer is stored in the subdirectory
+    `<directory>/comparer=<name>/version=<version>/`.
+    If you change the cases or levels of the comparer, you must bump `version`,
+    otherwise stale levels will be read from the cache.
+
+    Examples
+    --------
+    >>> import ibis
+    >>> from ibis import _
+    >>> from ibis_enum import IbisEnum
+    >>> from mismo.compare import CachedComparer, EnumComparer
+    >>> class NameLevel(IbisEnum):
+    ...     EXACT = 0
+    ...     ELSE = 1
+    >>> comparer = EnumComparer(
+    ...     "name",
+    ...     NameLevel,
+    ...     [(_.name_l == _.name_r, NameLevel.EXACT), (True, NameLevel.ELSE)],
+    ... )
+    >>> cached = CachedComparer(comparer, "comparisons_cache/")  # doctest: +SKIP
+    >>> cached(pairs)  # computes every pair # doctest: +SKIP
+    >>> cached(pairs)  # reads every pair from the cache # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        comparer: EnumComparer[IbisEnumT],
+        directory: str | Path,
+        *,
+        version: str = "0",
+        columns: Iterable[str] | None = None,
+    ) -> None:
+        """Create a CachedComparer.
+
+        Parameters
+        ----------
+        comparer
+            The EnumComparer to wrap.
+        directory
+            The root directory of the cache. It will be created if needed.
+            Many comparers can share the same root directory.
+        version
+            The version of the comparer.
+            Bump this whenever the logic of the comparer changes.
+        columns
+            The names of the record columns (without the `_l` and `_r` suffixes)
+            that are hashed into the record fingerprints.
+            These should be all the columns that `comparer` looks at.
+            If one is missing, and pairs with the same fingerprints get
+            different levels, calling this raises a ValueError.
+            If None, all `*_l` and `*_r` columns except `record_id` are used.
+        """
+        self.comparer = comparer
+        self.directory = Path(directory)
+        self.version = str(version)
+        self.columns = None if columns is None else tuple(columns)
+
+    comparer: EnumComparer[IbisEnumT]
+    """The wrapped comparer."""
+    directory: Path
+    """The root directory of the cache."""
+    version: str
+    """The version of the wrapped comparer."""
+    columns: tuple[str, ...] | None
+    """The record columns that are hashed into the fingerprints."""
+
+    @property
+    def name(self) -> str:
+        """The name of the wrapped comparer."""
+        return self.comparer.name
+
+    @property
+    def levels(self) -> type[IbisEnumT]:
+        """The levels of the wrapped comparer."""
+        return self.comparer.levels
+
+    @property
+    def representation(self) -> Literal["string", "integer"]:
+        """The native representation of the levels of the wrapped comparer."""
+        return self.comparer.representation
+
+    @property
+    def path(self) -> Path:
+        """The directory where the parquet files for this comparer are stored."""
+        return self.directory / f"comparer={self.name}" / f"version={self.version}"
+
+    def cached(self, backend: ibis.BaseBackend | None = None) -> ir.Table | None:
+        """The cached table of (fingerprint_l, fingerprint_r, level).
+
+        Returns None if nothing has been cached yet.
+        """
+        if not any(self.path.glob("*.parquet")):
+            return None
+        if backend is None:
+            backend = ibis.get_backend()
+        return backend.read_parquet(self.path / "*.parquet")
+
+    def fingerprint(self, pairs: ir.Table, suffix: str) -> ir.IntegerColumn:
+        """A hash of all the record columns with the given suffix, eg "_l"."""
+        if self.columns is None:
+            names = [
+                c[: -len(suffix)]
+                for c in pairs.columns
+                if c.endswith(suffix) and c != "record_id" + suffix
+            ]
+        else:
+            names = list(self.columns)
+        if not names:
+            raise ValueError(f"No columns with suffix {suffix} to fingerprint")
+        fields = {name: _hashable(pairs[name + suffix]) for name in sorted(names)}
+        return ibis.struct(fields).hash()
+
+    def __call__(
+        self,
+        pairs: ir.Table,
+        *,
+        representation: Literal["string", "integer"] | None = None,
+    ) -> ir.Table:
+        """Label each record pair, reusing cached levels wherever possible.
+
+        This eagerly executes the comparer on the uncached pairs,
+        and writes those new results to the cache, before returning.
+
+        Parameters
+        ----------
+        pairs : Table
+            A table of record pairs.
+        representation
+            The representation of the levels in the result.
+            If None, use the representation of the wrapped comparer.
+
+        Returns
+        -------
+        labels : Table
+            The input table with an additional column named `self.name`
+            that contains the level that each record pair matches.
+        """
+        if representation is None:
+            representation = self.representation
+        fp_l = _util.unique_name("fingerprint_l")
+        fp_r = _util.unique_name("fingerprint_r")
+        level = _util.unique_name("level")
+        if self.name in pairs.columns:
+            pairs = pairs.drop(self.name)
+        pairs = pairs.mutate(
+            self.fingerprint(pairs, "_l").name(fp_l),
+            self.fingerprint(pairs, "_r").name(fp_r),
+        )
+
+        cached = self.cached(pairs._find_backend(use_default=True))
+        if cached is None:
+            lookup = None
+            misses = pairs
+        else:
+            lookup = cached.select(
+                **{fp_l: "fingerprint_l", fp_r: "fingerprint_r", level: "level"}
+            )
+            misses = pairs.anti_join(lookup, [fp_l, fp_r])
+
+        computed = self.comparer(misses, representation="integer")
+        n_levels = _util.unique_name("n_levels")
+        computed = (
+            computed.group_by([fp_l, fp_r])
+            .agg(
+                computed[self.name].cast("int64").arbitrary().name(level),
+                computed[self.name].nunique().name(n_levels),
+            )
+            .cache()
+        )
+        counts = computed.agg(
+            n=computed.count(), max_levels=computed[n_levels].max().fill_null(0)
+        )
+        n_computed, max_levels = counts.execute().iloc[0]
+        if max_levels > 1:
+            raise ValueError(
+                f"Some record pairs with the same fingerprints got different levels "
+                f"from {self.name}. `columns` must include every column it uses."
+            )
+        computed = computed.drop(n_levels)
+        if n_computed > 0:
+            self.path.mkdir(parents=True, exist_ok=True)
+            computed.rename(
+                fingerprint_l=fp_l, fingerprint_r=fp_r, level=level
+            ).to_parquet(self.path / f"{_util.unique_name('part')}.parquet")
+        lookup = computed if lookup is None else ibis.union(lookup, computed)
+
+        result = pairs.left_join(lookup, [fp_l, fp_r])
+        result = result.drop(fp_l, fp_r, fp_l + "_right", fp_r + "_right")
+        labels = result[level]
+        if representation == "string":
+            labels = self.levels.to_stringy(labels)
+        elif representation != "integer":
+            raise ValueError(f"Invalid representation: {representation}")
+        return result.mutate(labels.name(self.name)).drop(level)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.comparer!r}, path={self.path})"
+
+
+def _hashable(val: ir.Value) -> ir.Value:
+    # duckdb hashes some different nested values the same, eg [] and NULL,
+    # or {a: NULL} and NULL, so hash their unambiguous JSON text instead.
+    if val.type().is_nested():
+        return val.cast("json").cast("string")
+    return val
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+import ibis
+from ibis.expr import types as ir
+
+from mismo import _util
+
+
+class DistinctPairsComparer:
+    """Wraps a comparer so it is only evaluated once per distinct pair of values.
+
+    Blocked record pairs often contain the same pair of values many times,
+    eg ("SMITH", "SMYTH") might appear millions of times.
+    This projects the distinct combinations of the given `columns`,
+    runs the wrapped comparer on only those, and joins the results back
+    onto all the record pairs.
+    This is a big win when the comparison is expensive
+    (eg edit distances, or a python UDF) and the values are repetitive.
+
+    If the comparison is symmetric, ie comparing (a, b) gives the same result
+    as comparing (b, a), pass `symmetric=True`. Then the pairs are put in
+    a canonical order before deduplicating, so (a, b) and (b, a)
+    are only compared once.
+
+    This works with any [EnumComparer][mismo.compare.EnumComparer],
+    or any other [PComparer][mismo.compare.PComparer],
+    as long as it only looks at the given `columns`.
+
+    Examples
+    --------
+    >>> import ibis
+    >>> from ibis import _
+    >>> from ibis_enum import IbisEnum
+    >>> from mismo import text
+    >>> from mismo.compare import DistinctPairsComparer, EnumComparer
+    >>> class NameLevel(IbisEnum):
+    ...     CLOSE = 0
+    ...     ELSE = 1
+    >>> comparer = EnumComparer(
+    ...     "name",
+    ...     NameLevel,
+    ...     [
+    ...         (text.jaro_winkler_similarity(_.name_l, _.name_r) > 0.8, "CLOSE"),
+    ...         (True, "ELSE"),
+    ...     ],
+    ... )
+    >>> distinct = DistinctPairsComparer(comparer, ["name"], symmetric=True)
+    >>> pairs = ibis.memtable(
+    ...     {
+    ...         "record_id_l": [0, 1, 2],
+    ...         "record_id_r": [3, 4, 5],
+    ...         "name_l": ["SMITH", "SMYTH", "SMITH"],
+    ...         "name_r": ["SMYTH", "SMITH", "SMYTH"],
+    ...     }
+    ... )
+    >>> distinct(pairs).order_by("record_id_l").name.execute().tolist()
+    [0, 0, 0]
+    """
+
+    def __init__(
+        self,
+        comparer: Any,
+        columns: Iterable[str],
+        *,
+        symmetric: bool = False,
+    ) -> None:
+        """Create a DistinctPairsComparer.
+
+        Parameters
+        ----------
+        comparer
+            The comparer to wrap.
+        columns
+            The names of the record columns (without the `_l` and `_r` suffixes)
+            that the wrapped comparer looks at, eg `["name"]`.
+        symmetric
+            Whether the wrapped comparer gives the same result if the left
+            and right values are swapped.
+        """
+        self.comparer = comparer
+        self.columns = tuple(columns)
+        if not self.columns:
+            raise ValueError("Must provide at least one column")
+        self.symmetric = symmetric
+
+    comparer: Any
+    """The wrapped comparer."""
+    columns: tuple[str, ...]
+    """The record columns that the wrapped comparer looks at."""
+    symmetric: bool
+    """Whether (a, b) and (b, a) are considered the same pair of values."""
+
+    @property
+    def name(self) -> str:
+        """The name of the wrapped comparer."""
+        return self.comparer.name
+
+    @property
+    def levels(self):
+        """The levels of the wrapped comparer, if it is an EnumComparer."""
+        return self.comparer.levels
+
+    def __call__(self, pairs: ir.Table, **kwargs) -> ir.Table:
+        """Compare each distinct pair of values, and join the results back.
+
+        Parameters
+        ----------
+        pairs
+            A table of record pairs.
+        kwargs
+            Passed to the wrapped comparer, eg `representation="string"`.
+
+        Returns
+        -------
+        compared
+            The input table with the columns that the wrapped comparer adds.
+        """
+        left = [c + "_l" for c in self.columns]
+        right = [c + "_r" for c in self.columns]
+        keys_l = [_util.unique_name(c + "_l") for c in self.columns]
+        keys_r = [_util.unique_name(c + "_r") for c in self.columns]
+        if self.symmetric:
+            swap = (
+                ibis.struct({c: pairs[c] for c in left}).hash()
+                > ibis.struct({c: pairs[c] for c in right}).hash()
+            )
+        else:
+            swap = ibis.literal(False)
+        keyed = pairs.mutate(
+            **{
+                k: swap.ifelse(pairs[cr], pairs[cl])
+                for k, cl, cr in zip(keys_l, left, right)
+            },
+            **{
+                k: swap.ifelse(pairs[cl], pairs[cr])
+                for k, cl, cr in zip(keys_r, left, right)
+            },
+        )
+
+        distinct = keyed.select(
+            **dict(zip(left, keys_l)), **dict(zip(right, keys_r))
+        ).distinct()
+        compared = self.comparer(distinct, **kwargs)
+        if isinstance(compared, ir.Value):
+            compared = distinct.mutate(compared)
+        added = [c for c in compared.columns if c not in distinct.columns]
+        lookup = compared.rename(
+            **dict(zip(keys_l, left)), **dict(zip(keys_r, right))
+        ).select(*keys_l, *keys_r, *added)
+
+        base = keyed.drop(*(c for c in added if c in keyed.columns))
+        predicates = [base[k].identical_to(lookup[k]) for k in (*keys_l, *keys_r)]
+        result = base.left_join(lookup, predicates)
+        return result.select(*(c for c in pairs.columns if c not in added), *added)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.comparer!r}, columns={self.columns}, "
+            f"symmetric={self.symmetric})"
+        )
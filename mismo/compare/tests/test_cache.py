@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from ibis import _
+from ibis_enum import IbisEnum
+import pytest
+
+from mismo.compare import CachedComparer, EnumComparer
+
+
+class NameLevel(IbisEnum):
+    EXACT = 0
+    CLOSE = 1
+    ELSE = 2
+
+
+@pytest.fixture
+def comparer():
+    return EnumComparer(
+        name="name",
+        levels=NameLevel,
+        cases=[
+            (_.name_l == _.name_r, NameLevel.EXACT),
+            (_.name_l[:2] == _.name_r[:2], NameLevel.CLOSE),
+            (True, NameLevel.ELSE),
+        ],
+    )
+
+
+@pytest.fixture
+def pairs(table_factory):
+    return table_factory(
+        {
+            "record_id_l": [0, 1, 2],
+            "record_id_r": [10, 11, 12],
+            "name_l": ["alice", "bob", "carl"],
+            "name_r": ["alice", "bobby", "dave"],
+        }
+    )
+
+
+def _labels(t, name="name"):
+    return dict(t.select("record_id_l", name).execute().values.tolist())
+
+
+def _n_cached_files(cached: CachedComparer) -> int:
+    return len(list(cached.path.glob("*.parquet")))
+
+
+def test_cached_comparer_reuses_results(tmp_path, comparer, pairs):
+    cached = CachedComparer(comparer, tmp_path)
+    expected = {0: 0, 1: 1, 2: 2}
+    assert _labels(comparer(pairs)) == expected
+
+    assert _labels(cached(pairs)) == expected
+    assert _n_cached_files(cached) == 1
+    assert cached.cached().count().execute() == 3
+
+    # nothing changed, so nothing new is computed or written
+    assert _labels(cached(pairs)) == expected
+    assert _n_cached_files(cached) == 1
+
+    # only the changed pair is computed and appended
+    changed = pairs.mutate(
+        name_r=(_.record_id_l == 2).ifelse("carla", _.name_r),
+    )
+    assert _labels(cached(changed)) == {0: 0, 1: 1, 2: 1}
+    assert _n_cached_files(cached) == 2
+    assert cached.cached().count().execute() == 4
+
+
+def test_cached_comparer_string_representation(tmp_path, comparer, pairs):
+    cached = CachedComparer(comparer, tmp_path)
+    result = cached(pairs, representation="string")
+    assert _labels(result) == {0: "EXACT", 1: "CLOSE", 2: "ELSE"}
+
+
+def test_cached_comparer_version(tmp_path, comparer, pairs):
+    v0 = CachedComparer(comparer, tmp_path)
+    v1 = CachedComparer(comparer, tmp_path, version="1")
+    v0(pairs)
+    assert v1.cached() is None
+    v1(pairs)
+    assert _n_cached_files(v0) == 1
+    assert _n_cached_files(v1) == 1
+
+
+def test_cached_comparer_columns(tmp_path, comparer, pairs):
+    # Columns not listed in `columns` don't affect the fingerprint.
+    cached = CachedComparer(comparer, tmp_path, columns=["name"])
+    cached(pairs)
+    cached(pairs.mutate(other_l=1, other_r=2))
+    assert _n_cached_files(cached) == 1
+
+
+def test_cached_comparer_columns_missing(tmp_path, comparer, table_factory):
+    # The comparer reads name, but only age is fingerprinted,
+    # so all these pairs share one fingerprint despite different levels.
+    pairs = table_factory(
+        {
+            "record_id_l": [0, 1, 2],
+            "record_id_r": [10, 11, 12],
+            "name_l": ["alice", "bob", "carl"],
+            "name_r": ["alice", "bobby", "dave"],
+            "age_l": [30, 30, 30],
+            "age_r": [40, 40, 40],
+        }
+    )
+    cached = CachedComparer(comparer, tmp_path, columns=["age"])
+    with pytest.raises(ValueError, match="columns"):
+        cached(pairs)
+    assert cached.cached() is None
+
+
+class TagsLevel(IbisEnum):
+    MISSING = 0
+    EMPTY = 1
+    ELSE = 2
+
+
+def test_cached_comparer_nested_nulls(tmp_path, table_factory):
+    # duckdb hashes [] and NULL the same, but they must get different levels
+    comparer = EnumComparer(
+        name="tags",
+        levels=TagsLevel,
+        cases=[
+            (_.tags_l.isnull(), TagsLevel.MISSING),
+            (_.tags_l.length() == 0, TagsLevel.EMPTY),
+            (True, TagsLevel.ELSE),
+        ],
+    )
+    pairs = table_factory(
+        {
+            "record_id_l": [0, 1, 2],
+            "record_id_r": [10, 11, 12],
+            "tags_l": [[], None, [None]],
+            "tags_r": [["a"], ["a"], ["a"]],
+        },
+        schema={
+            "record_id_l": "int64",
+            "record_id_r": "int64",
+            "tags_l": "array<string>",
+            "tags_r": "array<string>",
+        },
+    )
+    cached = CachedComparer(comparer, tmp_path)
+    expected = {0: 1, 1: 0, 2: 2}
+    assert _labels(comparer(pairs), "tags") == expected
+    assert _labels(cached(pairs), "tags") == expected
+    assert _labels(cached(pairs), "tags") == expected
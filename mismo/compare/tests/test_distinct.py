@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import ibis
+from ibis import _
+from ibis_enum import IbisEnum
+import pytest
+
+from mismo.compare import DistinctPairsComparer, EnumComparer
+from mismo.lib.name import NameComparer
+
+
+class NameLevel(IbisEnum):
+    EXACT = 0
+    CLOSE = 1
+    ELSE = 2
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def comparer(calls):
+    @ibis.udf.scalar.python
+    def same_first_letter(a: str, b: str) -> bool:
+        calls.append((a, b))
+        return a[:1] == b[:1]
+
+    return EnumComparer(
+        name="name",
+        levels=NameLevel,
+        cases=[
+            (_.name_l == _.name_r, NameLevel.EXACT),
+            (same_first_letter(_.name_l, _.name_r), NameLevel.CLOSE),
+            (True, NameLevel.ELSE),
+        ],
+    )
+
+
+@pytest.fixture
+def pairs(table_factory):
+    return table_factory(
+        {
+            "record_id_l": [0, 1, 2, 3, 4, 5],
+            "record_id_r": [10, 11, 12, 13, 14, 15],
+            "name_l": ["smith", "smyth", "smith", "bob", "bob", None],
+            "name_r": ["smyth", "smith", "smyth", "bob", "alice", "bob"],
+        }
+    )
+
+
+def _labels(t):
+    return dict(t.select("record_id_l", "name").execute().values.tolist())
+
+
+@pytest.mark.parametrize("symmetric", [False, True])
+def test_distinct_pairs_same_result(comparer, pairs, symmetric):
+    expected = _labels(comparer(pairs))
+    wrapped = DistinctPairsComparer(comparer, ["name"], symmetric=symmetric)
+    result = wrapped(pairs)
+    assert result.columns == (*pairs.columns, "name")
+    assert _labels(result) == expected
+
+
+@pytest.mark.parametrize(
+    "symmetric, n_expected",
+    [
+        # (smith, smyth), (smyth, smith), (bob, alice)
+        (False, 3),
+        # (smith, smyth), (bob, alice)
+        (True, 2),
+    ],
+)
+def test_distinct_pairs_computed_once(comparer, pairs, calls, symmetric, n_expected):
+    wrapped = DistinctPairsComparer(comparer, ["name"], symmetric=symmetric)
+    wrapped(pairs).execute()
+    assert len(calls) == n_expected
+
+
+def test_distinct_pairs_string_representation(comparer, pairs):
+    wrapped = DistinctPairsComparer(comparer, ["name"], symmetric=True)
+    result = wrapped(pairs, representation="string")
+    assert _labels(result) == {
+        0: "CLOSE",
+        1: "CLOSE",
+        2: "CLOSE",
+        3: "EXACT",
+        4: "ELSE",
+        5: "ELSE",
+    }
+
+
+def test_distinct_pairs_name_comparer(table_factory):
+    # NameComparer returns a Value, not a Table
+    name_type = "struct<prefix: string, given: string, middle: string, surname: string, suffix: string, nickname: string>"  # noqa: E501
+    t = table_factory(
+        {
+            "record_id_l": [0, 1],
+            "record_id_r": [2, 3],
+            "name_l": [
+                {"given": "alice", "surname": "smith"},
+                {"given": "bob", "surname": "jones"},
+            ],
+            "name_r": [
+                {"given": "alice", "surname": "smith"},
+                {"given": "bobby", "surname": "jones"},
+            ],
+        }
+    )
+    t = t.cast({"name_l": name_type, "name_r": name_type})
+    comparer = NameComparer(result_column="name")
+    expected = t.mutate(comparer(t)).select("record_id_l", "name").execute()
+    wrapped = DistinctPairsComparer(comparer, ["name"], symmetric=True)
+    result = wrapped(t).select("record_id_l", "name").execute()
+    assert sorted(result.values.tolist()) == sorted(expected.values.tolist())
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from ._bootstrap import bootstrap_weights as bootstrap_weights
+from ._bootstrap import pattern_counts as pattern_counts
+from ._partitioned import link_partitioned as link_partitioned
 from ._plot import plot_weights as plot_weights
 from ._train import train_using_labels as train_using_labels
 from ._train import train_using_pairs as train_using_pairs
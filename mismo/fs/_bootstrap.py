@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable
+
+from ibis import _
+from ibis.expr import types as ir
+
+from mismo.compare import EnumComparer
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+def pattern_counts(compared: ir.Table, comparers: Iterable[EnumComparer]) -> ir.Table:
+    """Compress compared record pairs into counts of each comparison pattern.
+
+    A comparison pattern is one combination of levels, one level per comparer,
+    eg (name=EXACT, address=SAME_CITY).
+    Even if `compared` has billions of pairs, there are only as many patterns as
+    the product of the number of levels of each comparer,
+    and usually far fewer are actually observed.
+
+    Parameters
+    ----------
+    compared
+        A table of record pairs, with a column of labels for each comparer,
+        eg as returned by `comparer(pairs)`.
+    comparers
+        The comparers whose columns make up the pattern.
+
+    Returns
+    -------
+    ir.Table
+        A table with one column per comparer, holding the integer level,
+        and a column `n` with the number of pairs with that pattern.
+    """
+    columns = {c.name: c.levels.to_numericy(compared[c.name]) for c in comparers}
+    return compared.select(**columns).group_by(list(columns)).agg(n=_.count())
+
+
+def bootstrap_weights(
+    comparers: Iterable[EnumComparer],
+    m_patterns: ir.Table | pd.DataFrame,
+    u_patterns: ir.Table | pd.DataFrame,
+    *,
+    n_replicates: int = 1000,
+    confidence: float = 0.95,
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """Bootstrap confidence intervals for the m, u, and odds of every level.
+
+    Instead of resampling the record pairs, which would need to go through
+    the backend, this resamples the compressed
+    [pattern counts][mismo.fs.pattern_counts].
+    A bootstrap resample of N pairs is the same as drawing new pattern counts
+    from a multinomial distribution with N trials and probabilities equal to
+    the observed pattern proportions.
+    This is done in NumPy for all replicates at once,
+    so it takes about the same time no matter how many pairs were sampled.
+
+    m and u are estimated the same as in
+    [train_using_labels][mismo.fs.train_using_labels]:
+    the proportion of pairs at each level,
+    where a level with zero pairs is counted as one pair.
+
+    Parameters
+    ----------
+    comparers
+        The comparers to compute intervals for.
+    m_patterns
+        The pattern counts among true matches,
+        eg `pattern_counts(compared_true_pairs, comparers)`.
+        Needs a column per comparer and a count column `n`.
+    u_patterns
+        The pattern counts among non-matches,
+        eg from a random sample of all pairs.
+    n_replicates
+        The number of bootstrap replicates.
+    confidence
+        The width of the interval, eg 0.95 for the 2.5th to 97.5th percentiles.
+    seed
+        The random seed to use for resampling. If None, use a random seed.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per level, in the same order as the levels in the
+        [Weights][mismo.fs.Weights] you would train from these counts,
+        with columns `comparer`, `level`, and `m`, `m_low`, `m_high`,
+        `u`, `u_low`, `u_high`, `odds`, `odds_low`, `odds_high`.
+    """
+    import numpy as np
+    import pandas as pd
+
+    comparers = list(comparers)
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    rng = np.random.default_rng(seed)
+    quantiles = [(1 - confidence) / 2, (1 + confidence) / 2]
+    m_df = _to_pandas(m_patterns, comparers)
+    u_df = _to_pandas(u_patterns, comparers)
+    m_samples = _resample(m_df["n"].to_numpy(), n_replicates, rng)
+    u_samples = _resample(u_df["n"].to_numpy(), n_replicates, rng)
+
+    records = []
+    for comparer in comparers:
+        levels = list(comparer.levels)
+        m_point, m_reps = _proportions(m_df, m_samples, comparer)
+        u_point, u_reps = _proportions(u_df, u_samples, comparer)
+        odds_point = m_point / u_point
+        odds_reps = m_reps / u_reps
+        m_low, m_high = np.quantile(m_reps, quantiles, axis=0)
+        u_low, u_high = np.quantile(u_reps, quantiles, axis=0)
+        odds_low, odds_high = np.quantile(odds_reps, quantiles, axis=0)
+        for i, level in enumerate(levels):
+            # Same as make_weights()
+            if level.name == "else":
+                continue
+            records.append(
+                {
+                    "comparer": comparer.name,
+                    "level": level.name,
+                    "m": m_point[i],
+                    "m_low": m_low[i],
+                    "m_high": m_high[i],
+                    "u": u_point[i],
+                    "u_low": u_low[i],
+                    "u_high": u_high[i],
+                    "odds": odds_point[i],
+                    "odds_low": odds_low[i],
+                    "odds_high": odds_high[i],
+                }
+            )
+    return pd.DataFrame.from_records(
+        records,
+        columns=[
+            "comparer",
+            "level",
+            *(f"{p}{s}" for p in ("m", "u", "odds") for s in ("", "_low", "_high")),
+        ],
+    )
+
+
+def _to_pandas(
+    patterns: ir.Table | pd.DataFrame, comparers: list[EnumComparer]
+) -> pd.DataFrame:
+    if isinstance(patterns, ir.Table):
+        patterns = patterns.to_pandas()
+    missing = {"n", *(c.name for c in comparers)} - set(patterns.columns)
+    if missing:
+        raise ValueError(f"pattern counts are missing columns {sorted(missing)}")
+    return patterns.reset_index(drop=True)
+
+
+def _resample(
+    counts: np.ndarray, n_replicates: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Multinomial resamples of the counts, shape (n_replicates, n_patterns)."""
+    import numpy as np
+
+    counts = counts.astype("int64")
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros((n_replicates, len(counts)), dtype="int64")
+    return rng.multinomial(total, counts / total, size=n_replicates)
+
+
+def _proportions(
+    patterns: pd.DataFrame, samples: np.ndarray, comparer: EnumComparer
+) -> tuple[np.ndarray, np.ndarray]:
+    """The (point estimate, replicates) of the level proportions for a comparer."""
+    import numpy as np
+    import pandas as pd
+
+    levels = [int(level) for level in comparer.levels]
+    labels = patterns[comparer.name]
+    if not pd.api.types.is_integer_dtype(labels):
+        labels = labels.map(lambda name: int(comparer.levels[name]))
+    index = {level: i for i, level in enumerate(levels)}
+    # one_hot[p, l] is 1 if pattern p has level l
+    one_hot = np.zeros((len(patterns), len(levels)), dtype="int64")
+    one_hot[np.arange(len(patterns)), labels.map(index).to_numpy()] = 1
+    point = patterns["n"].to_numpy().astype("int64") @ one_hot
+    reps = samples @ one_hot
+
+    def normalize(counts: np.ndarray) -> np.ndarray:
+        # Same regularization as level_proportions():
+        # pretend we saw every level at least once.
+        counts = np.maximum(counts, 1)
+        return counts / counts.sum(axis=-1, keepdims=True)
+
+    return normalize(point), normalize(reps)
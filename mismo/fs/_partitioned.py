@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+import concurrent.futures
+import json
+import os
+from pathlib import Path
+import shutil
+from typing import Any
+
+import ibis
+from ibis.expr import datatypes as dt
+from ibis.expr import types as ir
+
+from mismo import _resolve, _util
+from mismo.compare import EnumComparer
+from mismo.fs._weights import Weights
+from mismo.linkage._linkage import (
+    _METADATA_FILE,
+    Linkage,
+    _write_links,
+    _write_records,
+)
+from mismo.linker._common import Linker, infer_task
+from mismo.linker._key_linker import KeyLinker
+from mismo.types._links_table import LinksTable
+
+_WORK_DIR = "_work"
+_CHECKPOINT_DIR = "_checkpoint"
+_JOB_FILE = "job.json"
+_WORK_PARTITION = "mismo_partition"
+# The same default as Linkage.to_parquets()
+_N_LINK_PARTITIONS = 16
+
+
+def link_partitioned(
+    left: ibis.Table,
+    right: ibis.Table,
+    *,
+    linker: Linker,
+    comparers: Iterable[EnumComparer],
+    weights: Weights,
+    directory: str | Path,
+    n_partitions: int = 64,
+    partition_by: Any = None,
+    n_process: int = 1,
+    min_odds: float | None = None,
+    overwrite: bool = False,
+) -> Linkage:
+    """Block, compare, and score two tables one partition at a time, writing to disk.
+
+    For very large tasks, eg deduping 100M records, generating all the links,
+    comparing them, and scoring them in one query can need far more memory
+    than you have, even when the backend can spill to disk.
+    This splits the records into `n_partitions` buckets by a hash of the
+    blocking key. Records can only be linked if they share the blocking key,
+    so they always land in the same bucket, and each bucket can be
+    linked, compared, and scored on its own.
+    The scored links of each bucket are appended to a Linkage on disk,
+    so memory use is bounded by the size of the biggest bucket,
+    not the whole task.
+
+    Progress is checkpointed after every bucket.
+    If the job dies part way through, eg from running out of memory,
+    call this again with the same arguments and it picks up where it left off,
+    only re-running the buckets that didn't finish.
+
+    Parameters
+    ----------
+    left
+        The left table of records.
+    right
+        The right table of records. If this is `left`, this is a dedupe task.
+    linker
+        The linker that generates the links within each bucket.
+        If this is a [KeyLinker][mismo.KeyLinker], its keys are used to
+        assign records to buckets.
+        For any other linker you must pass `partition_by`.
+    comparers
+        The comparers to label the links with.
+    weights
+        The weights to score the links with, as in
+        [Weights.compare_and_score][mismo.fs.Weights.compare_and_score].
+    directory
+        Where to write the result. Holds a Linkage in the layout of
+        [Linkage.to_parquets][mismo.Linkage.to_parquets] once the job is done,
+        and the partitioned inputs and the checkpoint while it is running.
+    n_partitions
+        The number of buckets to split the records into.
+        Use more if a single bucket doesn't fit in memory.
+    partition_by
+        The keys to assign records to buckets by, in any of the forms that
+        [KeyLinker][mismo.KeyLinker] accepts.
+        Every pair of records that `linker` could link must have equal keys.
+        If None, `linker` must be a KeyLinker, and its keys are used.
+    n_process
+        The number of buckets to run at once, each in its own worker process
+        with its own duckdb connection. -1 means one per CPU.
+        If 1, the buckets are run one after another in the current process,
+        on the backend of `left`.
+        With more than 1, `linker`, `comparers`, and `weights` must be
+        picklable, and they can't refer to any in-memory tables.
+    min_odds
+        If given, only keep links with at least these odds,
+        pruning hopeless pairs as early as possible.
+        See [Weights.compare_and_score][mismo.fs.Weights.compare_and_score].
+    overwrite
+        If False, raise a FileExistsError if a finished linkage is already in
+        `directory`. If True, throw away anything in `directory`, including
+        the progress of an unfinished job, and start over.
+
+    Returns
+    -------
+    Linkage
+        The scored linkage, read lazily from `directory`.
+        The links have columns `record_id_l`, `record_id_r`, `odds`,
+        and the label and odds of each comparer.
+    """
+    comparers = list(comparers)
+    if n_partitions < 1:
+        raise ValueError(f"n_partitions must be at least 1, got {n_partitions}")
+    if n_process == -1:
+        n_process = os.cpu_count() or 1
+    if n_process < 1:
+        raise ValueError(f"n_process must be -1 or at least 1, got {n_process}")
+    task = infer_task(task=getattr(linker, "task", None), left=left, right=right)
+    dedupe = task == "dedupe"
+
+    d = Path(directory)
+    job_path = d / _CHECKPOINT_DIR / _JOB_FILE
+    if (d / _METADATA_FILE).exists() and not overwrite:
+        raise FileExistsError(f"{d / _METADATA_FILE} already exists")
+    if job_path.exists() and not overwrite:
+        meta = json.loads(job_path.read_text())
+        if meta["n_partitions"] != n_partitions:
+            raise ValueError(
+                f"The unfinished job in {d} uses n_partitions={meta['n_partitions']}, "
+                f"got {n_partitions}. Pass overwrite=True to start over."
+            )
+    else:
+        meta = _start(left, right, d, linker, partition_by, n_partitions, dedupe)
+
+    job = _Job(
+        linker=linker,
+        comparers=comparers,
+        weights=weights,
+        directory=d,
+        dedupe=dedupe,
+        min_odds=min_odds,
+    )
+    todo = [p for p in range(n_partitions) if not _done_path(d, p).exists()]
+    if n_process == 1 or len(todo) <= 1:
+        backend = left.get_backend()
+        for p in todo:
+            _run_partition(job, p, backend=backend)
+    else:
+        pool = _util._process_pool(n_process, None)
+        futures = [pool.submit(_run_partition, job, p) for p in todo]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    n_links = sum(
+        json.loads(_done_path(d, p).read_text())["n_links"] for p in range(n_partitions)
+    )
+    (d / _METADATA_FILE).write_text(
+        json.dumps(
+            {
+                "n_partitions": _N_LINK_PARTITIONS,
+                "n_left": meta["n_left"],
+                "n_right": meta["n_right"],
+                "n_links": n_links,
+            },
+            indent=2,
+        )
+    )
+    shutil.rmtree(d / _WORK_DIR)
+    shutil.rmtree(d / _CHECKPOINT_DIR)
+    return Linkage.from_parquets(d, backend=left.get_backend())
+
+
+def _start(
+    left: ibis.Table,
+    right: ibis.Table,
+    d: Path,
+    linker: Linker,
+    partition_by: Any,
+    n_partitions: int,
+    dedupe: bool,
+) -> dict:
+    """Write the records and the bucketed inputs, and the job file last."""
+    for name in (_METADATA_FILE, "left.parquet", "right.parquet"):
+        (d / name).unlink(missing_ok=True)
+    for name in ("links", _WORK_DIR, _CHECKPOINT_DIR):
+        if (d / name).exists():
+            shutil.rmtree(d / name)
+    (d / _CHECKPOINT_DIR).mkdir(parents=True)
+
+    part_l, part_r = _partition_columns(linker, partition_by, left, right, n_partitions)
+    _write_bucketed(left, part_l, d / _WORK_DIR / "left")
+    meta = {
+        "n_partitions": n_partitions,
+        "n_left": _write_records(left, d / "left.parquet"),
+    }
+    if dedupe:
+        shutil.copyfile(d / "left.parquet", d / "right.parquet")
+        meta["n_right"] = meta["n_left"]
+    else:
+        _write_bucketed(right, part_r, d / _WORK_DIR / "right")
+        meta["n_right"] = _write_records(right, d / "right.parquet")
+    _write_json(d / _CHECKPOINT_DIR / _JOB_FILE, meta)
+    return meta
+
+
+def _partition_columns(
+    linker: Linker,
+    partition_by: Any,
+    left: ibis.Table,
+    right: ibis.Table,
+    n_partitions: int,
+) -> tuple[ir.IntegerValue, ir.IntegerValue]:
+    if partition_by is not None:
+        resolvers = _resolve.key_pair_resolvers(partition_by)
+    elif isinstance(linker, KeyLinker):
+        resolvers = linker.resolvers
+    else:
+        raise TypeError(
+            f"partition_by is required for a {type(linker).__name__}, "
+            "the keys can only be inferred from a KeyLinker"
+        )
+    keys_l = [resolver(left) for resolver, _ in resolvers]
+    keys_r = [resolver(right) for _, resolver in resolvers]
+    # Equal keys must hash equally, so hash them as the same type on both sides,
+    # eg an int32 in left and an int64 in right are both hashed as int64.
+    types = [
+        dt.highest_precedence([kl.type(), kr.type()])
+        for kl, kr in zip(keys_l, keys_r, strict=True)
+    ]
+
+    def partition(keys: list[ir.Value]) -> ir.IntegerValue:
+        s = ibis.struct(
+            {f"k{i}": k.cast(t) for i, (k, t) in enumerate(zip(keys, types))}
+        )
+        return (s.hash() % n_partitions).abs().cast("int32")
+
+    return partition(keys_l), partition(keys_r)
+
+
+def _write_bucketed(t: ir.Table, partition: ir.IntegerValue, directory: Path) -> None:
+    import pyarrow.dataset as ds
+
+    reader = t.mutate(**{_WORK_PARTITION: partition}).to_pyarrow_batches()
+    ds.write_dataset(
+        reader,
+        directory,
+        format="parquet",
+        partitioning=[_WORK_PARTITION],
+        partitioning_flavor="hive",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+    )
+
+
+class _Job:
+    """Everything a worker needs to run a bucket. Must be picklable."""
+
+    def __init__(
+        self,
+        *,
+        linker: Linker,
+        comparers: list[EnumComparer],
+        weights: Weights,
+        directory: Path,
+        dedupe: bool,
+        min_odds: float | None,
+    ) -> None:
+        self.linker = linker
+        self.comparers = comparers
+        self.weights = weights
+        self.directory = directory
+        self.dedupe = dedupe
+        self.min_odds = min_odds
+
+
+def _run_partition(
+    job: _Job, p: int, *, backend: ibis.BaseBackend | None = None
+) -> int:
+    """Link, compare, and score bucket `p`, append it to the links, and mark it done."""
+    if backend is None:
+        backend = ibis.duckdb.connect()
+    d = job.directory
+    left = _read_bucket(backend, d, "left", p)
+    right = left if job.dedupe else _read_bucket(backend, d, "right", p)
+    linkage = job.linker(left, right)
+    # Only join on the columns the comparers use, not every column of the records.
+    links = LinksTable(
+        linkage.links.select("record_id_l", "record_id_r"),
+        left=linkage.left,
+        right=linkage.right,
+    )
+    compared = links.with_both(needed_by=job.comparers)
+    scored = job.weights.compare_and_score(
+        compared, job.comparers, min_odds=job.min_odds
+    )
+    scored = scored.select(
+        "record_id_l",
+        "record_id_r",
+        "odds",
+        *[c for cmp in job.comparers for c in (cmp.name, f"{cmp.name}_odds")],
+    )
+    # If a previous attempt at this bucket died part way through writing,
+    # remove its files so its links aren't counted twice.
+    name = f"bucket-{p:05d}"
+    for pattern in (f"**/{name}-*.parquet", f"{name}.parquet"):
+        for path in (d / "links").glob(pattern):
+            path.unlink()
+    n = _write_links(scored, d / "links", n_partitions=_N_LINK_PARTITIONS, name=name)
+    _write_json(_done_path(d, p), {"n_links": n})
+    return n
+
+
+def _read_bucket(backend: ibis.BaseBackend, d: Path, side: str, p: int) -> ir.Table:
+    bucket = d / _WORK_DIR / side / f"{_WORK_PARTITION}={p}"
+    if bucket.exists():
+        return backend.read_parquet(bucket / "*.parquet", hive_partitioning=False)
+    # No records hashed to this bucket.
+    return backend.read_parquet(d / f"{side}.parquet").limit(0)
+
+
+def _done_path(d: Path, p: int) -> Path:
+    return d / _CHECKPOINT_DIR / f"bucket-{p:05d}.json"
+
+
+def _write_json(path: Path, obj: dict) -> None:
+    # Write then rename, so a crash never leaves a half-written file behind.
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(obj, indent=2))
+    tmp.replace(path)
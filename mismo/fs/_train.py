@@ -9,7 +9,8 @@ from ibis_enum import IbisEnum
 from mismo._util import sample_table
 from mismo.compare import EnumComparer
 from mismo.linkage import sample_all_links
-from mismo.linker import JoinLinker
+from mismo.linker import KeyLinker
+from mismo.types import LinksTable
 
 from ._weights import ComparerWeights, LevelWeights, Weights
 
@@ -71,7 +72,7 @@ def _train_us_using_sampling(
         specifications, before the final model is estimated.
     """
     sample = sample_all_links(left, right, max_pairs=max_pairs)
-    sample = sample.with_both()
+    sample = sample.with_both(needed_by=[comparer])
     labels = comparer(sample)[comparer.name]
     return level_proportions(comparer.levels, labels)
 
@@ -159,11 +160,23 @@ def _train_ms_from_labels(
     list[float]
         The estimated m weights.
     """
-    pairs = _true_pairs_from_labels(left, right)
-    return _train_ms_from_pairs(comparer, pairs, max_pairs=max_pairs, seed=seed)
+    sample = _true_pairs_from_labels(left, right, max_pairs=max_pairs, seed=seed)
+    labels = comparer(sample.with_both(needed_by=[comparer]))[comparer.name]
+    return level_proportions(comparer.levels, labels)
+
 
+def _true_pairs_from_labels(
+    left: ir.Table,
+    right: ir.Table,
+    *,
+    max_pairs: int | None = None,
+    seed: int | None = None,
+) -> LinksTable:
+    """Uniformly sample up to `max_pairs` true-match pairs from the labels.
 
-def _true_pairs_from_labels(left: ir.Table, right: ir.Table) -> ir.Table:
+    This uses the number of records with each label to sample pairs,
+    so it never generates the (possibly quadratic) full set of within-label pairs.
+    """
     if "label_true" not in left.columns:
         raise ValueError(
             f"Left dataset must have a label_true column. Found: {left.columns}"
@@ -172,7 +185,9 @@ def _true_pairs_from_labels(left: ir.Table, right: ir.Table) -> ir.Table:
         raise ValueError(
             f"Right dataset must have a label_true column. Found: {right.columns}"
         )
-    return JoinLinker("label_true")(left, right).links
+    return KeyLinker("label_true").sample_links(
+        left, right, max_pairs=max_pairs, seed=seed
+    )
 
 
 def train_using_pairs(
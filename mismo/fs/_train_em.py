@@ -40,8 +40,9 @@ def train_using_em(
     Weights
         The estimated weights for each comparer.
     """
+    comparers = list(comparers)
     links = _train.sample_all_links(left, right, max_pairs=max_pairs)
-    links = links.with_both()
+    links = links.with_both(needed_by=comparers)
     for c in comparers:
         links = c(links)
     links = links.select([c.name for c in comparers])
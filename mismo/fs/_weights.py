@@ -3,7 +3,7 @@ from __future__ import annotations
 from json import dumps, loads
 import math
 from pathlib import Path
-from typing import TYPE_CHECKING, Iterable, Iterator, overload
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping, overload
 
 import ibis
 from ibis.expr import types as ir
@@ -229,19 +229,6 @@ class ComparerWeights:
         return plot_weights(self)
 
 
-def compare_one(
-    t: ir.Table, level_comparer: EnumComparer, comp_weights: ComparerWeights
-) -> tuple[ir.StringValue, ir.FloatingValue]:
-    conditions = [level.is_match(t) for level in level_comparer]
-    odds = [level_weights.odds for level_weights in comp_weights]
-    return (
-        _util.cases(*zip(conditions, level_comparer.levels), else_="else").name(
-            comp_weights.name
-        ),
-        _util.cases(*zip(conditions, odds), else_=1).name(f"{comp_weights.name}_odds"),
-    )
-
-
 class Weights:
     """Weights for the Fellegi-Sunter model.
 
@@ -296,17 +283,64 @@ class Weights:
         return self._score(compared, results)
 
     def compare_and_score(
-        self, t: ir.Table, level_comparers: Iterable[EnumComparer]
+        self,
+        t: ir.Table,
+        level_comparers: Iterable[EnumComparer],
+        *,
+        min_odds: float | None = None,
+        costs: Mapping[str, float] | None = None,
     ) -> ir.Table:
         """Compare and score record pairs.
 
         Use the given `level_comparers` to label the record pairs, and then
-        score the results using `self.score_compared`.
+        score the results the same as `self.score_compared`.
+
+        If `min_odds` is given, then the comparers are evaluated in stages.
+        After each comparer, we know the odds contributed by the comparers
+        evaluated so far, and the best odds that the remaining comparers could
+        possibly contribute (the odds of their best levels).
+        Any pair whose best achievable total odds is below `min_odds` is dropped
+        before the next comparer is evaluated, so expensive comparers only
+        run on pairs that could still be a match.
+        Put cheap, selective comparers (eg name, zipcode) first,
+        either by ordering `level_comparers`, or by passing `costs`.
+
+        Parameters
+        ----------
+        t
+            The table of record pairs.
+        level_comparers
+            The comparers to label the pairs with.
+            There must be a ComparerWeights in self for each comparer.
+            These are evaluated in the given order, unless `costs` is given.
+        min_odds
+            If given, only return pairs with a total odds of at least this,
+            pruning hopeless pairs as early as possible.
+            If None, all pairs are returned.
+        costs
+            A mapping from comparer name to its relative cost to evaluate.
+            If given, comparers are evaluated from cheapest to most expensive.
+
+        Returns
+        -------
+        ir.Table
+            The input table, with the label, odds, and overall odds columns added.
         """
-        results = []
-        for cmp, weights in zip(level_comparers, self):
-            label, odds = compare_one(t, cmp, weights)
-            results.append((cmp.name, label, odds))
+        comparers = list(level_comparers)
+        if costs is not None:
+            comparers.sort(key=lambda c: costs[c.name])
+        best_odds = [max(lw.odds for lw in self[c.name]) for c in comparers]
+
+        for i, cmp in enumerate(comparers):
+            t = cmp(t)
+            t = t.mutate(self[cmp.name].odds(t[cmp.name]).name(f"{cmp.name}_odds"))
+            if min_odds is not None:
+                remaining_best = math.prod(best_odds[i + 1 :])
+                odds_so_far = ibis.literal("1").cast("float64")
+                for done in comparers[: i + 1]:
+                    odds_so_far *= t[f"{done.name}_odds"]
+                t = t.filter(odds_so_far * remaining_best >= min_odds)
+        results = [(c.name, t[c.name], t[f"{c.name}_odds"]) for c in comparers]
         return self._score(t, results)
 
     def _score(self, t: ir.Table, compare_results) -> ir.Table:
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from ibis import _
+from ibis_enum import IbisEnum
+import pytest
+
+from mismo import fs
+from mismo.compare import EnumComparer
+
+
+class NameLevel(IbisEnum):
+    EXACT = 0
+    CLOSE = 1
+    ELSE = 2
+
+
+class CityLevel(IbisEnum):
+    EXACT = 0
+    ELSE = 1
+
+
+@pytest.fixture
+def comparers():
+    return [
+        EnumComparer(
+            "name",
+            NameLevel,
+            [
+                (_.name_l == _.name_r, NameLevel.EXACT),
+                (_.name_l[:1] == _.name_r[:1], NameLevel.CLOSE),
+                (True, NameLevel.ELSE),
+            ],
+        ),
+        EnumComparer(
+            "city",
+            CityLevel,
+            [(_.city_l == _.city_r, CityLevel.EXACT), (True, CityLevel.ELSE)],
+        ),
+    ]
+
+
+def test_pattern_counts(table_factory, comparers):
+    pairs = table_factory(
+        {
+            "name_l": ["a", "ab", "ab", "x"],
+            "name_r": ["a", "ac", "ac", "y"],
+            "city_l": ["s", "s", "s", "s"],
+            "city_r": ["s", "s", "s", "t"],
+        }
+    )
+    for c in comparers:
+        pairs = c(pairs)
+    counts = fs.pattern_counts(pairs, comparers)
+    records = sorted(counts.execute().itertuples(index=False, name=None))
+    assert records == [(0, 0, 1), (1, 0, 2), (2, 1, 1)]
+
+
+def test_bootstrap_weights(table_factory, comparers):
+    m_patterns = table_factory(
+        {"name": [0, 1, 2], "city": [0, 0, 1], "n": [800, 150, 50]}
+    )
+    # Use string levels for one side, which should also work.
+    u_patterns = table_factory(
+        {
+            "name": ["EXACT", "CLOSE", "ELSE"],
+            "city": ["EXACT", "ELSE", "ELSE"],
+            "n": [10, 1000, 100_000],
+        }
+    )
+    df = fs.bootstrap_weights(
+        comparers, m_patterns, u_patterns, n_replicates=200, seed=0
+    )
+    assert df.columns.tolist() == [
+        "comparer",
+        "level",
+        "m",
+        "m_low",
+        "m_high",
+        "u",
+        "u_low",
+        "u_high",
+        "odds",
+        "odds_low",
+        "odds_high",
+    ]
+    assert df[["comparer", "level"]].values.tolist() == [
+        ["name", "EXACT"],
+        ["name", "CLOSE"],
+        ["name", "ELSE"],
+        ["city", "EXACT"],
+        ["city", "ELSE"],
+    ]
+    for p in ["m", "u", "odds"]:
+        assert (df[p + "_low"] <= df[p]).all()
+        assert (df[p] <= df[p + "_high"]).all()
+    name_exact = df.iloc[0]
+    assert name_exact.m == pytest.approx(0.8)
+    assert name_exact.u == pytest.approx(10 / 101_010)
+    # 800 of 1000 is pretty certain
+    assert name_exact.m_high - name_exact.m_low < 0.06
+    # 10 of 101_010 is very uncertain in relative terms
+    assert name_exact.u_high / name_exact.u_low > 2
+
+    again = fs.bootstrap_weights(
+        comparers, m_patterns, u_patterns, n_replicates=200, seed=0
+    )
+    assert again.equals(df)
+
+
+def test_bootstrap_weights_matches_training(table_factory, comparers):
+    # The point estimates should match the weights made by the training functions.
+    m_patterns = table_factory({"name": [0, 1], "city": [0, 0], "n": [3, 1]})
+    u_patterns = table_factory({"name": [1, 2], "city": [1, 1], "n": [5, 5]})
+    df = fs.bootstrap_weights(comparers, m_patterns, u_patterns, n_replicates=10)
+    name = df[df.comparer == "name"]
+    # unseen levels are counted once
+    assert name.m.tolist() == pytest.approx([3 / 5, 1 / 5, 1 / 5])
+    assert name.u.tolist() == pytest.approx([1 / 11, 5 / 11, 5 / 11])
+
+
+def test_bootstrap_weights_bad_confidence(table_factory, comparers):
+    patterns = table_factory({"name": [0], "city": [0], "n": [1]})
+    with pytest.raises(ValueError):
+        fs.bootstrap_weights(comparers, patterns, patterns, confidence=95)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from ibis import _
+from ibis_enum import IbisEnum
+import pytest
+
+import mismo
+from mismo import fs
+from mismo.compare import EnumComparer
+from mismo.fs import _partitioned
+
+
+class Level(IbisEnum):
+    EXACT = 0
+    ELSE = 1
+
+
+COMPARER = EnumComparer(
+    name="name",
+    levels=Level,
+    cases=[(_.name_l == _.name_r, Level.EXACT), (True, Level.ELSE)],
+)
+WEIGHTS = fs.Weights(
+    [
+        fs.ComparerWeights(
+            "name",
+            [
+                fs.LevelWeights("EXACT", m=0.9, u=0.1),
+                fs.LevelWeights("ELSE", m=0.1, u=0.9),
+            ],
+        )
+    ]
+)
+
+
+@pytest.fixture
+def records(table_factory):
+    n = 200
+    return table_factory(
+        {
+            "record_id": list(range(n)),
+            "zip": [i % 23 for i in range(n)],
+            "name": [f"name{i % 7}" for i in range(n)],
+        }
+    )
+
+
+def _expected(linker, left, right):
+    links = linker(left, right).links
+    scored = WEIGHTS.compare_and_score(links, [COMPARER])
+    return _pairs(scored)
+
+
+def _pairs(t):
+    df = t.select("record_id_l", "record_id_r", "odds").execute()
+    return sorted(map(tuple, df.values.tolist()))
+
+
+@pytest.mark.parametrize("task", ["dedupe", "link"])
+def test_link_partitioned_same_as_in_memory(records, tmp_path, task):
+    linker = mismo.KeyLinker("zip")
+    left = records
+    right = records if task == "dedupe" else records.filter(_.record_id % 3 == 0)
+    linkage = fs.link_partitioned(
+        left,
+        right,
+        linker=linker,
+        comparers=[COMPARER],
+        weights=WEIGHTS,
+        directory=tmp_path,
+        n_partitions=5,
+    )
+    assert linkage.links.columns == (
+        "record_id_l",
+        "record_id_r",
+        "odds",
+        "name",
+        "name_odds",
+    )
+    assert _pairs(linkage.links) == _expected(linker, left, right)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "left.parquet",
+        "linkage.json",
+        "links",
+        "right.parquet",
+    ]
+    # The result is a normal on-disk linkage
+    reread = mismo.Linkage.from_parquets(tmp_path, backend=records.get_backend())
+    assert repr(reread) == repr(linkage)
+    with pytest.raises(FileExistsError):
+        fs.link_partitioned(
+            left,
+            right,
+            linker=linker,
+            comparers=[COMPARER],
+            weights=WEIGHTS,
+            directory=tmp_path,
+        )
+
+
+def test_link_partitioned_resume(records, tmp_path, monkeypatch):
+    linker = mismo.KeyLinker("zip")
+    kwargs = dict(
+        linker=linker,
+        comparers=[COMPARER],
+        weights=WEIGHTS,
+        directory=tmp_path,
+        n_partitions=6,
+    )
+    real_run = _partitioned._run_partition
+    ran = []
+    fail_on = {3}
+
+    def flaky_run(job, p, **kw):
+        ran.append(p)
+        if p in fail_on:
+            raise MemoryError("boom")
+        return real_run(job, p, **kw)
+
+    monkeypatch.setattr(_partitioned, "_run_partition", flaky_run)
+    with pytest.raises(MemoryError):
+        fs.link_partitioned(records, records, **kwargs)
+    assert ran == [0, 1, 2, 3]
+    with pytest.raises(ValueError, match="n_partitions"):
+        fs.link_partitioned(records, records, **{**kwargs, "n_partitions": 7})
+
+    ran.clear()
+    fail_on.clear()
+    linkage = fs.link_partitioned(records, records, **kwargs)
+    # only the unfinished buckets are re-run
+    assert ran == [3, 4, 5]
+    assert _pairs(linkage.links) == _expected(linker, records, records)
+
+
+def test_link_partitioned_processes(records, tmp_path):
+    linker = mismo.KeyLinker("zip")
+    linkage = fs.link_partitioned(
+        records,
+        records,
+        linker=linker,
+        comparers=[COMPARER],
+        weights=WEIGHTS,
+        directory=tmp_path,
+        n_partitions=4,
+        n_process=2,
+    )
+    assert _pairs(linkage.links) == _expected(linker, records, records)
+
+
+def test_link_partitioned_needs_partition_by(records, tmp_path):
+    linker = mismo.linker.UnnestLinker("zip")
+    kwargs = dict(comparers=[COMPARER], weights=WEIGHTS, directory=tmp_path)
+    with pytest.raises(TypeError, match="partition_by"):
+        fs.link_partitioned(records, records, linker=linker, **kwargs)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import ibis
+from ibis import _
+from ibis_enum import IbisEnum
 import numpy as np
 import pytest
 
+from mismo.compare import EnumComparer
 from mismo.fs import ComparerWeights, LevelWeights, Weights
 
 
@@ -165,3 +168,76 @@ def test_weights_serde(tmp_path):
     weights3 = Weights.from_json(d)
     assert weights == weights2
     assert weights == weights3
+
+
+def test_compare_and_score_min_odds(table_factory):
+    class Level(IbisEnum):
+        EXACT = 0
+        ELSE = 1
+
+    n_expensive_calls = []
+
+    @ibis.udf.scalar.python
+    def expensive_equal(a: str, b: str) -> bool:
+        n_expensive_calls.append(1)
+        return a == b
+
+    cheap = EnumComparer(
+        "cheap", Level, [(_.zip_l == _.zip_r, Level.EXACT), (True, Level.ELSE)]
+    )
+    expensive = EnumComparer(
+        "expensive",
+        Level,
+        [(lambda t: expensive_equal(t.name_l, t.name_r), Level.EXACT), (True, "ELSE")],
+    )
+    weights = Weights(
+        [
+            ComparerWeights(
+                "cheap",
+                [
+                    LevelWeights("EXACT", m=0.9, u=0.01),  # odds 90
+                    LevelWeights("ELSE", m=0.1, u=0.99),  # odds ~0.1
+                ],
+            ),
+            ComparerWeights(
+                "expensive",
+                [
+                    LevelWeights("EXACT", m=0.5, u=0.05),  # odds 10
+                    LevelWeights("ELSE", m=0.5, u=0.95),  # odds ~0.5
+                ],
+            ),
+        ]
+    )
+    t = table_factory(
+        {
+            "record_id_l": [0, 1, 2, 3],
+            "record_id_r": [10, 11, 12, 13],
+            "zip_l": ["a", "a", "b", "c"],
+            "zip_r": ["a", "a", "x", "y"],
+            "name_l": ["x", "x", "x", "x"],
+            "name_r": ["x", "y", "x", "y"],
+        }
+    )
+    full = weights.compare_and_score(t, [expensive, cheap])
+    assert full.count().execute() == 4
+    assert list(full.columns[-5:]) == [
+        "odds",
+        "expensive",
+        "expensive_odds",
+        "cheap",
+        "cheap_odds",
+    ]
+    n_expensive_calls.clear()
+
+    pruned = weights.compare_and_score(
+        t, [expensive, cheap], min_odds=100, costs={"cheap": 1, "expensive": 10}
+    )
+    result = pruned.order_by("record_id_l").execute()
+    # only pair 0 is above 100, pair 1 is 90 * 0.53
+    assert result.record_id_l.tolist() == [0]
+    assert result.odds.tolist() == pytest.approx([900])
+    # the pairs with different zips were pruned before the expensive comparer
+    assert len(n_expensive_calls) == 2
+    # pruning gives the same result as filtering after the fact
+    unpruned = full.filter(_.odds >= 100).order_by("record_id_l").execute()
+    assert unpruned.record_id_l.tolist() == [0]
@@ -7,10 +7,10 @@ from ibis.expr import types as ir
 from ibis_enum import IbisEnum
 
 from mismo._util import bind_one, cases
-from mismo.arrays import array_combinations, array_min
+from mismo.arrays import array_best_match
 from mismo.linkage._linkage import Linkage
 from mismo.linker import UnnestLinker
-from mismo.text import damerau_levenshtein
+from mismo.text import damerau_levenshtein_at_most
 
 
 def clean_email(email: ir.StringValue, *, normalize: bool = False) -> ir.StringValue:
@@ -125,9 +125,15 @@ def match_level(
 
     raw = cases(
         (e1.full == e2.full, f(EmailMatchLevel.FULL_EXACT)),
-        (damerau_levenshtein(e1.full, e2.full) <= 1, f(EmailMatchLevel.FULL_NEAR)),
+        (
+            damerau_levenshtein_at_most(e1.full, e2.full, 1),
+            f(EmailMatchLevel.FULL_NEAR),
+        ),
         (e1.user == e2.user, f(EmailMatchLevel.USER_EXACT)),
-        (damerau_levenshtein(e1.user, e2.user) <= 1, f(EmailMatchLevel.USER_NEAR)),
+        (
+            damerau_levenshtein_at_most(e1.user, e2.user, 1),
+            f(EmailMatchLevel.USER_NEAR),
+        ),
         else_=f(EmailMatchLevel.ELSE),
     )
     return raw
@@ -185,8 +191,11 @@ class EmailsDimension:
         """Add a column with the best match between all pairs of email addresses."""
         le = t[self.column_parsed + "_l"]
         ri = t[self.column_parsed + "_r"]
-        pairs = array_combinations(le, ri)
-        min_level = array_min(
-            pairs.map(lambda pair: match_level(pair.l, pair.r))
+        min_level = array_best_match(
+            le,
+            ri,
+            match_level,
+            key=lambda email: email.full,
+            key_level=int(EmailMatchLevel.FULL_EXACT),
         ).fill_null(int(EmailMatchLevel.ELSE))
         return t.mutate(min_level.name(self.column_compared))
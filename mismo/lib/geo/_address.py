@@ -139,19 +139,31 @@ def _is_possible_typo(left: ir.StructValue, right: ir.StructValue) -> ir.Boolean
             left.street1.length() >= 5,
         ),
         ibis.and_(
-            text.damerau_levenshtein_ratio(left.street_name, right.street_name) > 0.9,
-            text.damerau_levenshtein_ratio(left.city, right.city) > 0.9,
+            text.damerau_levenshtein_ratio_at_least(
+                left.street_name, right.street_name, 0.9, inclusive=False
+            ),
+            text.damerau_levenshtein_ratio_at_least(
+                left.city, right.city, 0.9, inclusive=False
+            ),
         ),
         ibis.and_(
-            text.damerau_levenshtein_ratio(left.street_name, right.street_name) > 0.9,
+            text.damerau_levenshtein_ratio_at_least(
+                left.street_name, right.street_name, 0.9, inclusive=False
+            ),
             # >=.8 so that a transposition in a 5digit zipcode match,
             # eg "12345" and "12354"
-            text.damerau_levenshtein_ratio(left.postal_code, right.postal_code) >= 0.8,
+            text.damerau_levenshtein_ratio_at_least(
+                left.postal_code, right.postal_code, 0.8
+            ),
         ),
         ibis.and_(
             left.street_number == right.street_number,
-            text.damerau_levenshtein_ratio(left.street_name, right.street_name) > 0.4,
-            text.damerau_levenshtein_ratio(left.city, right.city) > 0.9,
+            text.damerau_levenshtein_ratio_at_least(
+                left.street_name, right.street_name, 0.4, inclusive=False
+            ),
+            text.damerau_levenshtein_ratio_at_least(
+                left.city, right.city, 0.9, inclusive=False
+            ),
         ),
     ]
     return ibis.or_(*cases)
@@ -252,7 +264,11 @@ class AddressesDimension:
         t = arrays.array_filter_isin_other(
             t,
             t._addresses_tokens,
-            sets.rare_terms(t._addresses_tokens, max_records_n=500),
+            # The tokens are already unique within each record, so counting
+            # occurrences gives the same result, and skips a distinct count.
+            sets.rare_terms(
+                t._addresses_tokens, max_records_n=500, count_occurrences=True
+            ),
             result_format="_addresses_keywords",
         )
         t = t.cache()
@@ -270,7 +286,28 @@ class AddressesDimension:
     def compare(self, t: ir.Table) -> ir.Table:
         left = t[self.column_featured + "_l"].addresses
         right = t[self.column_featured + "_r"].addresses
-        combos = arrays.array_combinations(left, right)
-        levels = combos.map(lambda pair: match_level(pair.l, pair.r))
-        best = arrays.array_min(levels)
+        best = arrays.array_best_match(
+            left,
+            right,
+            match_level,
+            key=_exact_keys,
+            key_level=AddressesMatchLevel.STREET1_AND_CITY_OR_POSTAL.value,
+        )
         return t.mutate(best.name(self.column_compared))
+
+
+def _exact_keys(address: ir.StructValue) -> ir.ArrayValue:
+    """Keys that are shared iff two addresses match at the best level.
+
+    That is, the street1 and either the city or the postal code are equal.
+    """
+
+    # Both keys need the same struct type to go in one array,
+    # so `kind` says which field `value` came from.
+    def key(kind: str, value: ir.StringValue) -> ir.StructValue:
+        k = ibis.struct({"street1": address.street1, "kind": kind, "value": value})
+        return (address.street1.isnull() | value.isnull()).ifelse(ibis.null(), k)
+
+    return ibis.array(
+        [key("city", address.city), key("postal_code", address.postal_code)]
+    )
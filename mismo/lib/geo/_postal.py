@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from collections import defaultdict
+import functools
 import re
 
-import ibis
 from ibis.expr import datatypes as dt
 from ibis.expr import types as ir
 
@@ -23,7 +23,12 @@ _ADDRESS_SCHEMA = dt.Struct(
 _DIGITS_REGEX = re.compile(r"[0-9]+")
 
 
-def postal_parse_address(address_string: ir.StringValue) -> ir.StructValue:
+def postal_parse_address(
+    address_string: ir.StringValue,
+    *,
+    n_process: int = 1,
+    chunk_size: int = 1000,
+) -> ir.StructValue:
     """Parse individual fields from an address string.
 
     .. note:: To use this function, you need the optional `postal` library installed.
@@ -40,10 +45,20 @@ def postal_parse_address(address_string: ir.StringValue) -> ir.StructValue:
 
     Any additional fields parsed by postal will not be included.
 
+    Each distinct address string is only parsed once per batch of rows.
+    libpostal is CPU-bound, so if you have many addresses,
+    you can parse them in parallel with `n_process`.
+
     Parameters
     ----------
     address_string :
         The address as a single string
+    n_process :
+        How many worker processes to parse with. -1 means use all CPUs.
+        libpostal is loaded once per worker, and the workers are reused
+        between calls.
+    chunk_size :
+        How many distinct addresses to send to a worker at a time.
 
     Returns
     -------
@@ -51,32 +66,27 @@ def postal_parse_address(address_string: ir.StringValue) -> ir.StructValue:
         The parsed address as a Struct
     """
     with _util.optional_import("postal"):
-        from postal.parser import parse_address as _parse_address
-
-    @ibis.udf.scalar.python(signature=((str,), _ADDRESS_SCHEMA))
-    def udf(address_string: str | None) -> dict[str, str] | None:
-        # remove once https://github.com/ibis-project/ibis/pull/9625 is fixed
-        if address_string is None:
-            return None
-        parsed_fields = _parse_address(address_string)
-        label_to_values = defaultdict(list)
-        for value, label in parsed_fields:
-            label_to_values[label].append(value)
-        renamed = {
-            "street1": label_to_values["house_number"] + label_to_values["road"],
-            "street2": label_to_values["unit"],
-            "city": label_to_values["city"],
-            "state": label_to_values["state"],
-            "postal_code": label_to_values["postcode"],
-            "country": label_to_values["country"],
-        }
-        # replace empty strings with None
-        return {k: " ".join(v) or None for k, v in renamed.items()}
-
+        import postal.parser  # noqa: F401
+
+    parse = functools.partial(
+        _util.map_chunks,
+        _parse_many,
+        chunk_size=chunk_size,
+        n_process=n_process,
+        initializer=_load_postal,
+    )
+    udf = _util.distinct_udf(
+        parse, input_type="string", output_type=_ADDRESS_SCHEMA, batched=True
+    )
     return udf(address_string)
 
 
-def postal_fingerprint_address(address: ir.StructValue) -> ir.ArrayValue:
+def postal_fingerprint_address(
+    address: ir.StructValue,
+    *,
+    n_process: int = 1,
+    chunk_size: int = 1000,
+) -> ir.ArrayValue:
     """Generate multiple hashes of an address string to be used for e.g. blocking.
 
     .. note:: To use this function, you need to have the optional `postal` library
@@ -104,6 +114,7 @@ def postal_fingerprint_address(address: ir.StructValue) -> ir.ArrayValue:
 
     Examples
     -------
+    >>> import ibis
     >>> address = ibis.struct(
     ...     {
     ...         "street1": "123 Main Street",
@@ -126,6 +137,12 @@ def postal_fingerprint_address(address: ir.StructValue) -> ir.ArrayValue:
     ----------
     address :
         The address
+    n_process :
+        How many worker processes to hash with. -1 means use all CPUs.
+        libpostal is loaded once per worker, and the workers are reused
+        between calls.
+    chunk_size :
+        How many distinct addresses to send to a worker at a time.
 
     Returns
     -------
@@ -133,40 +150,89 @@ def postal_fingerprint_address(address: ir.StructValue) -> ir.ArrayValue:
         Hashes of the address.
     """
     with _util.optional_import("postal"):
-        from postal.near_dupe import near_dupe_hashes as _hash
-
-    @ibis.udf.scalar.python(signature=((_ADDRESS_SCHEMA,), list[str]))
-    def udf(address: dict[str, str] | None) -> list[str] | None:
-        # remove once https://github.com/ibis-project/ibis/pull/9625 is fixed
-        if address is None:
-            return None
-        # split street1 into house_number and road
-        street1 = address["street1"] or ""
-        house, *rest = street1.split(" ", 1)
-        contains_digits = _DIGITS_REGEX.match(house) is not None
-        parsed = {
-            "unit": address["street2"],
-            "city": address["city"],
-            "state": address["state"],
-            "postcode": address["postal_code"],
-            "country": address["country"],
-        }
-        if contains_digits:
-            # handle the fact that street1 contains both the house number and the road
-            parsed["house_number"] = house
-            parsed["road"] = " ".join(rest)
-        else:
-            parsed["road"] = street1
-
-        parsed = {k: v for k, v in parsed.items() if v}
-
-        if len(parsed) == 0:
-            # catch empty strings from invalid addresses
-            return []
-        return _hash(
-            list(parsed.keys()),
-            list(parsed.values()),
-            address_only_keys=True,
-        )
-
+        import postal.near_dupe  # noqa: F401
+
+    fingerprint = functools.partial(
+        _util.map_chunks,
+        _fingerprint_many,
+        chunk_size=chunk_size,
+        n_process=n_process,
+        initializer=_load_postal,
+    )
+    udf = _util.distinct_udf(
+        fingerprint,
+        input_type=_ADDRESS_SCHEMA,
+        output_type="array<string>",
+        batched=True,
+    )
     return udf(address)
+
+
+def _load_postal() -> None:
+    # libpostal loads its (large) models lazily on first use,
+    # so do that up front in each worker.
+    from postal.near_dupe import near_dupe_hashes
+    from postal.parser import parse_address
+
+    parse_address("123 Main St")
+    near_dupe_hashes(["road"], ["main"], address_only_keys=True)
+
+
+def _parse_many(address_strings: list[str]) -> list[dict[str, str]]:
+    from postal.parser import parse_address
+
+    return [_parse_one(parse_address, a) for a in address_strings]
+
+
+def _parse_one(parse_address, address_string: str) -> dict[str, str]:
+    parsed_fields = parse_address(address_string)
+    label_to_values = defaultdict(list)
+    for value, label in parsed_fields:
+        label_to_values[label].append(value)
+    renamed = {
+        "street1": label_to_values["house_number"] + label_to_values["road"],
+        "street2": label_to_values["unit"],
+        "city": label_to_values["city"],
+        "state": label_to_values["state"],
+        "postal_code": label_to_values["postcode"],
+        "country": label_to_values["country"],
+    }
+    # replace empty strings with None
+    return {k: " ".join(v) or None for k, v in renamed.items()}
+
+
+def _fingerprint_many(addresses: list[dict[str, str]]) -> list[list[str]]:
+    from postal.near_dupe import near_dupe_hashes
+
+    return [_fingerprint_one(near_dupe_hashes, a) for a in addresses]
+
+
+def _fingerprint_one(near_dupe_hashes, address: dict[str, str]) -> list[str]:
+    # split street1 into house_number and road
+    street1 = address["street1"] or ""
+    house, *rest = street1.split(" ", 1)
+    contains_digits = _DIGITS_REGEX.match(house) is not None
+    parsed = {
+        "unit": address["street2"],
+        "city": address["city"],
+        "state": address["state"],
+        "postcode": address["postal_code"],
+        "country": address["country"],
+    }
+    if contains_digits:
+        # handle the fact that street1 contains both the house number and the road
+        parsed["house_number"] = house
+        parsed["road"] = " ".join(rest)
+    else:
+        parsed["road"] = street1
+
+    parsed = {k: v for k, v in parsed.items() if v}
+
+    if len(parsed) == 0:
+        # catch empty strings from invalid addresses
+        return []
+    return near_dupe_hashes(
+        list(parsed.keys()),
+        list(parsed.values()),
+        address_only_keys=True,
+    )
@@ -3,7 +3,6 @@ from __future__ import annotations
 import dataclasses
 import functools
 
-import ibis
 from ibis.expr import datatypes as dt
 from ibis.expr import types as ir
 
@@ -180,7 +179,13 @@ class TaggedAddress:
         )
 
 
-def spacy_tag_address(address_string: ir.StringValue) -> ir.ArrayValue:
+def spacy_tag_address(
+    address_string: ir.StringValue,
+    *,
+    batch_size: int = 1000,
+    n_process: int = 1,
+    cache_size: int | None = 2**16,
+) -> ir.ArrayValue:
     """
     Tag each token in a US address string with its type, eg StreetName, StreetPreDirectional
 
@@ -225,6 +230,15 @@ def spacy_tag_address(address_string: ir.StringValue) -> ir.ArrayValue:
     ----------
     address_string
         The address as a single string
+    batch_size
+        How many addresses to feed through spaCy's `nlp.pipe()` at a time.
+    n_process
+        How many worker processes to tag with. -1 means use all CPUs.
+        The model is loaded once per worker, and the workers are reused
+        between calls.
+    cache_size
+        How many recent taggings to remember, so repeated addresses
+        aren't tagged again. None means unbounded.
 
     Returns
     -------
@@ -253,20 +267,37 @@ def spacy_tag_address(address_string: ir.StringValue) -> ir.ArrayValue:
     {'token': 'Oklhoma', 'label': 'StateName'},
     {'token': '73102-1234', 'label': 'ZipCode'}]
     """  # noqa: E501
+    _load_nlp()
+    tag = functools.partial(
+        _util.map_chunks,
+        _tag_many,
+        chunk_size=batch_size,
+        n_process=n_process,
+        initializer=_load_nlp,
+    )
+    udf = _util.distinct_udf(
+        tag,
+        input_type="string",
+        output_type=_TAGGING_TYPE,
+        cache_size=cache_size,
+        batched=True,
+    )
+    return udf(address_string)
+
+
+@functools.cache
+def _load_nlp():
     with _util.optional_import("spacy"):
         import spacy  # noqa: F401
     with _util.optional_import("en_us_address_ner_sm"):
         import en_us_address_ner_sm
 
-    nlp = en_us_address_ner_sm.load()
+    return en_us_address_ner_sm.load()
 
-    @ibis.udf.scalar.python(signature=((str,), _TAGGING_TYPE))
-    @functools.cache
-    def udf(address_string: str | None) -> dict[str, str] | None:
-        # remove once https://github.com/ibis-project/ibis/pull/9625 is fixed
-        if address_string is None:
-            return None
-        doc = nlp(address_string)
-        return [{"token": token.text, "label": token.label_} for token in doc.ents]
 
-    return udf(address_string)
+def _tag_many(address_strings: list[str]) -> list[list[dict[str, str]]]:
+    nlp = _load_nlp()
+    return [
+        [{"token": token.text, "label": token.label_} for token in doc.ents]
+        for doc in nlp.pipe(address_strings, batch_size=len(address_strings))
+    ]
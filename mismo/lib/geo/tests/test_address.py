@@ -198,3 +198,59 @@ def test_addresses_dimension(addresses, expected, table_factory):
     expected["addresses_keywords"] = setify(expected["addresses_keywords"])
     result["addresses_keywords"] = setify(result["addresses_keywords"])
     assert result == expected
+
+
+def test_addresses_dimension_compare(table_factory):
+    address_type = "array<struct<street1: string, street2: string, city: string, state: string, postal_code: string, country: string>>"  # noqa: E501
+
+    def address(street1, city, state, postal_code):
+        return {
+            "street1": street1,
+            "street2": None,
+            "city": city,
+            "state": state,
+            "postal_code": postal_code,
+            "country": "US",
+        }
+
+    springfield = address("132 Main St", "Springfield", "IL", "62701")
+    records = [
+        # 0: same street and postal code, different city
+        [address("132 Main St", "Chicago", "IL", "62701")],
+        # 1: one letter off in the street
+        [address("133 Main St", "Springfield", "IL", "62701")],
+        # 2: only the state matches, among several addresses
+        [address("9 Elm St", "Peoria", "IL", "61602"), None],
+        # 3: nothing matches
+        [address("1 Oak Ave", "Anchorage", "AK", "99501")],
+    ]
+    t = table_factory(
+        {
+            "record_id_l": [0, 1, 2, 3],
+            "record_id_r": [10, 11, 12, 13],
+            "addresses_l": records,
+            "addresses_r": [[springfield]] * len(records),
+        },
+        schema={
+            "record_id_l": "int64",
+            "record_id_r": "int64",
+            "addresses_l": address_type,
+            "addresses_r": address_type,
+        },
+    )
+    dim = geo.AddressesDimension("addresses")
+    for side in ("_l", "_r"):
+        prepped = dim.prepare_for_blocking(
+            dim.prepare_for_fast_linking(
+                t.select("record_id_l", addresses=t["addresses" + side])
+            )
+        ).select("record_id_l", **{"addresses_featured" + side: "addresses_featured"})
+        t = t.join(prepped, "record_id_l")
+    result = dim.compare(t).order_by("record_id_l").addresses_compared.execute()
+    levels = geo.AddressesMatchLevel
+    assert result.tolist() == [
+        levels.STREET1_AND_CITY_OR_POSTAL.value,
+        levels.POSSIBLE_TYPO.value,
+        levels.SAME_STATE.value,
+        levels.ELSE.value,
+    ]
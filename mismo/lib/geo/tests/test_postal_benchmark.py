@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+
 import ibis
 import pytest
 
@@ -130,6 +132,10 @@ def complete(address_string: str | None) -> dict | None:
         postal_only,
         complete,
         postal_parse_address,
+        pytest.param(
+            functools.partial(postal_parse_address, n_process=-1),
+            id="postal_parse_address_parallel",
+        ),
     ],
 )
 @pytest.mark.parametrize(
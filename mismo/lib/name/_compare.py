@@ -6,7 +6,7 @@ from ibis_enum import IbisEnum
 
 from mismo import _structs, _util
 from mismo.lib.name._nicknames import are_aliases
-from mismo.text import damerau_levenshtein
+from mismo.text import damerau_levenshtein_at_most
 
 
 def are_match_with_nicknames(
@@ -32,10 +32,10 @@ def initials_equal(
 def equal_forgiving_typo(
     left: ir.StringValue, right: ir.StringValue
 ) -> ir.BooleanValue | bool:
-    edit_distance = damerau_levenshtein(left, right)
+    # allow a second typo in longer strings
+    max_distance = (left.length() > 5).ifelse(2, 1)
     return ibis.or_(
-        edit_distance <= 1,
-        ibis.and_(edit_distance <= 2, left.length() > 5),
+        damerau_levenshtein_at_most(left, right, max_distance),
         _substring_match(left, right),
     )
 
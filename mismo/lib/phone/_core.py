@@ -7,7 +7,7 @@ from ibis_enum import IbisEnum
 
 from mismo._util import bind_one, cases
 from mismo.arrays import array_combinations, array_min
-from mismo.text import damerau_levenshtein
+from mismo.text import damerau_levenshtein_at_most
 
 
 @overload
@@ -123,7 +123,7 @@ def match_level(
 
     raw = cases(
         (p1 == p2, f(PhoneMatchLevel.EXACT)),
-        (damerau_levenshtein(p1, p2) <= 1, f(PhoneMatchLevel.NEAR)),
+        (damerau_levenshtein_at_most(p1, p2, 1), f(PhoneMatchLevel.NEAR)),
         else_=f(PhoneMatchLevel.ELSE),
     )
     return raw
@@ -3,3 +3,4 @@ from __future__ import annotations
 from mismo.linkage._linkage import Linkage as Linkage
 from mismo.linkage._linkage import filter_links as filter_links
 from mismo.linkage._sample import sample_all_links as sample_all_links
+from mismo.linkage._top_k import keep_top_k as keep_top_k
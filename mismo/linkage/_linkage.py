@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
+import shutil
 from typing import TYPE_CHECKING, Any, TypeVar
+import uuid
 
 import ibis
 
@@ -49,6 +52,8 @@ class Linkage:
             left=left, right=right, links=links
         )
         self._raw_links = links
+        # The (left, right, links) row counts, if known without executing anything.
+        self._n_rows: tuple[int, int, int] | None = None
 
     @property
     def left(self) -> LinkedTable:
@@ -100,39 +105,120 @@ class Linkage:
             left=self.left.cache(), right=self.right.cache(), links=self.links.cache()
         )
 
-    def to_parquets(self, directory: str | Path, /, *, overwrite: bool = False) -> None:
+    def to_parquets(
+        self,
+        directory: str | Path,
+        /,
+        *,
+        overwrite: bool = False,
+        append: bool = False,
+        n_partitions: int = 16,
+    ) -> None:
         """
         Write left, right, and links to parquet files in the given directory.
+
+        The layout is
+
+        - `left.parquet` and `right.parquet`, sorted by `record_id`.
+        - `links/`, a hive-partitioned dataset, split into `n_partitions`
+          buckets by a hash of `record_id_l`, and sorted by `record_id_l`
+          within each file. So the row group statistics let readers
+          skip most of the data when filtering on `record_id_l`.
+        - `linkage.json`, with the number of partitions and the number of
+          rows in each table, so you can see how big a linkage is without
+          reading it.
+
+        All files are compressed with zstd.
+
+        Parameters
+        ----------
+        directory
+            The directory to write to. Created if it doesn't exist.
+        overwrite
+            If False, raise a FileExistsError if a linkage is already there.
+        append
+            If True, add `self.links` as new files to the linkage that is already
+            in `directory`, without rewriting the existing links.
+            `left` and `right` are not written, they are assumed to be unchanged.
+        n_partitions
+            The number of buckets to split the links into.
+            Ignored when appending, the existing number is used.
         """
         d = Path(directory)
-        d.mkdir(parents=True, exist_ok=True)
-
-        def write(t: ir.Table, name: str):
-            p = d / f"{name}.parquet"
-            if p.exists() and not overwrite:
-                raise FileExistsError(f"{p} already exists")
-            t.to_parquet(p)
+        meta_path = d / _METADATA_FILE
+        if overwrite and append:
+            raise ValueError("Only one of overwrite or append can be True")
+        if append:
+            if not meta_path.exists():
+                raise FileNotFoundError(f"No linkage to append to at {d}")
+            meta = json.loads(meta_path.read_text())
+            meta["n_links"] += _write_links(
+                self.links, d / "links", n_partitions=meta["n_partitions"]
+            )
+            meta_path.write_text(json.dumps(meta, indent=2))
+            return
 
-        write(self.left, "left")
-        write(self.right, "right")
-        write(self.links, "links")
+        d.mkdir(parents=True, exist_ok=True)
+        existing = [
+            p
+            for p in (meta_path, d / "left.parquet", d / "right.parquet", d / "links")
+            if p.exists()
+        ]
+        if existing and not overwrite:
+            raise FileExistsError(f"{existing[0]} already exists")
+        if (d / "links").exists():
+            shutil.rmtree(d / "links")
+        meta = {
+            "n_partitions": n_partitions,
+            "n_left": _write_records(self.left, d / "left.parquet"),
+            "n_right": _write_records(self.right, d / "right.parquet"),
+            "n_links": _write_links(self.links, d / "links", n_partitions=n_partitions),
+        }
+        meta_path.write_text(json.dumps(meta, indent=2))
 
     @classmethod
     def from_parquets(
         cls, directory: str | Path, /, *, backend: ibis.BaseBackend | None = None
     ) -> _typing.Self:
-        """Create a Linkage by reading parquets from the given directory."""
+        """Create a Linkage by reading parquets from the given directory.
+
+        This is lazy: only the parquet footers and `linkage.json` are read,
+        the data is only scanned when you execute something.
+        The row counts in `linkage.json` are used when printing the Linkage,
+        so that doesn't scan the data either.
+        Reads both the layout written by
+        [to_parquets][mismo.Linkage.to_parquets],
+        and the older layout of plain `left.parquet`, `right.parquet`,
+        and `links.parquet` files.
+        """
         if backend is None:
             backend = ibis.get_backend()
         d = Path(directory)
-        return cls(
+        if (d / "links").is_dir():
+            links = backend.read_parquet(
+                d / "links" / "**" / "*.parquet", hive_partitioning=False
+            )
+        else:
+            links = backend.read_parquet(d / "links.parquet")
+        linkage = cls(
             left=backend.read_parquet(d / "left.parquet"),
             right=backend.read_parquet(d / "right.parquet"),
-            links=backend.read_parquet(d / "links.parquet"),
+            links=links,
         )
+        meta_path = d / _METADATA_FILE
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            linkage._n_rows = (meta["n_left"], meta["n_right"], meta["n_links"])
+        return linkage
 
     def __repr__(self):
-        return f"{self.__class__.__name__}<left={self.left.count().execute():_}, right={self.right.count().execute():_}, links={self.links.count().execute():_}>"  # noqa: E501
+        if self._n_rows is not None:
+            n_left, n_right, n_links = self._n_rows
+        else:
+            n_left = self.left.stats().n_rows
+            n_right = self.right.stats().n_rows
+            n_links = self.links.stats().n_rows
+        return f"{self.__class__.__name__}<left={n_left:_}, right={n_right:_}, links={n_links:_}>"  # noqa: E501
 
     def copy(
         self,
@@ -299,3 +385,66 @@ def filter_links(links_or_linkage: Linkish, condition: ir.BooleanValue) -> Linki
         )
     else:
         return links_or_linkage.filter(condition)  # ty:ignore[invalid-argument-type, invalid-return-type, possibly-missing-attribute]
+
+
+_METADATA_FILE = "linkage.json"
+_PARTITION_COLUMN = "link_partition"
+
+
+def _write_records(t: ir.Table, path: Path) -> int:
+    import pyarrow.parquet as pq
+
+    reader = t.order_by("record_id").to_pyarrow_batches()
+    n = 0
+    with pq.ParquetWriter(path, reader.schema, compression="zstd") as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            n += batch.num_rows
+    return n
+
+
+def _write_links(
+    links: ir.Table, directory: Path, *, n_partitions: int, name: str | None = None
+) -> int:
+    """Stream links into a hive-partitioned dataset, returning the number of rows.
+
+    The files are named `{name}-{i}.parquet`. If `name` is None, a unique name
+    is used, so appends never clobber old files.
+    """
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    partition = (links.record_id_l.hash() % n_partitions).abs().cast("int32")
+    reader = (
+        links.mutate(**{_PARTITION_COLUMN: partition})
+        .order_by("record_id_l")
+        .to_pyarrow_batches()
+    )
+    n = 0
+
+    def batches():
+        nonlocal n
+        for batch in reader:
+            n += batch.num_rows
+            yield batch
+
+    if name is None:
+        name = f"part-{uuid.uuid4().hex}"
+    directory.mkdir(parents=True, exist_ok=True)
+    ds.write_dataset(
+        batches(),
+        directory,
+        schema=reader.schema,
+        format="parquet",
+        partitioning=[_PARTITION_COLUMN],
+        partitioning_flavor="hive",
+        basename_template=name + "-{i}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        preserve_order=True,
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+    )
+    if n == 0:
+        # Nothing was written, but readers still need a file with the schema.
+        schema = reader.schema.remove(reader.schema.get_field_index(_PARTITION_COLUMN))
+        pq.write_table(schema.empty_table(), directory / f"{name}.parquet")
+    return n
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Literal, TypeVar
+
+import ibis
+from ibis import Deferred
+from ibis.expr import datatypes as dt
+from ibis.expr import types as ir
+
+from mismo import _util
+from mismo.linkage._linkage import Linkage
+from mismo.types._links_table import LinksTable
+
+Linkish = TypeVar("Linkish", bound=LinksTable | Linkage)
+
+
+def keep_top_k(
+    links_or_linkage: Linkish,
+    *,
+    by: str | Deferred | ir.Value,
+    k: int = 1,
+    per: Literal["left", "right", "both"] = "left",
+) -> Linkish:
+    """Keep only the `k` highest-scoring links for each record.
+
+    This is useful after scoring, when you only want the best few candidates
+    for each record.
+    You could do this with [filter_links][mismo.linkage.filter_links]
+    and a window function, but that sorts every link of every record.
+    Instead, this uses a top-k aggregation that only keeps the best `k` links
+    for each record as it goes, which is much cheaper when records have
+    many links.
+
+    Ties are broken arbitrarily. Links where `by` is NULL are dropped.
+
+    This uses DuckDB's `max_by(arg, val, n)` aggregate, which is a DuckDB-only
+    builtin, so this only works on the DuckDB backend.
+
+    Parameters
+    ----------
+    links_or_linkage
+        The links to filter, or a Linkage whose links to filter.
+    by
+        The score to rank links by. Higher is better.
+        If lower is better, eg for a distance, pass the negative.
+    k
+        The number of links to keep for each record.
+    per
+        Whose records to keep the top `k` links for:
+
+        - "left": each record in the left table keeps its top `k` links.
+        - "right": each record in the right table keeps its top `k` links.
+        - "both": only keep a link if it is one of the top `k` links for
+          both its left record and its right record.
+          With `k=1`, this is mutual-best-match filtering:
+          a link is kept only if each record is the other's best match,
+          so every record ends up with at most one link,
+          which is what you want for one-to-one linking tasks.
+
+    Returns
+    -------
+    The same type as the input, with only the top links.
+
+    Examples
+    --------
+    >>> import ibis
+    >>> from mismo.linkage import keep_top_k
+    >>> links = ibis.memtable(
+    ...     {
+    ...         "record_id_l": [1, 1, 2, 2, 3],
+    ...         "record_id_r": ["a", "b", "a", "c", "c"],
+    ...         "score": [0.9, 0.5, 0.8, 0.7, 0.75],
+    ...     }
+    ... )
+
+    The best link for each left record:
+
+    >>> keep_top_k(links, by="score").order_by("record_id_l").execute()
+       record_id_l record_id_r  score
+    0            1           a   0.90
+    1            2           a   0.80
+    2            3           c   0.75
+
+    Mutual best matches. 2's best match is "a", but "a" prefers 1,
+    and "c" prefers 3, so 2 is left unmatched:
+
+    >>> keep_top_k(links, by="score", per="both").order_by("record_id_l").execute()
+       record_id_l record_id_r  score
+    0            1           a   0.90
+    1            3           c   0.75
+    """
+    if isinstance(links_or_linkage, Linkage):
+        return links_or_linkage.copy(
+            links=keep_top_k(links_or_linkage.links, by=by, k=k, per=per)
+        )
+    if k < 1:
+        raise ValueError(f"k must be at least 1, got {k}")
+    links = links_or_linkage
+    if per == "left":
+        result = _top_k(links, by=by, k=k, group_by="record_id_l")
+    elif per == "right":
+        result = _top_k(links, by=by, k=k, group_by="record_id_r")
+    elif per == "both":
+        best_l = _top_k(links, by=by, k=k, group_by="record_id_l")
+        best_r = _top_k(links, by=by, k=k, group_by="record_id_r")
+        keys = best_r.select("record_id_l", "record_id_r").distinct()
+        result = best_l.semi_join(keys, ["record_id_l", "record_id_r"])
+    else:
+        raise ValueError(f"per must be one of 'left', 'right', 'both', got {per}")
+    if isinstance(links, LinksTable):
+        result = LinksTable(result, left=links.left, right=links.right)
+    return result
+
+
+def _top_k(links: ir.Table, *, by, k: int, group_by: str) -> ir.Table:
+    score = _util.bind_one(links, by)
+    row = ibis.struct({c: links[c] for c in links.columns})
+    top_name = _util.unique_name("top")
+    max_by = _max_by(row.type(), score.type())
+    top = links.group_by(group_by).agg(max_by(row, score, k).name(top_name))
+    return top.select(top[top_name].unnest().name(top_name)).unpack(top_name)
+
+
+def _max_by(row_type: dt.DataType, score_type: dt.DataType):
+    # duckdb's max_by(arg, val, n) keeps a heap of the n best rows per group,
+    # so it never sorts a whole group.
+    def max_by(arg, val, n): ...  # noqa: ANN001
+
+    return ibis.udf.agg.builtin(
+        max_by,
+        name="max_by",
+        signature=((row_type, score_type, dt.int64), dt.Array(row_type)),
+    )
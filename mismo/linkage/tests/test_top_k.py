@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import ibis
+import numpy as np
+import pytest
+
+import mismo
+from mismo.linkage import keep_top_k
+
+
+@pytest.fixture
+def links(table_factory):
+    rng = np.random.default_rng(0)
+    n = 500
+    return table_factory(
+        {
+            "record_id_l": rng.integers(0, 40, n),
+            "record_id_r": rng.integers(0, 40, n),
+            # unique scores, so there are no ties
+            "score": rng.permutation(n) / n,
+        }
+    ).distinct(on=["record_id_l", "record_id_r"])
+
+
+def _records(t):
+    return sorted(
+        t.select("record_id_l", "record_id_r", "score")
+        .execute()
+        .itertuples(index=False, name=None)
+    )
+
+
+@pytest.mark.parametrize("k", [1, 3])
+@pytest.mark.parametrize("per", ["left", "right"])
+def test_keep_top_k(links, k, per):
+    group = "record_id_l" if per == "left" else "record_id_r"
+    rank = ibis.row_number().over(group_by=group, order_by=ibis.desc("score"))
+    expected = links.filter(rank < k)
+    result = keep_top_k(links, by="score", k=k, per=per)
+    assert result.columns == links.columns
+    assert _records(result) == _records(expected)
+
+
+@pytest.mark.parametrize("k", [1, 2])
+def test_keep_top_k_both(links, k):
+    rank_l = ibis.row_number().over(group_by="record_id_l", order_by=ibis.desc("score"))
+    rank_r = ibis.row_number().over(group_by="record_id_r", order_by=ibis.desc("score"))
+    ranked = links.mutate(rank_l=rank_l, rank_r=rank_r)
+    expected = ranked.filter((ranked.rank_l < k) & (ranked.rank_r < k))
+    result = keep_top_k(links, by=links.score, k=k, per="both")
+    assert _records(result) == _records(expected)
+    if k == 1:
+        df = result.execute()
+        assert not df.record_id_l.duplicated().any()
+        assert not df.record_id_r.duplicated().any()
+
+
+def test_keep_top_k_linkage_and_nulls(table_factory):
+    left = table_factory({"record_id": [1, 2]})
+    right = table_factory({"record_id": [10, 20, 30]})
+    links = table_factory(
+        {
+            "record_id_l": [1, 1, 2, 2],
+            "record_id_r": [10, 20, 20, 30],
+            "score": [0.1, 0.2, None, 0.3],
+        }
+    )
+    linkage = mismo.Linkage(left=left, right=right, links=links)
+    result = keep_top_k(linkage, by=ibis._.score)
+    assert isinstance(result, mismo.Linkage)
+    assert _records(result.links) == [(1, 20, 0.2), (2, 30, 0.3)]
+
+    result = keep_top_k(linkage.links, by="score", per="both")
+    assert isinstance(result, mismo.LinksTable)
+    assert _records(result) == [(1, 20, 0.2), (2, 30, 0.3)]
+    assert result.right.count().execute() == 3
+
+
+def test_keep_top_k_bad_args(links):
+    with pytest.raises(ValueError, match="k must be"):
+        keep_top_k(links, by="score", k=0)
+    with pytest.raises(ValueError, match="per must be"):
+        keep_top_k(links, by="score", per="middle")
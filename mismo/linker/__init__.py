@@ -3,6 +3,8 @@ from __future__ import annotations
 from mismo.linker._basic import EmptyLinker as EmptyLinker
 from mismo.linker._basic import FullLinker as FullLinker
 from mismo.linker._common import Linker as Linker
+from mismo.linker._embedding import CosineLshIndex as CosineLshIndex
+from mismo.linker._embedding import EmbeddingLinker as EmbeddingLinker
 from mismo.linker._id_linker import IDLinker as IDLinker
 from mismo.linker._join_linker import JoinLinker as JoinLinker
 from mismo.linker._key_linker import KeyLinker as KeyLinker
@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+import ibis
+from ibis import _
+from ibis.expr import datatypes as dt
+from ibis.expr import types as ir
+
+from mismo import _typing, _util, vector
+from mismo.linkage import Linkage, keep_top_k
+from mismo.linker._common import Linker, infer_task
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class CosineLshIndex:
+    """An approximate nearest neighbor index of embedding vectors.
+
+    This uses random-hyperplane Locality Sensitive Hashing (LSH):
+    each of `n_tables` hash tables draws `n_bits` random hyperplanes,
+    and each vector is hashed to a bucket by which side of each hyperplane
+    it is on. The more similar (by cosine similarity) two vectors are,
+    the more likely they are to land in the same bucket in at least one table.
+    Only pairs that share a bucket are scored exactly.
+
+    The hashes are computed in batches with NumPy, and the buckets are
+    joined by the backend, so there are no external services involved.
+    The index can be persisted with
+    [to_parquets][mismo.linker.CosineLshIndex.to_parquets]
+    and then reused to look up new records,
+    without re-hashing the indexed records.
+
+    Examples
+    --------
+    >>> import ibis
+    >>> from mismo.linker import CosineLshIndex
+    >>> records = ibis.memtable(
+    ...     {
+    ...         "record_id": [0, 1, 2],
+    ...         "embedding": [[1.0, 0.0], [0.0, 1.0], [0.7, 0.7]],
+    ...     }
+    ... )
+    >>> index = CosineLshIndex.build(records, "embedding", n_bits=2, seed=0)
+    >>> queries = ibis.memtable({"record_id": [10], "embedding": [[0.9, 0.1]]})
+    >>> linkage = index.query(queries, k=1, min_similarity=0.5)
+    >>> linkage.links.select("record_id_l", "record_id_r").execute()
+       record_id_l  record_id_r
+    0           10            0
+    """
+
+    def __init__(
+        self, records: ir.Table, hyperplanes: np.ndarray, *, column: str
+    ) -> None:
+        """Create an index from records that have already been hashed.
+
+        Usually you want to use [build][mismo.linker.CosineLshIndex.build]
+        or [from_parquets][mismo.linker.CosineLshIndex.from_parquets] instead.
+
+        Parameters
+        ----------
+        records
+            A table with columns `record_id`, `column`, and `lsh_keys`.
+        hyperplanes
+            An array of shape (n_tables, n_bits, n_dims).
+        column
+            The name of the embedding column.
+        """
+        if hyperplanes.ndim != 3:
+            raise ValueError(
+                f"hyperplanes must have shape (n_tables, n_bits, n_dims), got {hyperplanes.shape}"  # noqa: E501
+            )
+        missing = {"record_id", column, "lsh_keys"} - set(records.columns)
+        if missing:
+            raise ValueError(f"records are missing columns {sorted(missing)}")
+        self.records = records
+        self.hyperplanes = hyperplanes
+        self.column = column
+
+    records: ir.Table
+    """The indexed records, with columns `record_id`, the embedding, and `lsh_keys`."""
+    hyperplanes: np.ndarray
+    """The random hyperplanes, of shape (n_tables, n_bits, n_dims)."""
+    column: str
+    """The name of the embedding column."""
+
+    @classmethod
+    def build(
+        cls,
+        records: ir.Table,
+        column: str,
+        *,
+        n_bits: int = 16,
+        n_tables: int = 8,
+        seed: int | None = None,
+    ) -> CosineLshIndex:
+        """Index a table of records with an embedding column.
+
+        Parameters
+        ----------
+        records
+            The records to index. Must have a `record_id` column.
+        column
+            The name of the column of embeddings.
+            These should be `array<floating>` of the same length in every row.
+        n_bits
+            The number of hyperplanes per hash table.
+            More bits make smaller buckets, which means fewer, more similar,
+            candidate pairs. Must be between 1 and 32.
+        n_tables
+            The number of hash tables.
+            More tables make it more likely that similar pairs are found,
+            at the cost of more candidate pairs.
+        seed
+            The random seed for choosing hyperplanes.
+
+        Returns
+        -------
+        CosineLshIndex
+            The index, with the hashed records cached.
+        """
+        import numpy as np
+
+        if not 1 <= n_bits <= 32:
+            raise ValueError(f"n_bits must be between 1 and 32, got {n_bits}")
+        if n_tables < 1:
+            raise ValueError(f"n_tables must be at least 1, got {n_tables}")
+        n_dims = records[column].length().max().execute()
+        if n_dims is None or n_dims == 0:
+            raise ValueError(f"Could not find any non-empty embeddings in {column}")
+        rng = np.random.default_rng(seed)
+        hyperplanes = rng.standard_normal((n_tables, n_bits, int(n_dims)))
+        hashed = _hash(records, column, hyperplanes)
+        return cls(hashed.cache(), hyperplanes, column=column)
+
+    @property
+    def n_tables(self) -> int:
+        """The number of hash tables."""
+        return self.hyperplanes.shape[0]
+
+    @property
+    def n_bits(self) -> int:
+        """The number of hyperplanes in each hash table."""
+        return self.hyperplanes.shape[1]
+
+    @property
+    def n_dims(self) -> int:
+        """The length of the embedding vectors."""
+        return self.hyperplanes.shape[2]
+
+    def add(self, records: ir.Table) -> CosineLshIndex:
+        """Return a new index that also includes `records`.
+
+        The already-indexed records aren't re-hashed.
+        """
+        hashed = _hash(records, self.column, self.hyperplanes)
+        combined = ibis.union(self.records, hashed.cast(self.records.schema()))
+        return self.__class__(combined.cache(), self.hyperplanes, column=self.column)
+
+    def query(
+        self,
+        queries: ir.Table,
+        *,
+        k: int | None = 10,
+        min_similarity: float | None = None,
+    ) -> Linkage:
+        """Find the approximate nearest indexed neighbors of each query record.
+
+        Parameters
+        ----------
+        queries
+            A table with a `record_id` column and the embedding column.
+        k
+            Keep at most this many neighbors for each query record.
+            If None, keep all the candidates.
+        min_similarity
+            Only keep neighbors with at least this cosine similarity.
+
+        Returns
+        -------
+        Linkage
+            A Linkage from `queries` to the indexed records,
+            with a `similarity` column in the links.
+        """
+        links = self._links(queries, self.records, k=k, min_similarity=min_similarity)
+        return Linkage(left=queries, right=self.records, links=links)
+
+    def to_parquets(self, directory: str | Path, /, *, overwrite: bool = False) -> None:
+        """Write the indexed records and the hyperplanes to the given directory."""
+        d = Path(directory)
+        d.mkdir(parents=True, exist_ok=True)
+        records_path = d / "records.parquet"
+        meta_path = d / "index.json"
+        for p in (records_path, meta_path):
+            if p.exists() and not overwrite:
+                raise FileExistsError(f"{p} already exists")
+        self.records.to_parquet(records_path)
+        meta = {"column": self.column, "hyperplanes": self.hyperplanes.tolist()}
+        meta_path.write_text(json.dumps(meta))
+
+    @classmethod
+    def from_parquets(
+        cls, directory: str | Path, /, *, backend: ibis.BaseBackend | None = None
+    ) -> _typing.Self:
+        """Load an index written with [to_parquets][mismo.linker.CosineLshIndex.to_parquets]."""  # noqa: E501
+        import numpy as np
+
+        if backend is None:
+            backend = ibis.get_backend()
+        d = Path(directory)
+        meta = json.loads((d / "index.json").read_text())
+        records = backend.read_parquet(d / "records.parquet")
+        return cls(records, np.array(meta["hyperplanes"]), column=meta["column"])
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}<column={self.column}, n_tables={self.n_tables}, n_bits={self.n_bits}, n_dims={self.n_dims}>"  # noqa: E501
+
+    def _links(
+        self,
+        queries: ir.Table,
+        indexed: ir.Table,
+        *,
+        k: int | None,
+        min_similarity: float | None,
+        exclude_self: bool = False,
+    ) -> ir.Table:
+        hashed = _hash(queries, self.column, self.hyperplanes)
+        q = hashed.select("record_id", key=_.lsh_keys.unnest())
+        i = indexed.select("record_id", key=_.lsh_keys.unnest())
+        pairs = (
+            q.join(i, "key")
+            .select(record_id_l=q.record_id, record_id_r=i.record_id)
+            .distinct()
+        )
+        if exclude_self:
+            pairs = pairs.filter(_.record_id_l != _.record_id_r)
+        emb_l = _util.unique_name("emb_l")
+        emb_r = _util.unique_name("emb_r")
+        ql = queries.select("record_id", self.column).rename(
+            record_id_l="record_id", **{emb_l: self.column}
+        )
+        ir_ = indexed.select("record_id", self.column).rename(
+            record_id_r="record_id", **{emb_r: self.column}
+        )
+        scored = pairs.join(ql, "record_id_l").join(ir_, "record_id_r")
+        scored = scored.select(
+            "record_id_l",
+            "record_id_r",
+            similarity=vector.cosine_similarity(
+                scored[emb_l].cast("array<float64>"),
+                scored[emb_r].cast("array<float64>"),
+            ),
+        )
+        if min_similarity is not None:
+            scored = scored.filter(_.similarity >= min_similarity)
+        if k is not None:
+            scored = keep_top_k(scored, by="similarity", k=k)
+        return scored
+
+
+class EmbeddingLinker(Linker):
+    """A [Linker][mismo.Linker] that links each record to its most similar embeddings.
+
+    The embeddings are compared by cosine similarity. Instead of scoring
+    every pair of records, this builds an approximate nearest neighbor index
+    ([CosineLshIndex][mismo.linker.CosineLshIndex]) of the right table,
+    and looks up each record of the left table in it.
+    Each left record is linked to its top `k` neighbors that have
+    a similarity of at least `min_similarity`.
+    Because the index is approximate, some true neighbors might be missed.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        *,
+        k: int | None = 10,
+        min_similarity: float | None = None,
+        n_bits: int = 16,
+        n_tables: int = 8,
+        seed: int | None = None,
+        task: Literal["dedupe", "link"] | None = None,
+    ) -> None:
+        """Create an EmbeddingLinker.
+
+        Parameters
+        ----------
+        column
+            The name of the embedding column, which should be an
+            `array<floating>` of the same length in every row of both tables.
+        k
+            Link each record to at most this many neighbors.
+            If None, link to all candidates.
+        min_similarity
+            Only link records with at least this cosine similarity.
+        n_bits
+            The number of hyperplanes per hash table.
+            See [CosineLshIndex.build][mismo.linker.CosineLshIndex.build].
+        n_tables
+            The number of hash tables.
+            See [CosineLshIndex.build][mismo.linker.CosineLshIndex.build].
+        seed
+            The random seed for building the index.
+        task
+            The task to perform. If `None`, the task will be inferred as
+            "dedupe" if the left and right tables are the same, otherwise "link".
+            In "dedupe" mode, records are not linked to themselves,
+            and each pair is only included once, with `record_id_l < record_id_r`.
+        """
+        self.column = column
+        self.k = k
+        self.min_similarity = min_similarity
+        self.n_bits = n_bits
+        self.n_tables = n_tables
+        self.seed = seed
+        self.task = task
+
+    def index(self, right: ir.Table) -> CosineLshIndex:
+        """Build the index of the right table."""
+        return CosineLshIndex.build(
+            right,
+            self.column,
+            n_bits=self.n_bits,
+            n_tables=self.n_tables,
+            seed=self.seed,
+        )
+
+    def __call__(self, left: ir.Table, right: ir.Table) -> Linkage:
+        """Link each record in `left` to its nearest neighbors in `right`."""
+        task = infer_task(task=self.task, left=left, right=right)
+        index = self.index(right)
+        links = index._links(
+            left,
+            index.records,
+            k=self.k,
+            min_similarity=self.min_similarity,
+            exclude_self=task == "dedupe",
+        )
+        if task == "dedupe":
+            links = links.select(
+                record_id_l=ibis.least(_.record_id_l, _.record_id_r),
+                record_id_r=ibis.greatest(_.record_id_l, _.record_id_r),
+                similarity=_.similarity,
+            ).distinct()
+        return Linkage(left=left, right=right, links=links)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}<column={self.column}, k={self.k}, min_similarity={self.min_similarity}, n_bits={self.n_bits}, n_tables={self.n_tables}, task={self.task}>"  # noqa: E501
+
+
+def _hash(records: ir.Table, column: str, hyperplanes: np.ndarray) -> ir.Table:
+    embeddings = records[column].cast("array<float64>")
+    keys = _lsh_keys_udf(hyperplanes)(embeddings)
+    return records.select("record_id", column, lsh_keys=keys)
+
+
+def _lsh_keys_udf(hyperplanes: np.ndarray):
+    """A UDF that hashes array<float64> embeddings into one key per hash table.
+
+    Each key encodes the hash table number in the high bits,
+    and which side of each of the table's hyperplanes the vector is on
+    in the low bits, so keys from different tables never collide.
+    """
+    import numpy as np
+
+    n_tables, n_bits, n_dims = hyperplanes.shape
+    # (n_dims, n_tables * n_bits), so all projections are one matrix multiply
+    planes = hyperplanes.reshape(n_tables * n_bits, n_dims).T
+    bit_values = np.left_shift(1, np.arange(n_bits, dtype="int64"))
+    table_offsets = np.left_shift(np.arange(n_tables, dtype="int64"), n_bits)
+
+    def lsh_keys(arr):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if hasattr(arr, "combine_chunks"):
+            arr = arr.combine_chunks()
+        valid = arr.is_valid().to_numpy(zero_copy_only=False)
+        lengths = pc.list_value_length(arr).to_numpy(zero_copy_only=False)
+        if (lengths[valid] != n_dims).any():
+            raise ValueError(f"All embeddings must have length {n_dims}")
+        flat = pc.list_flatten(arr).to_numpy(zero_copy_only=False)
+        vectors = np.nan_to_num(flat.astype("float64")).reshape(-1, n_dims)
+        bits = (vectors @ planes > 0).reshape(-1, n_tables, n_bits)
+        keys = (bits * bit_values).sum(axis=-1) + table_offsets
+        offsets = np.zeros(len(arr) + 1, dtype="int32")
+        offsets[1:] = np.cumsum(np.where(valid, n_tables, 0))
+        return pa.ListArray.from_arrays(
+            pa.array(offsets),
+            pa.array(keys.ravel(), type=pa.int64()),
+            mask=pa.array(~valid),
+        )
+
+    return ibis.udf.scalar.pyarrow(
+        lsh_keys,
+        signature=((dt.Array(dt.float64),), dt.Array(dt.int64)),
+        name=_util.unique_name("lsh_keys"),
+    )
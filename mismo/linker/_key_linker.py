@@ -367,6 +367,64 @@ class KeyLinker(Linker):
             counts = PairCountsTable(counts.filter(_.n <= self.max_pairs))
         return counts
 
+    def sample_links(
+        self,
+        left: ibis.Table,
+        right: ibis.Table,
+        *,
+        max_pairs: int | None = None,
+        seed: int | None = None,
+    ) -> LinksTable:
+        """Uniformly sample up to `max_pairs` of the links this linker would generate.
+
+        This never generates the full set of links.
+        Instead, it uses the number of pairs in each block
+        (the same as in [pair_counts][mismo.KeyLinker.pair_counts])
+        to pick random positions in the virtual list of all links,
+        and then only materializes the links at those positions.
+        So this is cheap even when some blocks would generate
+        billions of pairs.
+
+        Parameters
+        ----------
+        left
+            The left table.
+        right
+            The right table.
+        max_pairs
+            The maximum number of links to sample.
+            If None, or if there are fewer possible links than this,
+            all links are returned.
+        seed
+            The random seed to use for sampling. If None, use a random seed.
+
+        Returns
+        -------
+        A [LinksTable][mismo.LinksTable] with just record_id_l and record_id_r.
+        All links will be unique.
+
+        Examples
+        --------
+        >>> import mismo
+        >>> t = ibis.memtable({"record_id": range(6), "letter": list("aaaabb")})
+        >>> linker = mismo.KeyLinker("letter")
+        >>> linker.sample_links(t, t, max_pairs=3).count().execute()
+        3
+        """
+        task = infer_task(task=self.task, left=left, right=right)
+        too_common_left, too_common_right = self.too_common_of_records(left, right)
+        left_filtered = left.filter(_.record_id.notin(too_common_left.record_id))
+        right_filtered = right.filter(_.record_id.notin(too_common_right.record_id))
+        links = sample_links(
+            self.resolvers,
+            left_filtered,
+            right_filtered,
+            max_pairs=max_pairs,
+            task=task,
+            seed=seed,
+        )
+        return LinksTable(links, left=left, right=right)
+
     def __repr__(self) -> str:
         if self.max_pairs is None:
             max_pairs = "None"
@@ -443,3 +501,131 @@ def pair_counts(
         )
     by_key = by_key.order_by(_.n.desc())
     return PairCountsTable(by_key)
+
+
+def sample_links(
+    key_pairs,
+    left: ibis.Table,
+    right: ibis.Table,
+    *,
+    max_pairs: int | None = None,
+    task: Literal["dedupe", "link"] | None = None,
+    seed: int | None = None,
+) -> LinksTable:
+    """Uniformly sample up to `max_pairs` of the links that share the given keys.
+
+    Each block (set of records sharing the same keys) of size n_left x n_right
+    occupies a contiguous range of positions in a virtual list of all links.
+    We draw distinct random positions from that list, find the block of each
+    position with a range join against the cumulative block sizes,
+    and then decode the offset within the block into the
+    (left index, right index) of the pair.
+    """
+    resolvers = _resolve.key_pair_resolvers(key_pairs)
+    task = infer_task(task=task, left=left, right=right)
+    if right is left:
+        right = right.view()
+    key_names = [_util.unique_name("key") for _ in resolvers]
+
+    def ids_with_index(t: ibis.Table, side: int) -> ibis.Table:
+        keys = {name: pair[side](t) for name, pair in zip(key_names, resolvers)}
+        t = t.select("record_id", **keys).drop_null(key_names, how="any")
+        return t.mutate(
+            __idx=ibis.row_number().over(group_by=key_names, order_by="record_id")
+        )
+
+    ids_left = ids_with_index(left, 0).cache()
+    counts = ids_left.group_by(key_names).agg(__n_left=_.count())
+    if task == "dedupe":
+        ids_right = ids_left.view()
+        counts = counts.mutate(__n=(_.__n_left * (_.__n_left - 1)) // 2)
+    else:
+        ids_right = ids_with_index(right, 1).cache()
+        counts_right = ids_right.group_by(key_names).agg(__n_right=_.count())
+        counts = counts.join(counts_right, key_names).mutate(
+            __n=_.__n_left * _.__n_right
+        )
+    counts = counts.filter(_.__n > 0)
+    counts = counts.mutate(__end=_.__n.cumsum(order_by=key_names).cast("int64"))
+    counts = counts.mutate(__start=_.__end - _.__n)
+    counts = counts.cache()
+    # Generate the positions from this one-row table, instead of from python ints,
+    # so that they are bound to the backend of the input tables.
+    totals = counts.view().aggregate(__total=_.__end.max().fill_null(0))
+    n_possible = int(totals.__total.as_scalar().execute())
+    n_pairs = n_possible if max_pairs is None else min(n_possible, max_pairs)
+
+    if n_pairs == n_possible:
+        positions = totals.select(__pos=ibis.range(totals.__total).unnest())
+    else:
+
+        def draw(salt: int) -> ibis.Table:
+            limit = ibis.least(totals.__total, n_pairs)
+            t = totals.select("__total", __i=ibis.range(limit).unnest())
+            pos = _random_ints(t.__i, t.__total, seed=seed, salt=salt)
+            return t.select(__pos=pos)
+
+        # Same approach as sample_all_links(): keep drawing until we have
+        # enough distinct positions.
+        salt = 0
+        positions = draw(salt).distinct().cache()
+        while positions.count().execute() < n_pairs:
+            salt += 1
+            positions = (
+                positions.union(draw(salt))
+                .distinct()
+                .order_by(_shuffle_key(_.__pos, seed=seed))
+                .limit(n_pairs)
+                .cache()
+            )
+
+    located = positions.join(
+        counts,
+        (positions.__pos >= counts.__start) & (positions.__pos < counts.__end),
+    )
+    located = located.mutate(__offset=_.__pos - _.__start)
+    if task == "dedupe":
+        # Invert the triangular numbers: the offset k within a block
+        # maps to the pair (a, b) with b * (b - 1) / 2 <= k < (b + 1) * b / 2.
+        # Correct for any floating point error in the sqrt.
+        located = located.mutate(
+            __b=((1 + (1 + 8 * _.__offset).sqrt()) / 2).floor().cast("int64")
+        )
+        located = located.mutate(
+            __b=(_.__b * (_.__b - 1) // 2 > _.__offset).ifelse(_.__b - 1, _.__b)
+        )
+        located = located.mutate(
+            __b=((_.__b + 1) * _.__b // 2 <= _.__offset).ifelse(_.__b + 1, _.__b)
+        )
+        located = located.mutate(__a=_.__offset - _.__b * (_.__b - 1) // 2)
+    else:
+        located = located.mutate(
+            __a=_.__offset // _.__n_right, __b=_.__offset % _.__n_right
+        )
+
+    located = located.select(*key_names, "__a", "__b")
+    ids_left = ids_left.view().rename(record_id_l="record_id", __a="__idx")
+    ids_right = ids_right.view().rename(record_id_r="record_id", __b="__idx")
+    raw_links = (
+        located.join(ids_left, [*key_names, "__a"])
+        .join(ids_right, [*key_names, "__b"])
+        .select("record_id_l", "record_id_r")
+    )
+    return LinksTable(raw_links, left=left, right=right)
+
+
+def _shuffle_key(x, *, seed: int | None) -> ir.Value:
+    """A key to sort by to shuffle rows, reproducible if `seed` is given."""
+    if seed is None:
+        return ibis.random()
+    return ibis.struct({"x": x, "seed": ibis.literal(seed)}).hash()
+
+
+def _random_ints(
+    i: ir.IntegerValue, high: ir.IntegerValue, *, seed: int | None, salt: int
+) -> ir.IntegerValue:
+    """Uniform random integers in [0, high), reproducible if `seed` is given."""
+    if seed is None:
+        return (ibis.random() * high).floor().cast("int64")
+    h = ibis.struct({"i": i, "seed": ibis.literal(seed), "salt": salt}).hash()
+    return (h % high + high) % high
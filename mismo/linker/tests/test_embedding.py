@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import mismo
+from mismo.linker import CosineLshIndex, EmbeddingLinker
+
+
+@pytest.fixture
+def embeddings():
+    # 50 clusters of 4 near-identical vectors each
+    rng = np.random.default_rng(42)
+    centers = rng.standard_normal((50, 16))
+    vectors = np.repeat(centers, 4, axis=0)
+    vectors += rng.standard_normal(vectors.shape) * 0.05
+    return vectors
+
+
+@pytest.fixture
+def records(table_factory, embeddings):
+    return table_factory(
+        {
+            "record_id": range(len(embeddings)),
+            "embedding": embeddings.tolist(),
+        }
+    )
+
+
+def _cosine(a, b):
+    return a @ b / (np.linalg.norm(a) * np.linalg.norm(b))
+
+
+def test_embedding_linker_link(records, embeddings):
+    left = records.filter(records.record_id % 4 == 0)
+    right = records.filter(records.record_id % 4 != 0)
+    linker = EmbeddingLinker("embedding", k=2, min_similarity=0.9, seed=0)
+    linkage = linker(left, right)
+    assert isinstance(linkage, mismo.Linkage)
+    df = linkage.links.execute()
+    assert set(df.columns) == {"record_id_l", "record_id_r", "similarity"}
+    # at most k per left record
+    assert df.groupby("record_id_l").size().max() <= 2
+    # the neighbors are in the same cluster, with the correct similarity
+    assert (df.record_id_l // 4 == df.record_id_r // 4).all()
+    for row in df.itertuples():
+        expected = _cosine(embeddings[row.record_id_l], embeddings[row.record_id_r])
+        assert row.similarity == pytest.approx(expected)
+    # Nearly every record should find both of its top-2 neighbors
+    assert len(df) >= 0.9 * 2 * 50
+
+
+def test_embedding_linker_dedupe(records):
+    linker = EmbeddingLinker("embedding", k=3, min_similarity=0.9, seed=0)
+    df = linker(records, records).links.execute()
+    assert (df.record_id_l < df.record_id_r).all()
+    assert not df.duplicated(["record_id_l", "record_id_r"]).any()
+    assert (df.record_id_l // 4 == df.record_id_r // 4).all()
+    # each cluster has 6 pairs
+    assert len(df) >= 0.9 * 6 * 50
+
+
+def test_index_persist_and_add(records, tmp_path):
+    first = records.filter(records.record_id < 100)
+    rest = records.filter(records.record_id >= 100)
+    index = CosineLshIndex.build(first, "embedding", n_bits=8, n_tables=4, seed=0)
+    assert (index.n_tables, index.n_bits, index.n_dims) == (4, 8, 16)
+    index.to_parquets(tmp_path)
+    with pytest.raises(FileExistsError):
+        index.to_parquets(tmp_path)
+    loaded = CosineLshIndex.from_parquets(tmp_path, backend=records.get_backend())
+    np.testing.assert_array_equal(loaded.hyperplanes, index.hyperplanes)
+    loaded = loaded.add(rest)
+    assert loaded.records.count().execute() == 200
+
+    queries = records.filter(records.record_id % 4 == 0)
+    expected = index.add(rest).query(queries, k=1).links.execute()
+    result = loaded.query(queries, k=1).links.execute()
+    assert sorted(map(tuple, result[["record_id_l", "record_id_r"]].values)) == sorted(
+        map(tuple, expected[["record_id_l", "record_id_r"]].values)
+    )
+
+
+def test_index_bad_dims(records, table_factory):
+    index = CosineLshIndex.build(records, "embedding", seed=0)
+    queries = table_factory({"record_id": [0], "embedding": [[1.0, 2.0]]})
+    with pytest.raises(Exception, match="length 16"):
+        index.query(queries).links.execute()
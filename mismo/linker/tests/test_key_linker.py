@@ -77,6 +77,53 @@ def test_deduplication(table_factory):
     assert_tables_equal(blocked_ids, expected)
 
 
+@pytest.mark.parametrize("task", ["dedupe", "link"])
+@pytest.mark.parametrize("max_pairs", [None, 0, 5, 1_000])
+def test_sample_links_all_or_subset(table_factory, task, max_pairs):
+    t = table_factory(
+        {
+            "record_id": range(12),
+            "letter": list("aaaaabbbccd") + [None],
+        }
+    )
+    linker = KeyLinker("letter", task=task)
+    all_links = linker(t, t).links.select("record_id_l", "record_id_r")
+    all_df = all_links.execute()
+    sample_df = linker.sample_links(t, t, max_pairs=max_pairs, seed=42).execute()
+    expected_n = len(all_df) if max_pairs is None else min(len(all_df), max_pairs)
+    assert sample_df.columns.tolist() == ["record_id_l", "record_id_r"]
+    assert len(sample_df) == expected_n
+    assert len(sample_df.drop_duplicates()) == expected_n
+    all_pairs = set(map(tuple, all_df.values.tolist()))
+    assert set(map(tuple, sample_df.values.tolist())) <= all_pairs
+
+
+def test_sample_links_seed(table_factory):
+    t = table_factory({"record_id": range(100), "letter": ["a"] * 100})
+    linker = KeyLinker("letter")
+
+    def sample(seed):
+        df = linker.sample_links(t, t, max_pairs=10, seed=seed).execute()
+        return set(map(tuple, df.values.tolist()))
+
+    assert sample(1) == sample(1)
+    assert sample(1) != sample(2)
+
+
+def test_sample_links_uniform(table_factory):
+    # One huge block and one small block: pairs should be drawn
+    # proportional to the size of the block, not evenly between blocks.
+    letters = ["a"] * 1000 + ["b"] * 10
+    t = table_factory({"record_id": range(len(letters)), "letter": letters})
+    df = KeyLinker("letter").sample_links(t, t, max_pairs=10_000).execute()
+    frac_b = (df.record_id_l >= 1000).mean()
+    # 45 / (499_500 + 45) pairs are in the b block
+    assert frac_b < 0.002
+    assert (df.record_id_l < df.record_id_r).all()
+    expected_mean = 1000 / 3
+    assert abs(df.record_id_l.mean() - expected_mean) / expected_mean < 0.05
+
+
 @pytest.mark.xfail
 def test_unnest_fails(table_factory, t1: ir.Table, t2: ir.Table):
     # If you do a ibis.join(l, r, _.array.unnest()), that will fail because
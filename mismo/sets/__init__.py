@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from mismo.sets._compare import jaccard as jaccard
+from mismo.sets._tfidf import TfIdfModel as TfIdfModel
 from mismo.sets._tfidf import add_array_value_counts as add_array_value_counts
 from mismo.sets._tfidf import add_tfidf as add_tfidf
 from mismo.sets._tfidf import document_counts as document_counts
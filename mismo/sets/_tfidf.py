@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 import ibis
 from ibis import _
 from ibis.expr import datatypes as dt
@@ -8,7 +10,9 @@ from ibis.expr import types as ir
 from mismo import _util, vector
 
 
-def document_counts(terms: ir.ArrayValue) -> ir.Table:
+def document_counts(
+    terms: ir.ArrayValue, *, count_occurrences: bool = False
+) -> ir.Table:
     r"""Create a lookup Table from term to number of records containing the term.
 
     Parameters
@@ -19,6 +23,14 @@ def document_counts(terms: ir.ArrayValue) -> ir.Table:
         Or, it could also represent more generic data, such as a list of tags or
         categories like ["red", "black"]. Each term can be any datatype,
         not just strings.
+    count_occurrences:
+        If True, `n_records` is the total number of times each term occurs
+        across all the arrays, instead of the number of distinct records
+        that contain it.
+        This avoids numbering the records and a distinct count per term,
+        so it is a single cheap aggregation whose state is one counter per term.
+        The two are the same if no record contains the same term twice,
+        eg if you have already called `.unique()` on the arrays.
 
     Returns
     -------
@@ -60,6 +72,9 @@ def document_counts(terms: ir.ArrayValue) -> ir.Table:
     """  # noqa: E501
     if not isinstance(terms, ir.ArrayValue):
         raise ValueError(f"Unsupported type {type(terms)}")
+    if count_occurrences:
+        flat = terms.name("terms").as_table().select(term=_.terms.unnest())
+        return flat.group_by("term").agg(n_records=_.count())
     terms_table = (
         terms.name("terms")
         .as_table()
@@ -73,9 +88,19 @@ def document_counts(terms: ir.ArrayValue) -> ir.Table:
     return by_term
 
 
-def term_idf(terms: ir.ArrayColumn) -> ir.Table:
+def term_idf(terms: ir.ArrayColumn, *, count_occurrences: bool = False) -> ir.Table:
     r"""Create a lookup Table from term to IDF.
 
+    Parameters
+    ----------
+    terms:
+        One row for each record. Each row is an array of terms in that record.
+    count_occurrences:
+        Passed to [document_counts][mismo.sets.document_counts].
+        If True, the IDFs are computed from the number of occurrences of each
+        term, which is the same as the number of records that contain it
+        if no record contains the same term twice.
+
     Examples
     --------
     >>> import ibis
@@ -108,7 +133,7 @@ def term_idf(terms: ir.ArrayColumn) -> ir.Table:
     │ st      │ 0.223144 │
     └─────────┴──────────┘
     """
-    dc = document_counts(terms)
+    dc = document_counts(terms, count_occurrences=count_occurrences)
     n_total_records = terms.count()
     idf = dc.select(
         "term",
@@ -274,11 +299,177 @@ def add_tfidf(
     return result
 
 
+class TfIdfModel:
+    r"""A TF-IDF model, fit once on a corpus and then used to vectorize new records.
+
+    Unlike [add_tfidf][mismo.sets.add_tfidf], which recomputes the corpus
+    statistics every time it is called, this stores a dictionary from each
+    term in the corpus to an integer id and its IDF.
+    Transforming a table then only needs a single lookup into this dictionary,
+    so you can score new records against a fitted corpus cheaply,
+    and persist the fitted model with [to_parquet][mismo.sets.TfIdfModel.to_parquet].
+
+    The vectors are sparse, represented as
+    `struct<indices: array<int32>, values: array<float64>>`,
+    where `indices` are the (sorted) term ids and `values` are the TF-IDF weights.
+    Terms that weren't seen while fitting are ignored.
+
+    Examples
+    --------
+    >>> import ibis
+    >>> from mismo.sets import TfIdfModel
+    >>> corpus = ibis.memtable(
+    ...     {
+    ...         "terms": [
+    ...             ["12", "main", "st"],
+    ...             ["99", "main", "ave"],
+    ...             ["21", "oak", "st"],
+    ...         ]
+    ...     }
+    ... )
+    >>> model = TfIdfModel.fit(corpus.terms)
+    >>> model.vocabulary.order_by("term_id").term.execute().tolist()
+    ['12', '21', '99', 'ave', 'main', 'oak', 'st']
+    >>> new = ibis.memtable({"terms": [["12", "main", "ave", "unseen"]]})
+    >>> model.transform(new, "terms", normalize=False).terms_tfidf.execute()[0]
+    {'indices': [0, 3, 4], 'values': [1.0986122886681098, 1.0986122886681098, 0.4054651081081644]}
+    """  # noqa: E501
+
+    def __init__(self, vocabulary: ir.Table) -> None:
+        """Create a TfIdfModel from an already-computed vocabulary.
+
+        Usually you want to use [fit][mismo.sets.TfIdfModel.fit] or
+        [from_parquet][mismo.sets.TfIdfModel.from_parquet] instead.
+
+        Parameters
+        ----------
+        vocabulary
+            A table with columns `term`, `term_id` (unique integers), and `idf`.
+        """
+        missing = {"term", "term_id", "idf"} - set(vocabulary.columns)
+        if missing:
+            raise ValueError(f"vocabulary is missing columns {sorted(missing)}")
+        self.vocabulary = vocabulary.select(
+            "term", term_id=_.term_id.cast("int32"), idf=_.idf.cast("float64")
+        )
+
+    vocabulary: ir.Table
+    """A table of `term`, `term_id`, and `idf`, one row per term in the corpus."""
+
+    @classmethod
+    def fit(cls, terms: ir.ArrayColumn) -> TfIdfModel:
+        """Compute the vocabulary and IDF of every term in a corpus.
+
+        Parameters
+        ----------
+        terms
+            One row for each record. Each row is an array of terms in that record.
+
+        Returns
+        -------
+        TfIdfModel
+            The fitted model. Its vocabulary is cached,
+            so the corpus statistics are only computed once.
+        """
+        idf = term_idf(terms)
+        vocabulary = idf.select(
+            "term",
+            term_id=(ibis.row_number().over(order_by="term")).cast("int32"),
+            idf="idf",
+        )
+        return cls(vocabulary.cache())
+
+    def transform(
+        self,
+        t: ir.Table,
+        column: str,
+        *,
+        result_name: str = "{name}_tfidf",
+        normalize: bool = True,
+    ) -> ir.Table:
+        """Add a column with the TF-IDF vector of each record.
+
+        Parameters
+        ----------
+        t
+            The table to vectorize.
+        column
+            The name of the array column of terms.
+        result_name
+            The name of the resulting column. The default is "{name}_tfidf".
+        normalize
+            Whether to normalize the TF-vector before multiplying by the IDF.
+            This is the same as in [add_tfidf][mismo.sets.add_tfidf].
+
+        Returns
+        -------
+        Table
+            The input table with a column of
+            `struct<indices: array<int32>, values: array<float64>>`.
+            NULL arrays of terms give NULL vectors.
+        """
+        t = t.mutate(__terms=_util.bind_one(t, column))
+        # Each distinct array of terms is only vectorized once.
+        flat = (
+            t.select("__terms")
+            .distinct()
+            .mutate(term=_["__terms"].unnest())
+            .filter(_.term.notnull())
+        )
+        counts = flat.group_by(["__terms", "term"]).agg(__tf=_.count())
+        if normalize:
+            norm = (_["__tf"] * _["__tf"]).sum().over(group_by="__terms").sqrt()
+            counts = counts.mutate(__tf=_["__tf"] / norm)
+        weighted = counts.join(self.vocabulary, "term").mutate(
+            __weight=_["__tf"] * _.idf
+        )
+        vectors = weighted.group_by("__terms").agg(
+            __indices=_.term_id.collect(order_by=_.term_id),
+            __values=_["__weight"].collect(order_by=_.term_id),
+        )
+        result = t.left_join(vectors, "__terms")
+        empty_indices = ibis.literal([], type="array<int32>")
+        empty_values = ibis.literal([], type="array<float64>")
+        vector = ibis.struct(
+            {
+                "indices": _["__indices"].fill_null(empty_indices),
+                "values": _["__values"].fill_null(empty_values),
+            }
+        )
+        r = result_name.format(name=column)
+        result = result.mutate(
+            _["__terms"].isnull().ifelse(ibis.null(), vector).name(r)
+        )
+        return result.drop("__terms", "__terms_right", "__indices", "__values")
+
+    def to_parquet(self, path: str | Path, /, *, overwrite: bool = False) -> None:
+        """Write the vocabulary to a parquet file."""
+        p = Path(path)
+        if p.exists() and not overwrite:
+            raise FileExistsError(f"{p} already exists")
+        p.parent.mkdir(parents=True, exist_ok=True)
+        self.vocabulary.to_parquet(p)
+
+    @classmethod
+    def from_parquet(
+        cls, path: str | Path, /, *, backend: ibis.BaseBackend | None = None
+    ) -> TfIdfModel:
+        """Load a model written with [to_parquet][mismo.sets.TfIdfModel.to_parquet]."""
+        if backend is None:
+            backend = ibis.get_backend()
+        return cls(backend.read_parquet(Path(path)))
+
+    def __repr__(self) -> str:
+        # Don't execute anything, the vocabulary may be expensive to compute.
+        return f"{self.__class__.__name__}<term_type={self.vocabulary.term.type()}>"
+
+
 def rare_terms(
     terms: ir.ArrayColumn,
     *,
     max_records_n: int | None = None,
     max_records_frac: float | None = None,
+    count_occurrences: bool = False,
 ) -> ir.Column:
     """Get the terms that appear in few records.
 
@@ -295,6 +486,11 @@ def rare_terms(
         The maximum number of records a term can appear in. The default is None.
     max_records_frac : float, optional
         The maximum fraction of records a term can appear in. The default is None.
+    count_occurrences : bool, optional
+        Passed to [document_counts][mismo.sets.document_counts].
+        If True, `max_records_n` and `max_records_frac` limit how many times
+        a term occurs, instead of how many records contain it.
+        This is the same if no record contains the same term twice.
 
     Returns
     -------
@@ -305,7 +501,7 @@ def rare_terms(
         raise ValueError("Only one of max_records_n or max_records_frac can be set")
     if max_records_n is None and max_records_frac is None:
         raise ValueError("One of max_records_n or max_records_frac must be set")
-    dc = document_counts(terms)
+    dc = document_counts(terms, count_occurrences=count_occurrences)
     if max_records_n is not None:
         rare = dc.filter(_.n_records <= max_records_n)
     else:
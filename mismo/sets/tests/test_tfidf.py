@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import math
+
 import ibis
+from ibis.expr import datatypes as dt
 import pytest
 
 from mismo import sets
@@ -32,6 +35,25 @@ def test_document_counts(table_factory):
     assert_tables_equal(result, expected)
 
 
+def test_document_counts_count_occurrences(table_factory):
+    terms = [["st", "main", "st"], ["st", "oak"], ["main"], [], None]
+    t = table_factory({"terms": terms})
+
+    def counts(terms, **kwargs):
+        df = sets.document_counts(terms, **kwargs).execute()
+        return dict(zip(df.term, df.n_records))
+
+    exact = counts(t.terms)
+    assert exact == {"st": 2, "main": 2, "oak": 1}
+    # repeats within a record are counted each time
+    assert counts(t.terms, count_occurrences=True) == {"st": 3, "main": 2, "oak": 1}
+    # so with unique terms per record the result is the same
+    assert counts(t.terms.unique(), count_occurrences=True) == exact
+
+    rare = sets.rare_terms(t.terms, max_records_n=2, count_occurrences=True).execute()
+    assert set(rare) == {"main", "oak"}
+
+
 @pytest.mark.parametrize(
     "terms, expected",
     [
@@ -141,3 +163,60 @@ def test_add_tfidf(table_factory):
         },
     )
     assert_tables_equal(result, expected)
+
+
+@pytest.mark.parametrize("normalize", [True, False])
+def test_tfidf_model_matches_add_tfidf(table_factory, normalize):
+    terms = [
+        ["st"],
+        ["12", "main", "st"],
+        ["99", "main", "ave"],
+        ["56", "st", "joseph", "st"],
+        ["21", "glacier", "st"],
+    ]
+    t = table_factory({"id": range(len(terms)), "terms": terms})
+    model = sets.TfIdfModel.fit(t.terms)
+    vocab = dict(model.vocabulary.select("term_id", "term").execute().values.tolist())
+    result = model.transform(t, "terms", normalize=normalize).order_by("id")
+    expected = sets.add_tfidf(t, "terms", normalize=normalize).order_by("id")
+    for vec, exp in zip(
+        result.terms_tfidf.execute(), expected.terms_tfidf.execute(), strict=True
+    ):
+        assert vec["indices"] == sorted(vec["indices"])
+        as_map = {vocab[i]: v for i, v in zip(vec["indices"], vec["values"])}
+        assert as_map == pytest.approx(exp)
+
+
+def test_tfidf_model_transform_edge_cases(table_factory):
+    corpus = table_factory({"terms": [["a", "b"], ["b", "c"]]})
+    model = sets.TfIdfModel.fit(corpus.terms)
+    t = table_factory(
+        {"id": [0, 1, 2, 3], "terms": [None, [], ["unseen"], ["a", None, "unseen"]]}
+    )
+    result = model.transform(t, "terms", result_name="vec", normalize=False)
+    assert result.columns == ("id", "terms", "vec")
+    assert result.vec.type() == dt.dtype(
+        "struct<indices: array<int32>, values: array<float64>>"
+    )
+    vecs = result.order_by("id").vec.execute().tolist()
+    assert vecs[0] is None
+    assert vecs[1] == {"indices": [], "values": []}
+    assert vecs[2] == {"indices": [], "values": []}
+    assert vecs[3] == {"indices": [0], "values": [pytest.approx(math.log(2))]}
+
+
+def test_tfidf_model_parquet(table_factory, tmp_path):
+    corpus = table_factory({"terms": [["a", "b"], ["b", "c"]]})
+    model = sets.TfIdfModel.fit(corpus.terms)
+    p = tmp_path / "model.parquet"
+    model.to_parquet(p)
+    with pytest.raises(FileExistsError):
+        model.to_parquet(p)
+    loaded = sets.TfIdfModel.from_parquet(p)
+    assert_tables_equal(loaded.vocabulary, model.vocabulary)
+
+
+def test_tfidf_model_repr(table_factory):
+    corpus = table_factory({"terms": [["a", "b"], ["b", "c"]]})
+    model = sets.TfIdfModel.fit(corpus.terms)
+    assert repr(model) == "TfIdfModel<term_type=string>"
@@ -136,3 +136,64 @@ def test_optional_import():
 
             assert False, "should not get here"
     assert "foo" in str(excinfo.value)
+
+
+def test_distinct_udf(table_factory):
+    calls = []
+
+    def f(s):
+        calls.append(s)
+        return {"upper": s.upper(), "n": len(s)}
+
+    udf = _util.distinct_udf(
+        f, input_type="string", output_type="struct<upper: string, n: int64>"
+    )
+    t = table_factory({"id": [0, 1, 2, 3], "s": ["ab", None, "ab", "c"]})
+    df = t.mutate(x=udf(_.s)).order_by("id").execute()
+    assert df.x.tolist() == [
+        {"upper": "AB", "n": 2},
+        None,
+        {"upper": "AB", "n": 2},
+        {"upper": "C", "n": 1},
+    ]
+    assert sorted(calls) == ["ab", "c"]
+    # remembered between calls
+    t.mutate(x=udf(_.s)).execute()
+    assert sorted(calls) == ["ab", "c"]
+
+
+def test_distinct_udf_batched(table_factory):
+    calls = []
+
+    def f(values):
+        calls.append(values)
+        return [v * 2 for v in values]
+
+    udf = _util.distinct_udf(f, input_type="string", output_type="string", batched=True)
+    t = table_factory({"id": [0, 1, 2, 3], "s": ["ab", None, "ab", "c"]})
+    df = t.mutate(x=udf(_.s)).order_by("id").execute()
+    assert df.x.tolist() == ["abab", None, "abab", "cc"]
+    assert [sorted(c) for c in calls] == [["ab", "c"]]
+    # everything is cached, so func isn't called again
+    t.mutate(x=udf(_.s)).execute()
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("n_process", [1, 2])
+def test_map_chunks(n_process):
+    values = [5, 4, 3, 2, 1]
+    result = _util.map_chunks(sorted, values, chunk_size=2, n_process=n_process)
+    # each chunk is processed separately, and the chunks stay in order
+    assert result == [4, 5, 2, 3, 1]
+
+
+def test_lru_cache_bounded():
+    cache = _util._LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    # b was least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
@@ -2,16 +2,30 @@
 
 from __future__ import annotations
 
+from mismo.text._features import hashed_ngrams as hashed_ngrams
 from mismo.text._features import ngrams as ngrams
 from mismo.text._features import tokenize as tokenize
+from mismo.text._phonetic import double_metaphone as double_metaphone
+from mismo.text._phonetic import metaphone as metaphone
+from mismo.text._phonetic import nysiis as nysiis
+from mismo.text._phonetic import soundex as soundex
 from mismo.text._re_extract import re_extract_struct as re_extract_struct
 from mismo.text._similarity import damerau_levenshtein as damerau_levenshtein
+from mismo.text._similarity import (
+    damerau_levenshtein_at_most as damerau_levenshtein_at_most,
+)
 from mismo.text._similarity import (
     damerau_levenshtein_ratio as damerau_levenshtein_ratio,
 )
-from mismo.text._similarity import double_metaphone as double_metaphone
+from mismo.text._similarity import (
+    damerau_levenshtein_ratio_at_least as damerau_levenshtein_ratio_at_least,
+)
 from mismo.text._similarity import jaro_similarity as jaro_similarity
 from mismo.text._similarity import jaro_winkler_similarity as jaro_winkler_similarity
+from mismo.text._similarity import levenshtein_at_most as levenshtein_at_most
 from mismo.text._similarity import levenshtein_ratio as levenshtein_ratio
+from mismo.text._similarity import (
+    levenshtein_ratio_at_least as levenshtein_ratio_at_least,
+)
 from mismo.text._strings import norm_whitespace as norm_whitespace
 from mismo.text._strings import strip_accents as strip_accents
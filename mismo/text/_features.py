@@ -27,10 +27,13 @@ def tokenize(text: ir.StringValue) -> ir.ArrayValue:
     return (stripped == "").ifelse([], stripped.re_split(r"\s+"))  # ty:ignore[unresolved-attribute]
 
 
-# from https://www.imperva.com/blog/fast-n-grams-extraction-and-analysis-with-sql/
 def ngrams(string: ir.StringValue, n: int) -> ir.ArrayValue:
     """
-    Character n-grams from a string. The order of the n-grams is not guaranteed.
+    Character n-grams from a string, in order of their position in the string.
+
+    The array is built in a single pass over the string.
+    See [hashed_ngrams][mismo.text.hashed_ngrams]
+    for a more compact representation.
 
     Parameters
     ----------
@@ -49,31 +52,79 @@ def ngrams(string: ir.StringValue, n: int) -> ir.ArrayValue:
     >>> from mismo.text import ngrams
     >>> ngrams("abc", 2).execute()
     ['ab', 'bc']
+    >>> ngrams("abcdef", 3).execute()
+    ['abc', 'bcd', 'cde', 'def']
     >>> ngrams("", 2).execute()
     []
     >>> ngrams("a", 2).execute()
     []
     >>> ngrams(None, 4).execute() is None
     True
+    """
+    if n < 1:
+        raise ValueError("n must be greater than 0")
+    s: ir.StringValue = _util.ensure_val(string, "string")  # ty:ignore[invalid-assignment]
+    return _starts(s, n).map(lambda i: s.substr(i, n))
 
-    Order of n-grams is not guaranteed:
 
-    >>> ngrams("abcdef", 3).execute()
-    ['abc', 'def', 'bcd', 'cde']
+def hashed_ngrams(
+    string: ir.StringValue, n: int, *, n_buckets: int | None = None
+) -> ir.ArrayValue:
+    """
+    Hashed character n-grams from a string, in order of their position in the string.
+
+    This is the same as `ngrams(string, n)`, except that each n-gram is
+    replaced by an integer id. Integers are several times smaller than strings,
+    and faster to compare, so this is useful for n-gram blocking and
+    set similarities such as [jaccard][mismo.sets.jaccard] on large tables.
+    Identical n-grams always get the same id,
+    but different n-grams might (rarely) collide.
+
+    The ids come from the backend's hash function,
+    so they are only comparable with ids computed by the same backend.
+
+    Parameters
+    ----------
+    string:
+        The string to generate n-grams from.
+    n:
+        The number of characters in each n-gram.
+    n_buckets:
+        If None, the default, return the full int64 hash of each n-gram.
+        Otherwise, bucket the hashes into int32 ids in `[0, n_buckets)`.
+        Fewer buckets use less memory, but lead to more collisions.
+
+    Returns
+    -------
+    An `array<int64>`, or `array<int32>` if `n_buckets` is given.
+
+    Examples
+    --------
+    >>> import ibis
+    >>> from mismo.text import hashed_ngrams
+    >>> ids = hashed_ngrams("abab", 2, n_buckets=1000).execute()
+    >>> len(ids), ids[0] == ids[2], all(0 <= i < 1000 for i in ids)
+    (3, True, True)
+    >>> hashed_ngrams(None, 2).execute() is None
+    True
     """
     if n < 1:
         raise ValueError("n must be greater than 0")
-    resolved: ibis.ir.StringValue | ibis.Deferred = _util.ensure_val(string, "string")  # ty:ignore[invalid-assignment]
-    pattern = "." * n
-    # if you just do _re_extract_all("abcdef", "..."), you get ["abc", "def"].
-    # So to get the "bcd" and the "cde", we need to offset the string
-    # by one and two (in general up to n-1) characters.
-    first, *rest = [_re_extract_all(resolved[i:], pattern) for i in range(0, n)]
-    result = resolved.isnull().ifelse(ibis.null("array<string>"), first.concat(*rest))
-    return result  # ty:ignore[invalid-return-type]
-
-
-@ibis.udf.scalar.builtin(
-    name="regexp_extract_all", signature=(("string", "string"), "array<string>")
-)
-def _re_extract_all(string, pattern): ...
+    if n_buckets is not None and not 0 < n_buckets <= 2**31:
+        raise ValueError(f"n_buckets must be between 1 and 2**31, got {n_buckets}")
+    s: ir.StringValue = _util.ensure_val(string, "string")  # ty:ignore[invalid-assignment]
+
+    def to_id(i: ir.IntegerValue) -> ir.IntegerValue:
+        h = s.substr(i, n).hash()
+        if n_buckets is None:
+            return h
+        # The hash can be negative
+        return ((h % n_buckets + n_buckets) % n_buckets).cast("int32")
+
+    return _starts(s, n).map(to_id)
+
+
+def _starts(s: ir.StringValue, n: int) -> ir.ArrayValue:
+    """The (0-indexed) start position of every n-gram in the string."""
+    # This is NULL if s is NULL, and empty if s is shorter than n.
+    return ibis.range(0, s.length() - n + 1)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from ibis.expr import types as ir
+
+from mismo import _util
+
+# All of these encoders (except double_metaphone) are built from plain
+# string expressions (regex replaces, translate, etc), so they compile
+# to SQL and run inside the backend's vectorized, parallel executor,
+# instead of calling back into python for every row.
+#
+# duckdb's regex engine (RE2) doesn't support lookarounds or backreferences
+# in patterns, so context-dependent rules are written as capture groups
+# that are re-inserted into the replacement, and runs of repeated letters
+# are collapsed with _collapse_runs().
+
+
+def soundex(s: ir.StringValue) -> ir.StringValue:
+    """American Soundex phonetic encoding.
+
+    Non-letters are ignored. The result is the first letter followed by
+    three digits, eg "R163". If there are no letters, the result is "".
+
+    This is implemented with native string operations,
+    so it is fast.
+
+    Examples
+    --------
+    >>> from mismo.text import soundex
+    >>> soundex("Robert").execute()
+    'R163'
+    >>> soundex("Ashcraft").execute()
+    'A261'
+    >>> soundex("").execute()
+    ''
+    >>> soundex(None).execute() is None
+    True
+    """
+    s = _util.ensure_val(s, "string")
+    letters = s.upper().re_replace(r"[^A-Z]", "")
+    first = letters[0]
+    # vowels and Y are 0, which separate repeated consonant codes,
+    # H and W are deleted, so they don't separate them.
+    codes = letters.translate("AEIOUYBFPVCGJKQSXZDTLMNRHW", "000000111122222222334556")
+    codes = _collapse_runs(codes)
+    # The code of the first letter is not part of the digits.
+    # If the first letter is H or W, it has no code to drop.
+    digits = first.isin(["H", "W"]).ifelse(codes, codes[1:]).replace("0", "")
+    result = (first + digits + "000")[:4]
+    return (letters.length() == 0).ifelse("", result)
+
+
+def nysiis(s: ir.StringValue) -> ir.StringValue:
+    """New York State Identification and Intelligence System phonetic encoding.
+
+    Non-letters are ignored. The result is not truncated. If you want the
+    classic 6-character code, use `nysiis(s)[:6]`.
+
+    This is implemented with native string operations,
+    so it is fast.
+
+    Examples
+    --------
+    >>> from mismo.text import nysiis
+    >>> nysiis("Knight").execute()
+    'NAGT'
+    >>> nysiis("Mitchell").execute()
+    'MATCAL'
+    >>> nysiis(None).execute() is None
+    True
+    """
+    s = _util.ensure_val(s, "string")
+    w = s.upper().re_replace(r"[^A-Z]", "")
+    w = (
+        w.re_replace(r"^MAC", "MCC")
+        .re_replace(r"^KN", "NN")
+        .re_replace(r"^K", "C")
+        .re_replace(r"^(PH|PF)", "FF")
+        .re_replace(r"^SCH", "SSS")
+    )
+    w = w.re_replace(r"(EE|IE)$", "Y").re_replace(r"(DT|RT|RD|NT|ND)$", "D")
+    # The first letter is kept as-is. Lowercase it, so that none of the
+    # (uppercase) rules below match it, but it is still there as context.
+    w = w[0].lower() + w[1:]
+    w = w.replace("EV", "AF").re_replace(r"[EIOU]", "A")
+    w = w.translate("QZM", "GSN")
+    w = w.replace("KN", "N").replace("K", "C")
+    w = w.replace("SCH", "SSS").replace("PH", "FF")
+    # H after or before a non-vowel becomes the previous letter
+    w = w.re_replace(r"([^Aaeiou])H", r"\1\1")
+    w = w.re_replace(r"(.)H([^A]|$)", r"\1\1\2")
+    # W after a vowel becomes the previous letter
+    w = w.re_replace(r"([Aaeiou])W", r"\1\1")
+    w = _collapse_runs(w)
+    w = w.re_replace(r"S$", "").re_replace(r"AY$", "Y").re_replace(r"A$", "")
+    return w.upper()
+
+
+def metaphone(s: ir.StringValue) -> ir.StringValue:
+    """Metaphone phonetic encoding.
+
+    This is the original Metaphone algorithm by Lawrence Philips.
+    Non-letters are ignored. "TH" is encoded as "0" and "SH" as "X".
+
+    This is implemented with native string operations,
+    so it is fast.
+    See [double_metaphone][mismo.text.double_metaphone]
+    for a more accurate, but much slower, alternative.
+
+    Examples
+    --------
+    >>> from mismo.text import metaphone
+    >>> metaphone("Thompson").execute()
+    '0MPSN'
+    >>> metaphone("Knight").execute()
+    'NT'
+    >>> metaphone(None).execute() is None
+    True
+    """
+    s = _util.ensure_val(s, "string")
+    w = s.upper().re_replace(r"[^A-Z]", "")
+    w = _collapse_runs(w, keep="C")
+    # initial letters
+    w = (
+        w.re_replace(r"^([GKP])N", "N")
+        .re_replace(r"^AE", "E")
+        .re_replace(r"^WR", "R")
+        .re_replace(r"^WH", "W")
+        .re_replace(r"^X", "S")
+    )
+    w = w.re_replace(r"MB$", "M")
+    # Do X first, since X is also used for the "SH" sound below
+    w = w.replace("X", "KS")
+    # C
+    w = w.replace("SCH", "SK").replace("TCH", "CH").replace("CH", "X")
+    w = w.re_replace(r"CIA", "XIA").re_replace(r"C([IEY])", r"S\1")
+    w = w.replace("CK", "K").replace("C", "K")
+    # T before D, so the T that D becomes isn't mistaken for one,
+    # eg Claudia isn't KLX, and Adhere isn't A0R
+    w = w.re_replace(r"T(IO|IA)", r"X\1").replace("TH", "0")
+    # D, the G of DG[EIY] is silent
+    w = w.re_replace(r"DG([EIY])", r"J\1").replace("D", "T")
+    # G
+    w = w.re_replace(r"GH([^AEIOU])", r"H\1")
+    w = w.re_replace(r"GN(ED)?$", r"N\1")
+    w = w.re_replace(r"G([EIY])", r"J\1").replace("G", "K")
+    # Digraphs
+    w = w.replace("PH", "F").replace("SH", "X")
+    w = w.re_replace(r"S(IO|IA)", r"X\1")
+    # Silent letters
+    w = w.re_replace(r"([AEIOU])H([^AEIOU]|$)", r"\1\2")
+    w = w.re_replace(r"W([^AEIOU]|$)", r"\1")
+    w = w.re_replace(r"Y([^AEIOU]|$)", r"\1")
+    w = w.translate("QVZ", "KFS")
+    # vowels are only kept at the start
+    return w[0] + w[1:].re_replace(r"[AEIOU]", "")
+
+
+def double_metaphone(s: ir.StringValue) -> ir.ArrayValue[ir.StringValue]:
+    """Double Metaphone phonetic encoding
+
+    This requires the [doublemetaphone](https://github.com/dedupeio/doublemetaphone)
+    package to be installed.
+    You can install it with `python -m pip install DoubleMetaphone`.
+
+    This is a python UDF, but it is vectorized with pyarrow:
+    every distinct value in a batch is only encoded once,
+    and results are also cached between batches.
+    Still, prefer [metaphone][mismo.text.metaphone],
+    [nysiis][mismo.text.nysiis], or [soundex][mismo.text.soundex],
+    which run natively in the backend, if they are good enough.
+
+    Examples
+    --------
+    >>> from mismo.text import double_metaphone
+    >>> double_metaphone("catherine").execute()
+    ['K0RN', 'KTRN']
+    >>> double_metaphone("").execute()
+    ['', '']
+    >>> double_metaphone(None).execute() is None
+    True
+    """
+    s = _util.ensure_val(s, "string")
+    return _dm_udf(s)
+
+
+def _dm_one(s: str) -> tuple[str, str]:
+    with _util.optional_import("DoubleMetaphone"):
+        from doublemetaphone import doublemetaphone
+
+    return tuple(doublemetaphone(s))
+
+
+_dm_udf = _util.distinct_udf(_dm_one, input_type="string", output_type="array<string>")
+
+
+def _collapse_runs(s: ir.StringValue, *, keep: str = "") -> ir.StringValue:
+    """Collapse runs of the same letter (case-insensitive) into the first letter.
+
+    Letters in `keep` are never collapsed.
+    """
+    chars = s.split("")
+
+    def is_new(x: ir.StringValue, i: ir.IntegerValue) -> ir.BooleanValue:
+        is_different = x.upper() != chars[i - 1].upper()
+        if keep:
+            is_different |= x.isin(list(keep))
+        return (i == 0) | is_different
+
+    return chars.filter(is_new).join("")
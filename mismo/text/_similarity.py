@@ -6,36 +6,6 @@ from ibis.expr import types as ir
 from mismo import _util
 
 
-def double_metaphone(s: ir.StringValue) -> ir.ArrayValue[ir.StringValue]:
-    """Double Metaphone phonetic encoding
-
-    This requires the [doublemetaphone](https://github.com/dedupeio/doublemetaphone)
-    package to be installed.
-    You can install it with `python -m pip install DoubleMetaphone`.
-    This uses a python UDF so it is going to be slow.
-
-    Examples
-    --------
-    >>> from mismo.text import double_metaphone
-    >>> double_metaphone("catherine").execute()
-    ['K0RN', 'KTRN']
-    >>> double_metaphone("").execute()
-    ['', '']
-    >>> double_metaphone(None).execute() is None
-    True
-    """
-    s = _util.ensure_val(s, "string")
-    return _dm_udf(s)
-
-
-@ibis.udf.scalar.python(signature=(("string",), "array<string>"))
-def _dm_udf(s):
-    with _util.optional_import("DoubleMetaphone"):
-        from doublemetaphone import doublemetaphone
-
-    return doublemetaphone(s)
-
-
 # TODO: this isn't portable between backends
 @ibis.udf.scalar.builtin
 def damerau_levenshtein(a: str, b: str) -> int:
@@ -109,6 +79,148 @@ def _dist_ratio(s1, s2, dist):
     return (lenmax - dist(s1, s2)) / lenmax
 
 
+def levenshtein_at_most(
+    s1: ir.StringValue, s2: ir.StringValue, max_distance: int | ir.IntegerValue
+) -> ir.BooleanValue:
+    """Whether the levenshtein distance between two strings is at most `max_distance`.
+
+    This gives the same result as `s1.levenshtein(s2) <= max_distance`,
+    but is faster when most pairs are not within the distance.
+    The edit distance is at least the difference in lengths of the strings,
+    so pairs whose lengths differ by more than `max_distance` are rejected
+    without computing the edit distance, and identical strings are accepted
+    without computing it either.
+    Only the remaining pairs pay for the full edit distance computation.
+
+    Parameters
+    ----------
+    s1
+        The first string
+    s2
+        The second string
+    max_distance
+        The maximum edit distance. This can be an expression,
+        eg to allow more typos in longer strings.
+
+    Returns
+    -------
+    within
+        NULL if either string is NULL.
+
+    Examples
+    --------
+    >>> from mismo.text import levenshtein_at_most
+    >>> levenshtein_at_most("mile", "mike", 1).execute()
+    True
+    >>> levenshtein_at_most("mile", "miles", 0).execute()
+    False
+    """
+    return _dist_at_most(s1, s2, max_distance, lambda a, b: a.levenshtein(b))
+
+
+def damerau_levenshtein_at_most(
+    s1: ir.StringValue, s2: ir.StringValue, max_distance: int | ir.IntegerValue
+) -> ir.BooleanValue:
+    """Like levenshtein_at_most, but with the Damerau-Levenshtein distance.
+
+    Examples
+    --------
+    >>> from mismo.text import damerau_levenshtein_at_most
+    >>> damerau_levenshtein_at_most("12345", "12354", 1).execute()
+    True
+
+    See Also
+    --------
+    - [damerau_levenshtein()][mismo.text.damerau_levenshtein]
+    - [levenshtein_at_most()][mismo.text.levenshtein_at_most]
+    """
+    return _dist_at_most(s1, s2, max_distance, damerau_levenshtein)
+
+
+def levenshtein_ratio_at_least(
+    s1: ir.StringValue,
+    s2: ir.StringValue,
+    min_ratio: float,
+    *,
+    inclusive: bool = True,
+) -> ir.BooleanValue:
+    """Whether the [levenshtein_ratio][mismo.text.levenshtein_ratio] is at least `min_ratio`.
+
+    This gives the same result as `levenshtein_ratio(s1, s2) >= min_ratio`,
+    but is faster when most pairs are below the threshold.
+    Since the edit distance is at least the difference in lengths of the strings,
+    the ratio can be no more than `shorter_length / longer_length`.
+    Pairs where that bound is already below `min_ratio`
+    are rejected without computing the edit distance.
+
+    Parameters
+    ----------
+    s1
+        The first string
+    s2
+        The second string
+    min_ratio
+        The threshold, between 0 and 1.
+    inclusive
+        If True (the default), test `ratio >= min_ratio`.
+        If False, test `ratio > min_ratio`.
+
+    Examples
+    --------
+    >>> from mismo.text import levenshtein_ratio_at_least
+    >>> levenshtein_ratio_at_least("mile", "mike", 0.75).execute()
+    True
+    >>> levenshtein_ratio_at_least("mile", "mike", 0.75, inclusive=False).execute()
+    False
+    """  # noqa: E501
+    return _ratio_at_least(s1, s2, min_ratio, inclusive, lambda a, b: a.levenshtein(b))
+
+
+def damerau_levenshtein_ratio_at_least(
+    s1: ir.StringValue,
+    s2: ir.StringValue,
+    min_ratio: float,
+    *,
+    inclusive: bool = True,
+) -> ir.BooleanValue:
+    """Like levenshtein_ratio_at_least, but with the Damerau-Levenshtein distance.
+
+    See Also
+    --------
+    - [damerau_levenshtein_ratio()][mismo.text.damerau_levenshtein_ratio]
+    - [levenshtein_ratio_at_least()][mismo.text.levenshtein_ratio_at_least]
+    """
+    return _ratio_at_least(s1, s2, min_ratio, inclusive, damerau_levenshtein)
+
+
+def _dist_at_most(s1, s2, max_distance, dist):
+    s1 = _util.ensure_val(s1, "string")
+    s2 = _util.ensure_val(s2, "string")
+    length_diff = (s1.length() - s2.length()).abs()
+    # The CASE means the backend only computes the expensive distance
+    # for the rows that make it past the cheap checks.
+    return _util.cases(
+        (length_diff > max_distance, False),
+        (s1 == s2, True),
+        else_=dist(s1, s2) <= max_distance,
+    )
+
+
+def _ratio_at_least(s1, s2, min_ratio, inclusive, dist):
+    s1 = _util.ensure_val(s1, "string")
+    s2 = _util.ensure_val(s2, "string")
+    len_sum = s1.length() + s2.length()
+    length_diff = (s1.length() - s2.length()).abs()
+    # shorter / longer, written so it is NULL if either string is NULL
+    upper_bound = (len_sum - length_diff) / (len_sum + length_diff)
+    ratio = _dist_ratio(s1, s2, dist)
+    if inclusive:
+        too_far, passes = upper_bound < min_ratio, ratio >= min_ratio
+    else:
+        too_far, passes = upper_bound <= min_ratio, ratio > min_ratio
+    return _util.cases((too_far, False), else_=passes)
+
+
 @ibis.udf.scalar.builtin(name="jaro_similarity")
 def _jaro_similarity(s1: str, s2: str) -> float: ...
 
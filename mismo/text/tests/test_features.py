@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import ibis
+from ibis.expr import datatypes as dt
 import pytest
 
 from mismo import text
@@ -18,6 +19,7 @@ from mismo import text
             3,
             ["abc", "bcd", "cde", "def"],
         ),
+        ("héllo", 2, ["hé", "él", "ll", "lo"]),
         ("", 2, []),
         ("a", 2, []),
         (None, 4, None),
@@ -28,7 +30,27 @@ def test_ngrams(inp, n, exp):
     if exp is None:
         assert result is None
     else:
-        assert set(result) == set(exp)
+        assert result == exp
+
+
+@pytest.mark.parametrize("n_buckets", [None, 2**31, 50])
+def test_hashed_ngrams(n_buckets):
+    ids = text.hashed_ngrams("abcab", 2, n_buckets=n_buckets)
+    assert ids.type() == dt.Array(dt.int64 if n_buckets is None else dt.int32)
+    result = ids.execute()
+    assert len(result) == 4
+    # "ab" is at positions 0 and 3
+    assert result[0] == result[3]
+    if n_buckets is not None:
+        assert all(0 <= i < n_buckets for i in result)
+    assert text.hashed_ngrams("a", 2).execute() == []
+    assert text.hashed_ngrams(ibis.null(str), 2).execute() is None
+
+
+@pytest.mark.parametrize("n_buckets", [0, -1, 2**31 + 1])
+def test_hashed_ngrams_invalid_buckets(n_buckets):
+    with pytest.raises(ValueError, match="n_buckets"):
+        text.hashed_ngrams("abc", 2, n_buckets=n_buckets)
 
 
 @pytest.mark.parametrize(
@@ -55,6 +77,8 @@ def test_tokenize(inp, exp):
 def test_ngrams_invalid_n(n):
     with pytest.raises(ValueError, match="n must be greater than 0"):
         text.ngrams("abc", n)
+    with pytest.raises(ValueError, match="n must be greater than 0"):
+        text.hashed_ngrams("abc", n)
 
 
 @pytest.mark.parametrize(
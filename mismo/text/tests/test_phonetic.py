@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import ibis
+import pytest
+
+from mismo import text
+
+NAMES = [
+    # name, soundex, nysiis, metaphone
+    ("Robert", "R163", "RABAD", "RBRT"),
+    ("Rupert", "R163", "RAPAD", "RPRT"),
+    ("Ashcraft", "A261", "ASCRAFT", "AXKRFT"),
+    ("Tymczak", "T522", "TYNCSAC", "TMKSK"),
+    ("Pfister", "P236", "FASTAR", "PFSTR"),
+    ("Honeyman", "H555", "HANAYNAN", "HNMN"),
+    ("Knight", "K523", "NAGT", "NT"),
+    ("Mitchell", "M324", "MATCAL", "MXL"),
+    ("Macintosh", "M253", "MCANT", "MSNTX"),
+    ("Evans", "E152", "EVAN", "EFNS"),
+    ("Thompson", "T512", "TANPSAN", "0MPSN"),
+    ("Phillips", "P412", "FALAP", "FLPS"),
+    ("Catherine", "C365", "CATARAN", "K0RN"),
+    ("Wright", "W623", "WRAGT", "RT"),
+    ("Xavier", "X160", "XAVAR", "SFR"),
+    ("Whitney", "W350", "WATNY", "WTN"),
+    ("O'Daniel", "O354", "ODANAL", "OTNL"),
+    ("", "", "", ""),
+]
+
+
+@pytest.mark.parametrize(
+    "func,column", [(text.soundex, 1), (text.nysiis, 2), (text.metaphone, 3)]
+)
+def test_phonetic(table_factory, func, column):
+    t = table_factory({"name": [row[0] for row in NAMES] + [None]})
+    result = t.select(func(t.name).name("code")).code.execute().tolist()
+    expected = [row[column] for row in NAMES] + [None]
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Claudia", "KLT"),
+        ("Dion", "TN"),
+        ("Nadia", "NT"),
+        ("Indiana", "INTN"),
+        ("Nation", "NXN"),
+        ("Edge", "EJ"),
+        ("Judge", "JJ"),
+        ("Bridget", "BRJT"),
+        ("Eindhoven", "ENTHFN"),
+        ("Adhere", "ATHR"),
+        ("Godhead", "KTHT"),
+    ],
+)
+def test_metaphone_d(name, expected):
+    assert text.metaphone(name).execute() == expected
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        pytest.param("hello", ["HL", "HL"], id="hello"),
+        pytest.param("world", ["ARLT", "FRLT"], id="world"),
+        pytest.param("hello world", ["HLRLT", "HLRLT"], id="hello world"),
+        pytest.param("catherine", ["K0RN", "KTRN"], id="catherine"),
+        pytest.param("", ["", ""], id="empty"),
+        pytest.param(None, None, id="empty"),
+    ],
+)
+def test_double_metaphone(input, expected):
+    result = text.double_metaphone(input).execute()
+    assert expected == result
+
+
+def test_double_metaphone_column(table_factory):
+    t = table_factory({"name": ["catherine", None, "hello", "catherine"]})
+    result = t.select(text.double_metaphone(t.name).name("dm")).dm.execute()
+    assert [None if r is None else list(r) for r in result] == [
+        ["K0RN", "KTRN"],
+        None,
+        ["HL", "HL"],
+        ["K0RN", "KTRN"],
+    ]
+
+
+def test_soundex_compiles_to_sql():
+    # It should be pure SQL, not a python UDF
+    sql = ibis.to_sql(text.soundex(ibis.literal("Robert")).name("s").as_table())
+    assert "TRANSLATE" in sql.upper()
@@ -6,22 +6,6 @@ import pytest
 from mismo import text
 
 
-@pytest.mark.parametrize(
-    "input, expected",
-    [
-        pytest.param("hello", ["HL", "HL"], id="hello"),
-        pytest.param("world", ["ARLT", "FRLT"], id="world"),
-        pytest.param("hello world", ["HLRLT", "HLRLT"], id="hello world"),
-        pytest.param("catherine", ["K0RN", "KTRN"], id="catherine"),
-        pytest.param("", ["", ""], id="empty"),
-        pytest.param(None, None, id="empty"),
-    ],
-)
-def test_double_metaphone(input, expected):
-    result = text.double_metaphone(input).execute()
-    assert expected == result
-
-
 @pytest.mark.parametrize(
     "string1,string2,expected",
     [
@@ -96,3 +80,57 @@ def test_jaro_similarity(string1, string2, expected):
         assert np.isnan(result)
     else:
         assert result == pytest.approx(expected, 0.001)
+
+
+@pytest.fixture
+def string_pairs(table_factory):
+    rng = np.random.default_rng(0)
+    words = ["", "a", "ab", "ba", "abc", "abcd", "abdc", "mile", "mike", "miles"]
+    words += ["12345", "12354", "smith", "smyth", "smithers", None]
+    n = 500
+    return table_factory(
+        {
+            "a": rng.choice(np.array(words, dtype=object), n),
+            "b": rng.choice(np.array(words, dtype=object), n),
+        }
+    )
+
+
+@pytest.mark.parametrize("max_distance", [0, 1, 2])
+@pytest.mark.parametrize(
+    "func,dist",
+    [
+        (text.levenshtein_at_most, lambda a, b: a.levenshtein(b)),
+        (text.damerau_levenshtein_at_most, text.damerau_levenshtein),
+    ],
+)
+def test_at_most_matches_full_distance(string_pairs, func, dist, max_distance):
+    t = string_pairs
+    t = t.mutate(
+        expected=dist(t.a, t.b) <= max_distance,
+        result=func(t.a, t.b, max_distance),
+    )
+    df = t.execute()
+    assert df.result.tolist() == df.expected.tolist()
+
+
+@pytest.mark.parametrize("inclusive", [True, False])
+@pytest.mark.parametrize("min_ratio", [0, 0.5, 0.75, 0.8, 1])
+@pytest.mark.parametrize(
+    "func,ratio",
+    [
+        (text.levenshtein_ratio_at_least, text.levenshtein_ratio),
+        (text.damerau_levenshtein_ratio_at_least, text.damerau_levenshtein_ratio),
+    ],
+)
+def test_ratio_at_least_matches_full_ratio(
+    string_pairs, func, ratio, min_ratio, inclusive
+):
+    t = string_pairs
+    r = ratio(t.a, t.b)
+    t = t.mutate(
+        expected=(r >= min_ratio) if inclusive else (r > min_ratio),
+        result=func(t.a, t.b, min_ratio, inclusive=inclusive),
+    )
+    df = t.execute()
+    assert df.result.tolist() == df.expected.tolist()
@@ -5,5 +5,6 @@ from mismo.types._diff import DiffStats as DiffStats
 from mismo.types._linked_table import LinkCountsTable as LinkCountsTable
 from mismo.types._linked_table import LinkedTable as LinkedTable
 from mismo.types._links_table import LinksTable as LinksTable
+from mismo.types._stats import TableStats as TableStats
 from mismo.types._union_table import UnionTable as UnionTable
 from mismo.types._updates import Updates as Updates
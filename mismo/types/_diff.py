@@ -3,11 +3,11 @@ from __future__ import annotations
 import functools
 from pathlib import Path
 from textwrap import dedent
-from typing import TYPE_CHECKING, Any, Literal, cast
+from typing import TYPE_CHECKING, Any, Literal
 
 import ibis
 
-from mismo import _util
+from mismo import _util, joins
 from mismo.types._updates import Updates
 
 if TYPE_CHECKING:
@@ -41,6 +41,7 @@ class Diff:
     _insertions: ibis.Table
     _updates: Updates
     _deletions: ibis.Table
+    _unchanged: ibis.Table | None
 
     def __new__(*args, **kwargs):
         raise NotImplementedError(
@@ -55,6 +56,7 @@ class Diff:
         insertions: ibis.Table,
         updates: Updates,
         deletions: ibis.Table,
+        unchanged: ibis.Table | None = None,
     ):
         assert isinstance(before, ibis.Table)
         assert isinstance(after, ibis.Table)
@@ -79,6 +81,7 @@ class Diff:
         obj._insertions = insertions
         obj._updates = updates
         obj._deletions = deletions
+        obj._unchanged = unchanged
         return obj
 
     @classmethod
@@ -143,12 +146,31 @@ class Diff:
         *,
         join_on: str | Literal[False],
     ) -> _typing.Self:
-        """Create from a before and after table."""
+        """Create from a before and after table.
+
+        Rows are paired up by `join_on`. A row only in `before` is a deletion,
+        a row only in `after` is an insertion, and a row in both is an update
+        if any of its values changed.
+        If `join_on` is False, rows are never paired up, so every row in `before`
+        is a deletion and every row in `after` is an insertion.
+
+        When `before` and `after` have the same schema, the rows are classified
+        in a single full outer join on `join_on`, comparing the values of every
+        column with `identical_to`, and the per-column `before`/`after` structs
+        of the [Updates][mismo.Updates] are only built for the rows that changed.
+        So this stays cheap for big snapshots where most rows are unchanged.
+        """
         # We have to be careful here.
         # If a row (Bob, 123, 456) is updated to (Bob, 123, 789),
         # Then is this a deletion and insertion, or an update?
         # We have to rely on the join key to determine this,
         # using set-based difference(), intersection(), etc would not work.
+        if join_on is not False and _schemas_equal(before, after):
+            return cls._new(
+                before=before,
+                after=after,
+                **_outer_join_deltas(before, after, join_on),
+            )
         if join_on is False:
             insertions = after
             deletions = before
@@ -170,8 +192,13 @@ class Diff:
             before=self.before().cache(),
             after=self.after().cache(),
             insertions=self.insertions().cache(),
-            updates=Updates(self.updates().cache(), check_schemas="lax"),
+            updates=Updates(
+                self.updates().cache(),
+                check_schemas="lax",
+                join_on=self.updates().join_on,
+            ),
             deletions=self.deletions().cache(),
+            unchanged=None if self._unchanged is None else self._unchanged.cache(),
         )
 
     def to_parquets(self, directory: str | Path, /, *, overwrite: bool = False) -> None:
@@ -218,6 +245,8 @@ class Diff:
 
     def unchanged(self) -> ibis.Table:
         """Rows that were unchanged between `before` and `after`."""
+        if self._unchanged is not None:
+            return self._unchanged
         return self.before().difference(
             self.updates().before(),
             self.deletions(),
@@ -271,15 +300,22 @@ class Diff:
         """
         return self.stats.chart()
 
-    @property
+    @functools.cached_property
     def stats(self) -> DiffStats:
-        """Statistics about this Diff."""
+        """Statistics about this Diff.
+
+        Computed once, in a single query, the first time they are needed.
+        """
         return DiffStats(self)
 
     def __repr__(self):
         return repr(self.stats).replace("DiffStats", "Diff")
 
 
+def _schemas_equal(table1: ibis.Table, table2: ibis.Table) -> bool:
+    return set(dict(table1.schema()).items()) == set(dict(table2.schema()).items())
+
+
 def _check_schemas_equal(table1: ibis.Table, table2: ibis.Table):
     pairs1 = set(dict(table1.schema()).items())
     pairs2 = set(dict(table2.schema()).items())
@@ -291,6 +327,48 @@ def _check_schemas_equal(table1: ibis.Table, table2: ibis.Table):
     raise ValueError(f"Schemas are not equal: {same=}, {only1=}, {only2=}")
 
 
+def _outer_join_deltas(
+    before: ibis.Table, after: ibis.Table, join_on: str
+) -> dict[str, Any]:
+    """Classify every row with one outer join on `join_on`.
+
+    `before` and `after` must have the same schema.
+    """
+    # Compare the values themselves, not a hash of the row. duckdb hashes
+    # some different values the same, eg [] and NULL, or {a: NULL} and NULL,
+    # and comparing the values is no slower than computing the hashes.
+    columns = before.columns
+    present = _util.unique_name("present")
+    b = before.mutate(**{present: ibis.literal(True)})
+    a = (after.view() if after is before else after).mutate(
+        **{present: ibis.literal(True)}
+    )
+    joined = joins.join(
+        b, a, join_on, how="outer", lname="{name}_l", rname="{name}_r", rename_all=True
+    )
+    in_before = joined[present + "_l"].notnull()
+    in_after = joined[present + "_r"].notnull()
+    same = ibis.and_(
+        *[joined[c + "_l"].identical_to(joined[c + "_r"]) for c in columns]
+    )
+
+    def side(t: ibis.Table, schema: ibis.Schema, suffix: str) -> ibis.Table:
+        # Casting keeps non-nullable dtypes, which become nullable in the outer join.
+        return t.select(**{c: t[c + suffix].cast(schema[c]) for c in columns})
+
+    changed = joined.filter(in_before & in_after & ~same)
+    return {
+        "insertions": side(joined.filter(~in_before), after.schema(), "_r"),
+        "deletions": side(joined.filter(~in_after), before.schema(), "_l"),
+        "updates": Updates._from_joined(
+            changed, before.schema(), after.schema(), join_on=join_on
+        ),
+        "unchanged": side(
+            joined.filter(in_before & in_after & same), before.schema(), "_l"
+        ),
+    }
+
+
 class DiffStats:
     """Summary statistics about a Diff, such as number of insertions, deletions, etc."""
 
@@ -299,34 +377,47 @@ class DiffStats:
         self._diff = diff
 
     @functools.cache
+    def _counts(self) -> dict[str, int]:
+        # Each count is a one-row aggregate, cross joined together
+        # so they all run in a single query.
+        d = self._diff
+        tables = {
+            "before": d.before(),
+            "after": d.after(),
+            "unchanged": d.unchanged(),
+            "insertions": d.insertions(),
+            "deletions": d.deletions(),
+            "updates": d.updates(),
+        }
+        counts = None
+        for name, t in tables.items():
+            agg = t.aggregate(**{name: t.count()})
+            counts = agg if counts is None else counts.cross_join(agg)
+        return counts.to_pyarrow().to_pylist()[0]
+
     def n_before(self) -> int:
         """Number of rows in `before`."""
-        return int(cast(int, self._diff.before().count().execute()))
+        return self._counts()["before"]
 
-    @functools.cache
     def n_unchanged(self) -> int:
         """Number of rows that were unchanged between `before` and `after`."""
-        return int(cast(int, self._diff.unchanged().count().execute()))
+        return self._counts()["unchanged"]
 
-    @functools.cache
     def n_insertions(self) -> int:
         """Number of rows that were in `after` but not in `before`."""
-        return int(cast(int, self._diff.insertions().count().execute()))
+        return self._counts()["insertions"]
 
-    @functools.cache
     def n_deletions(self) -> int:
         """Number of rows that were in `before` but not in `after`."""
-        return int(cast(int, self._diff.deletions().count().execute()))
+        return self._counts()["deletions"]
 
-    @functools.cache
     def n_updates(self) -> int:
         """Number of rows that were changed between `before` and `after`."""
-        return int(cast(int, self._diff.updates().count().execute()))
+        return self._counts()["updates"]
 
-    @functools.cache
     def n_after(self) -> int:
         """Number of rows in `after`."""
-        return int(cast(int, self._diff.after().count().execute()))
+        return self._counts()["after"]
 
     def __repr__(self):
         return dedent(f"""
@@ -8,6 +8,7 @@ from ibis.expr import types as ir
 
 from mismo import _common, _typing, _util
 from mismo.types._links_table import LinksTable
+from mismo.types._stats import TableStats
 from mismo.types._wrapper import TableWrapper
 
 if TYPE_CHECKING:
@@ -244,6 +245,13 @@ class LinkedTable(TableWrapper):
         added = _util.join_lookup(t, n_by_id, "record_id", defaults={name: 0})
         return self.__class__(added, other=self.other_, links=self.links_)
 
+    def stats(self) -> TableStats:
+        """Row count, number of distinct `record_id`s, and null counts.
+
+        Computed in one query, and cached for as long as this table is alive.
+        """
+        return TableStats.of(self.__wrapped__, distinct=["record_id"])
+
     def link_counts(self) -> LinkCountsTable:
         """
         Describes 'There are `n_records` in self that linked to `n_links` in `other'.
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, Any
 
 import ibis
-from ibis import _
+from ibis import Deferred, _
+from ibis.expr import operations as ops
+from ibis.expr import types as ir
 
 from mismo import _typing, _util, joins
+from mismo.types._stats import TableStats
 from mismo.types._wrapper import TableWrapper
 
 if TYPE_CHECKING:
@@ -170,23 +174,55 @@ class LinksTable(TableWrapper):
         joined = self.left_join(right, self.record_id_r == right[uname]).drop(uname)
         return LinksTable(joined, left=self._left_raw, right=self._right_raw)
 
-    def with_both(self) -> LinksTable:
+    def with_both(self, *, needed_by: Iterable[Any] | None = None) -> LinksTable:
         """
-        Add all columns from `left` and `right` with suffixes `_l` and `_r`
-        """
-        left_columns = [
-            _[c].name(c + "_l")
-            for c in self.left.columns
-            if c + "_l" not in self.columns
-        ]
-        right_columns = [
-            _[c].name(c + "_r")
-            for c in self.right.columns
-            if c + "_r" not in self.columns
-        ]
+        Add columns from `left` and `right` with suffixes `_l` and `_r`.
+
+        Parameters
+        ----------
+        needed_by
+            If None, add all columns.
+            Otherwise, an iterable of comparers, or other functions that take
+            this table and return a Table or Value, or Deferreds or column names.
+            Only the `_l` and `_r` columns that they actually use are added,
+            so you don't drag dozens of unused columns through the joins.
+            To find these, each one is called on a table with all the columns,
+            and the expression it returns is inspected.
+            That is cheap for ordinary comparers, which only build expressions,
+            but any that execute something eagerly will run.
+            [CachedComparer][mismo.compare.CachedComparer]s are not called,
+            their wrapped comparer is inspected instead.
+            A column that a comparer passes through unchanged doesn't count as used.
+
+        Examples
+        --------
+        >>> left = ibis.memtable({"record_id": [1, 2], "name": ["a", "b"], "x": [1, 2]})
+        >>> right = ibis.memtable(
+        ...     {"record_id": [8, 9], "name": ["a", "c"], "y": [3, 4]}
+        ... )
+        >>> links_raw = ibis.memtable({"record_id_l": [1, 2], "record_id_r": [8, 9]})
+        >>> links = LinksTable(links_raw, left=left, right=right)
+        >>> links.with_both().columns
+        ('record_id_l', 'record_id_r', 'name_l', 'x_l', 'name_r', 'y_r')
+        >>> def compare_names(t):
+        ...     return t.mutate(names_match=t.name_l == t.name_r)
+        >>> links.with_both(needed_by=[compare_names]).columns
+        ('record_id_l', 'record_id_r', 'name_l', 'name_r')
+        """  # noqa: E501
+        left_columns = [c for c in self.left.columns if c + "_l" not in self.columns]
+        right_columns = [c for c in self.right.columns if c + "_r" not in self.columns]
+        if needed_by is not None:
+            used = _used_columns(self.with_both(), needed_by)
+            left_columns = [c for c in left_columns if c + "_l" in used]
+            right_columns = [c for c in right_columns if c + "_r" in used]
+        left_columns = [_[c].name(c + "_l") for c in left_columns]
+        right_columns = [_[c].name(c + "_r") for c in right_columns]
         x = self
-        x = x.with_left(*left_columns)
-        x = x.with_right(*right_columns)
+        # with_left() and with_right() add every column if given none.
+        if left_columns:
+            x = x.with_left(*left_columns)
+        if right_columns:
+            x = x.with_right(*right_columns)
         return x
 
     @property
@@ -216,8 +252,146 @@ class LinksTable(TableWrapper):
 
         return links.rename(_swap_l_and_r)
 
+    def stats(self) -> TableStats:
+        """Row count, number of distinct `record_id_l`s and `record_id_r`s, and null counts.
+
+        Computed in one query, and cached for as long as this table is alive.
+        """  # noqa: E501
+        return TableStats.of(self.__wrapped__, distinct=["record_id_l", "record_id_r"])
+
     def cache(self) -> LinksTable:
         """Cache the links table."""
         return LinksTable(
             self.__wrapped__.cache(), left=self._left_raw, right=self._right_raw
         )
+
+
+def _used_columns(t: ibis.Table, uses: Iterable[Any]) -> set[str]:
+    """The names of the columns of `t` that `uses` compute something from."""
+    from mismo.compare import CachedComparer
+
+    used = set()
+    for use in uses:
+        if isinstance(use, CachedComparer):
+            # Calling it would execute it, and write to its cache,
+            # so look at the comparer it wraps instead.
+            if use.columns is not None:
+                used |= {c + s for c in use.columns for s in ("_l", "_r")}
+            use = use.comparer
+        if isinstance(use, (str, Deferred, ir.Value)):
+            results = _util.bind(t, use)
+        else:
+            results = (use(t),)
+        for result in results:
+            used |= _referenced_columns(result, t.op())
+    return used
+
+
+def _referenced_columns(result: ir.Expr, base: ops.Relation) -> set[str]:
+    """The columns of `base` that `result` computes something from.
+
+    If `result` is a Table, a column of `base` that it only passes through
+    under the same name, eg with `t.mutate(...)`, doesn't count as used.
+    """
+    tracer = _ColumnTracer(base)
+    if isinstance(result, ir.Table):
+        rel = result.op()
+        tracer.rows(rel)
+        for name in rel.schema.names:
+            if not _is_passed_through(rel, name, base):
+                tracer.field(rel, name)
+    else:
+        tracer.value(result.op())
+    return tracer.used
+
+
+# ibis added DropColumns in 9.2. Before that, .drop() made a Project,
+# and isinstance(x, ()) is always False.
+_DropColumns = getattr(ops, "DropColumns", ())
+
+
+def _is_passed_through(rel: ops.Relation, name: str, base: ops.Relation) -> bool:
+    """Is column `name` of `rel` just column `name` of `base`, unchanged?"""
+    while rel != base:
+        if isinstance(rel, (ops.Project, ops.JoinChain)):
+            v = rel.values[name]
+            if not isinstance(v, ops.Field) or v.name != name:
+                return False
+            rel = v.rel
+        elif isinstance(
+            rel,
+            (ops.Filter, ops.Sort, ops.Limit, _DropColumns, ops.JoinReference),
+        ):
+            rel = rel.parent
+        else:
+            return False
+    return True
+
+
+class _ColumnTracer:
+    """Follow column references back through relations to the columns of `base`."""
+
+    def __init__(self, base: ops.Relation) -> None:
+        self.base = base
+        self.used: set[str] = set()
+        self._seen: set = set()
+
+    def value(self, node: ops.Node) -> None:
+        """Trace everything that a value, eg `t.a + 1`, is computed from."""
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if n in self._seen:
+                continue
+            self._seen.add(n)
+            if isinstance(n, ops.Field):
+                self.field(n.rel, n.name)
+            elif isinstance(n, ops.Relation):
+                # eg a subquery: conservatively, it uses all of its columns.
+                self.relation(n, n.schema.names)
+            else:
+                stack.extend(n.__children__)
+
+    def field(self, rel: ops.Relation, name: str) -> None:
+        self.relation(rel, (name,))
+
+    def rows(self, rel: ops.Relation) -> None:
+        """Trace what decides which rows `rel` has, eg filter predicates."""
+        self.relation(rel, ())
+
+    def relation(self, rel: ops.Relation, names: Iterable[str]) -> None:
+        """Trace the columns `names` of `rel`, and what decides its rows."""
+        names = tuple(names)
+        if rel == self.base:
+            self.used.update(names)
+            return
+        key = (rel, names)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        if isinstance(rel, ops.Project):
+            for name in names:
+                self.value(rel.values[name])
+            self.rows(rel.parent)
+        elif isinstance(rel, ops.Filter):
+            for pred in rel.predicates:
+                self.value(pred)
+            self.relation(rel.parent, names)
+        elif isinstance(rel, ops.Sort):
+            for key_ in rel.keys:
+                self.value(key_)
+            self.relation(rel.parent, names)
+        elif isinstance(rel, (ops.Limit, _DropColumns, ops.JoinReference)):
+            self.relation(rel.parent, names)
+        elif isinstance(rel, ops.JoinChain):
+            for name in names:
+                self.value(rel.values[name])
+            self.rows(rel.first)
+            for link in rel.rest:
+                self.rows(link.table)
+                for pred in link.predicates:
+                    self.value(pred)
+        else:
+            # eg a join or an aggregation: conservatively, use everything.
+            for child in rel.__children__:
+                self.value(child)
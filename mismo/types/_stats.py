@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+import weakref
+
+import ibis
+
+# ibis expressions are immutable and compare equal if they are structurally equal,
+# so we can key the cache on the expression itself.
+# A weak key means an entry is dropped as soon as nothing refers to the expression.
+_CACHE: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+class TableStats:
+    """Row count, distinct counts, and null counts of a table.
+
+    All of these are computed together in a single aggregation query,
+    and then cached for as long as the table expression is alive.
+    So asking for them again, eg when printing a [Linkage][mismo.Linkage]
+    many times in a notebook, is free.
+
+    You won't create this directly, it is returned from eg
+    [LinkedTable.stats][mismo.LinkedTable.stats] or
+    [LinksTable.stats][mismo.LinksTable.stats].
+    """
+
+    def __init__(
+        self,
+        *,
+        n_rows: int,
+        n_distinct: Mapping[str, int],
+        n_null: Mapping[str, int],
+    ) -> None:
+        self.n_rows = n_rows
+        self.n_distinct = MappingProxyType(dict(n_distinct))
+        self.n_null = MappingProxyType(dict(n_null))
+
+    n_rows: int
+    """The number of rows."""
+    n_distinct: Mapping[str, int]
+    """The number of distinct non-NULL values in each of the key columns,
+    eg `record_id`."""
+    n_null: Mapping[str, int]
+    """The number of NULL values in each column."""
+
+    @classmethod
+    def of(cls, t: ibis.Table, *, distinct: Iterable[str] = ()) -> TableStats:
+        """Get the stats of a table, using the cached value if there is one.
+
+        Parameters
+        ----------
+        t
+            The table.
+        distinct
+            The columns to count the distinct values of.
+            This is more expensive than the other stats,
+            so it is only done for the columns you ask for.
+        """
+        distinct = tuple(distinct)
+        op = t.op()
+        by_distinct = _CACHE.setdefault(op, {})
+        if distinct not in by_distinct:
+            by_distinct[distinct] = cls._compute(t, distinct)
+        return by_distinct[distinct]
+
+    @classmethod
+    def _compute(cls, t: ibis.Table, distinct: tuple[str, ...]) -> TableStats:
+        aggs = {"n_rows": t.count()}
+        for i, c in enumerate(distinct):
+            aggs[f"distinct_{i}"] = t[c].nunique()
+        for i, c in enumerate(t.columns):
+            aggs[f"non_null_{i}"] = t[c].count()
+        row = t.aggregate(**aggs).to_pyarrow().to_pylist()[0]
+        n_rows = row["n_rows"]
+        return cls(
+            n_rows=n_rows,
+            n_distinct={c: row[f"distinct_{i}"] for i, c in enumerate(distinct)},
+            n_null={c: n_rows - row[f"non_null_{i}"] for i, c in enumerate(t.columns)},
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(n_rows={self.n_rows:_}, "
+            f"n_distinct={dict(self.n_distinct)}, n_null={dict(self.n_null)})"
+        )
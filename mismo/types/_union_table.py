@@ -10,6 +10,10 @@ from mismo.types._wrapper import TableWrapper
 class UnionTable(TableWrapper):
     """
     A Table whose rows are the non-unique union of the rows from all sub-Tables.
+
+    Executing it like a normal ibis Table runs one big `UNION ALL` query.
+    [to_pyarrow_batches][mismo.UnionTable.to_pyarrow_batches]
+    instead runs each sub-Table as its own query, and streams the results.
     """
 
     def __init__(self, tables: Iterable[ibis.Table]) -> None:
@@ -49,3 +53,53 @@ class UnionTable(TableWrapper):
     # skip type hints to inherit from the grandparent ibis.Table
     def drop(self, *fields):
         return UnionTable(t.drop(*fields) for t in self.tables)
+
+    # skip type hints to inherit from the grandparent ibis.Table
+    def to_pyarrow_batches(
+        self, /, *, limit=None, params=None, chunk_size=1_000_000, **kwargs
+    ):
+        """Stream the rows as pyarrow RecordBatches, one sub-Table at a time.
+
+        Each sub-Table is executed as its own query, and its batches are
+        yielded as they arrive, before the next sub-Table is started.
+        So the first rows arrive as soon as the first sub-Table produces them,
+        only one batch needs to be in memory at a time,
+        and the whole union is never materialized.
+        Rows come out in the order of the sub-Tables.
+
+        We don't run the sub-Tables concurrently: a backend like duckdb
+        already uses all cores for each query, and a connection
+        can only stream one result at a time.
+
+        Parameters
+        ----------
+        limit
+            The maximum number of rows to return in total.
+        params
+            Bound parameters, passed to each sub-Table.
+        chunk_size
+            The maximum number of rows in each batch.
+        kwargs
+            Passed to each sub-Table's `to_pyarrow_batches()`.
+        """
+        import pyarrow as pa
+
+        schema = self.schema().to_pyarrow()
+
+        def batches():
+            remaining = limit
+            for t in self.tables:
+                if remaining is not None and remaining <= 0:
+                    return
+                reader = t.to_pyarrow_batches(
+                    limit=remaining, params=params, chunk_size=chunk_size, **kwargs
+                )
+                # exhaust each reader before starting the next query,
+                # since a connection can only stream one result at a time
+                for batch in reader:
+                    if remaining is not None:
+                        batch = batch.slice(0, remaining)
+                        remaining -= batch.num_rows
+                    yield batch.cast(schema)
+
+        return pa.RecordBatchReader.from_batches(schema, batches())
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any, Literal, Protocol, cast
 
 import ibis
 from ibis.expr import datatypes as dt
+from ibis.expr import operations as ops
 from ibis.expr import types as ir
 
 from mismo import _typing, _util, joins
@@ -120,6 +121,7 @@ class Updates(TableWrapper):
         /,
         *,
         check_schemas: Literal["exactly", "names", "lax"] = "exactly",
+        join_on: str | None = None,
     ) -> None:
         """Create an Updates object from a table of differences.
 
@@ -132,6 +134,10 @@ class Updates(TableWrapper):
             - "exactly": both before and after must have the same columns and types.
             - "names": both before and after must have the same columns, but types can differ.
             - "lax": no schema checking, just that there is at least one of 'before' or 'after' in each column.
+        join_on : str | None
+            The column that identifies a row, if there is one.
+            This lets [apply_to][mismo.Updates.apply_to] find the rows to update
+            by key, and enables [merge_into][mismo.Updates.merge_into].
         """  # noqa: E501
 
         def _check_col(name: str):
@@ -166,6 +172,7 @@ class Updates(TableWrapper):
             raise ValueError("\n".join(errors))
 
         object.__setattr__(self, "_check_schemas", check_schemas)
+        object.__setattr__(self, "_join_on", join_on)
         super().__init__(diff_table)
 
     def __getattr__(self, name: str) -> ibis.Column:  # ty: ignore[invalid-method-override]
@@ -189,6 +196,11 @@ class Updates(TableWrapper):
         """The schema checking mode used for this Updates object."""
         return self._check_schemas
 
+    @property
+    def join_on(self) -> str | None:
+        """The column that identifies a row, or None if there isn't one."""
+        return self._join_on
+
     @classmethod
     def from_tables(
         cls,
@@ -203,32 +215,56 @@ class Updates(TableWrapper):
         Note that this results in only the rows that are present in both tables,
         due to the inner join on the key. Insertions and deletions should be
         handled separately.
+
+        The result remembers `join_on`, so that
+        [apply_to][mismo.Updates.apply_to] can find the rows to update by key.
         """
         # Prefer a column order of
         # 1. all the columns in after
         # 2. any extra columns in before are tacked on the end
         if after is before:
             after = after.view()
-        all_columns = (dict(before.schema()) | dict(after.schema())).keys()
         joined = joins.join(
             before, after, join_on, lname="{name}_l", rname="{name}_r", rename_all=True
         )
+        return cls._from_joined(
+            joined,
+            before.schema(),
+            after.schema(),
+            check_schemas=check_schemas,
+            join_on=join_on if join_on is not False else None,
+        )
+
+    @classmethod
+    def _from_joined(
+        cls,
+        joined: ibis.Table,
+        before_schema: ibis.Schema,
+        after_schema: ibis.Schema,
+        *,
+        check_schemas: Literal["exactly", "names", "lax"] = "exactly",
+        join_on: str | None = None,
+    ) -> Updates:
+        """Create from a join of before and after, with columns suffixed _l and _r.
+
+        Any other columns in `joined` are ignored.
+        """
+        all_columns = (dict(before_schema) | dict(after_schema)).keys()
 
         def make_diff_col(col: str) -> ir.StructValue:
             d = {}
             col_l = col + "_l"
             col_r = col + "_r"
-            if col_l in joined.columns:
+            if col in before_schema:
                 # need to do this cast because nonnull dtypes
                 # become nullable after the join.
-                d["before"] = joined[col_l].cast(before.schema()[col])
-            if col_r in joined.columns:
-                d["after"] = joined[col_r].cast(after.schema()[col])
-            assert d, f"Column {col} not found in either before or after"
+                d["before"] = joined[col_l].cast(before_schema[col])
+            if col in after_schema:
+                d["after"] = joined[col_r].cast(after_schema[col])
             return ibis.struct(d).name(col)
 
         diff_table = joined.select(*[make_diff_col(c) for c in all_columns])
-        return cls(diff_table, check_schemas=check_schemas)
+        return cls(diff_table, check_schemas=check_schemas, join_on=join_on)
 
     @classmethod
     def from_before_after(
@@ -311,12 +347,16 @@ class Updates(TableWrapper):
 
     def filter(self, *args, **kwargs) -> _typing.Self:
         return self.__class__(
-            self.__wrapped__.filter(*args, **kwargs), check_schemas=self.check_schemas
+            self.__wrapped__.filter(*args, **kwargs),
+            check_schemas=self.check_schemas,
+            join_on=self.join_on,
         )
 
     def cache(self) -> _typing.Self:
         return self.__class__(
-            self.__wrapped__.cache(), check_schemas=self.check_schemas
+            self.__wrapped__.cache(),
+            check_schemas=self.check_schemas,
+            join_on=self.join_on,
         )
 
     def apply_to(
@@ -328,6 +368,12 @@ class Updates(TableWrapper):
     ) -> ibis.Table:
         """Return the input table with these updates applied to it.
 
+        If these updates have a [join_on][mismo.Updates.join_on] key,
+        the old rows are found by key, with an anti-join on just that column.
+        Otherwise, they are found by comparing every column of every row,
+        which is much more expensive, and needs the old rows in `t`
+        to be exactly equal to `self.before()`, including floats and NULLs.
+
         Parameters
         ----------
         t
@@ -343,7 +389,10 @@ class Updates(TableWrapper):
         """  # noqa: E501
         _util.check_schemas_equal(t, self.before())
 
-        t = t.difference(self.before(), distinct=False)
+        if self.join_on is not None:
+            t = t.anti_join(self.before(), self.join_on)
+        else:
+            t = t.difference(self.before(), distinct=False)
 
         if self.before().schema() == self.after().schema():
             # easy, we don't have to worry about adding defaults
@@ -373,6 +422,53 @@ class Updates(TableWrapper):
         t = t.union(self.after(), distinct=False)
         return t
 
+    def merge_into(self, t: ibis.Table, /) -> None:
+        """Apply these updates to a table in the database, in place.
+
+        Unlike [apply_to][mismo.Updates.apply_to], which builds a new table
+        expression, this modifies the stored table with a single MERGE
+        statement, eg `MERGE INTO t USING updates ON (join_on) ...`.
+        So only the updated rows are touched, and the rest of the table
+        is never rewritten, sorted, or compared.
+
+        This needs a [join_on][mismo.Updates.join_on] key, the before and after
+        schemas to be the same, and a backend that supports
+        `upsert()` (eg duckdb >= 1.4).
+        Updates whose key isn't in `t` are inserted.
+
+        Parameters
+        ----------
+        t
+            The table to update. This must be a physical table in the database,
+            eg from `con.table("people")`, not an expression.
+        """
+        if self.join_on is None:
+            raise ValueError(
+                "merge_into() needs the Updates to have a join_on key, "
+                "eg from Updates.from_tables(..., join_on=...). Use apply_to() instead."
+            )
+        if self.before().schema() != self.after().schema():
+            raise ValueError(
+                "merge_into() needs the before and after schemas to be the same. "
+                "Use apply_to() instead."
+            )
+        op = t.op()
+        if not isinstance(op, ops.DatabaseTable):
+            raise TypeError(
+                f"merge_into() needs a physical table, got a {type(op).__name__}"
+            )
+        _util.check_schemas_equal(t, self.after())
+        backend = t.get_backend()
+        if not hasattr(backend, "upsert"):
+            raise NotImplementedError(
+                f"The {backend.name} backend doesn't support MERGE. "
+                "Use apply_to() instead."
+            )
+        database = tuple(x for x in (op.namespace.catalog, op.namespace.database) if x)
+        backend.upsert(
+            op.name, self.after(), on=self.join_on, database=database or None
+        )
+
 
 class HasBeforeAfter(Protocol):
     before: ibis.Value | None
@@ -25,6 +25,12 @@ class TableWrapper(ibis.Table):
     def __getattr__(self, key: str) -> ibis.Column:
         return getattr(self.__wrapped__, key)
 
+    # skip type hints to inherit from ibis.Table
+    def to_pyarrow_batches(self, /, **kwargs):
+        # Let the wrapped table decide how to execute itself,
+        # eg a UnionTable streams its sub-tables one by one.
+        return self.__wrapped__.to_pyarrow_batches(**kwargs)
+
 
 class StructWrapper(ibis.ir.StructValue):
     """A wrapper around an ibis StructValue that allows you to access its attributes.
@@ -90,6 +90,66 @@ def test_from_before_after(after, before, updates, insertions, deletions):
     assert_tables_equal(expected_updates, diff.updates(), order_by="id")
 
 
+def test_from_before_after_outer_join(table_factory):
+    before = table_factory(
+        {
+            "id": [1, 2, 3, 4, 5, 7, 8, 9],
+            "x": [0.0, 1.0, None, 2.0, 5.0, 7.0, 8.0, 9.0],
+            "tags": [["a"], ["b"], None, [], ["e"], [], [None], ["i"]],
+            "s": [
+                {"a": 1},
+                {"a": 2},
+                None,
+                {"a": 4},
+                {"a": 5},
+                {"a": 7},
+                {"a": 8},
+                {"a": None},
+            ],
+        },
+        schema={
+            "id": "int64",
+            "x": "float64",
+            "tags": "array<string>",
+            "s": "struct<a: int64>",
+        },
+    )
+    after = table_factory(
+        {
+            "id": [1, 2, 3, 4, 6, 7, 8, 9],
+            # -0.0 is identical to 0.0
+            "x": [-0.0, 1.0, None, 2.0, 6.0, 7.0, 8.0, 9.0],
+            # duckdb hashes [] the same as NULL, and [NULL] the same as []
+            "tags": [["a"], ["b", "c"], None, [], ["f"], None, [], ["i"]],
+            # duckdb hashes {a: NULL} the same as NULL
+            "s": [
+                {"a": 1},
+                {"a": 2},
+                None,
+                {"a": 4},
+                {"a": 6},
+                {"a": 7},
+                {"a": 8},
+                None,
+            ],
+        },
+        schema=before.schema(),
+    )
+    diff = Diff.from_before_after(before, after, join_on="id")
+
+    def ids(t):
+        return sorted(t.id.execute().tolist())
+
+    assert ids(diff.unchanged()) == [1, 3, 4]
+    assert ids(diff.deletions()) == [5]
+    assert ids(diff.insertions()) == [6]
+    assert sorted(diff.updates().id.before.execute().tolist()) == [2, 7, 8, 9]
+    assert diff.updates().columns == ("id", "x", "tags", "s")
+    assert diff.unchanged().schema() == before.schema()
+    assert diff.insertions().schema() == after.schema()
+    assert (diff.stats.n_unchanged(), diff.stats.n_updates()) == (3, 4)
+
+
 def test_from_before_after_no_join(after, before):
     diff = Diff.from_before_after(before, after, join_on=False)
     assert diff.updates().count().execute() == 0
@@ -135,3 +195,15 @@ def test_parquet_roundtrip(diff, tmp_path):
     assert_tables_equal(diff.insertions(), reloaded.insertions(), order_by="id")
     assert_tables_equal(diff.deletions(), reloaded.deletions(), order_by="id")
     assert_tables_equal(diff.updates(), reloaded.updates(), order_by="id")
+
+
+def test_diff_stats(diff):
+    stats = diff.stats
+    assert diff.stats is stats
+    assert stats.n_before() == 4
+    assert stats.n_after() == 4
+    assert stats.n_updates() == 1
+    assert stats.n_insertions() == 1
+    assert stats.n_deletions() == 1
+    assert stats.n_unchanged() == 2
+    assert "insertions=1" in repr(stats)
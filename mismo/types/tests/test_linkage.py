@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 import ibis
 from ibis import _
 import pytest
@@ -119,3 +121,176 @@ def test_Linkage_with_linked_values(linkage: Linkage, table_factory):
         },
     )
     assert_tables_equal(expected, result)
+
+
+@pytest.fixture
+def scored_linkage(table_factory) -> Linkage:
+    left = table_factory({"record_id": [3, 1, 2], "name": ["c", "a", "b"]})
+    right = table_factory({"record_id": [10, 30, 20], "name": ["x", "z", "y"]})
+    links = table_factory(
+        {
+            "record_id_l": [2, 1, 3, 1],
+            "record_id_r": [20, 10, 30, 30],
+            "score": [0.5, 0.9, 0.7, 0.1],
+        }
+    )
+    return Linkage(left=left, right=right, links=links)
+
+
+def _records(t):
+    return sorted(t.execute().itertuples(index=False, name=None))
+
+
+def test_Linkage_parquets_roundtrip(scored_linkage: Linkage, tmp_path):
+    scored_linkage.to_parquets(tmp_path, n_partitions=4)
+    meta = json.loads((tmp_path / "linkage.json").read_text())
+    assert meta == {"n_partitions": 4, "n_left": 3, "n_right": 3, "n_links": 4}
+    assert (tmp_path / "links").is_dir()
+    for p in (tmp_path / "links").iterdir():
+        assert p.name.startswith("link_partition=")
+
+    loaded = Linkage.from_parquets(tmp_path, backend=scored_linkage.left.get_backend())
+    assert repr(loaded) == repr(scored_linkage)
+    assert loaded.links.columns == scored_linkage.links.columns
+    assert _records(loaded.links) == _records(scored_linkage.links)
+    # The counts in the repr come from linkage.json, not from scanning the data
+    (tmp_path / "linkage.json").write_text(json.dumps({**meta, "n_links": 99}))
+    loaded = Linkage.from_parquets(tmp_path, backend=scored_linkage.left.get_backend())
+    assert repr(loaded) == "Linkage<left=3, right=3, links=99>"
+    assert repr(loaded.copy()) == "Linkage<left=3, right=3, links=4>"
+    assert loaded.left.execute().record_id.tolist() == [1, 2, 3]
+    assert _records(loaded.right) == _records(scored_linkage.right)
+
+    with pytest.raises(FileExistsError):
+        scored_linkage.to_parquets(tmp_path)
+    empty = scored_linkage.copy(links=scored_linkage.links.filter(False))
+    empty.to_parquets(tmp_path, overwrite=True)
+    loaded = Linkage.from_parquets(tmp_path, backend=scored_linkage.left.get_backend())
+    assert loaded.links.count().execute() == 0
+    assert loaded.links.columns == scored_linkage.links.columns
+
+
+def test_Linkage_parquets_append(scored_linkage: Linkage, tmp_path):
+    first = scored_linkage.copy(
+        links=scored_linkage.links.filter(scored_linkage.links.record_id_l < 3)
+    )
+    rest = scored_linkage.copy(
+        links=scored_linkage.links.filter(scored_linkage.links.record_id_l >= 3)
+    )
+    with pytest.raises(FileNotFoundError):
+        rest.to_parquets(tmp_path, append=True)
+    first.to_parquets(tmp_path)
+    rest.to_parquets(tmp_path, append=True)
+    meta = json.loads((tmp_path / "linkage.json").read_text())
+    assert meta["n_links"] == 4
+    loaded = Linkage.from_parquets(tmp_path, backend=scored_linkage.left.get_backend())
+    assert _records(loaded.links) == _records(scored_linkage.links)
+
+
+def test_Linkage_parquets_legacy_layout(scored_linkage: Linkage, tmp_path):
+    scored_linkage.left.to_parquet(tmp_path / "left.parquet")
+    scored_linkage.right.to_parquet(tmp_path / "right.parquet")
+    scored_linkage.links.to_parquet(tmp_path / "links.parquet")
+    loaded = Linkage.from_parquets(tmp_path, backend=scored_linkage.left.get_backend())
+    assert _records(loaded.links) == _records(scored_linkage.links)
+
+
+@pytest.fixture
+def wide_links(table_factory):
+    records = {
+        "record_id": [1, 2],
+        "name": ["a", "b"],
+        "age": [10, 20],
+        "city": ["x", "y"],
+    }
+    left = table_factory(records)
+    right = table_factory(records)
+    links = table_factory({"record_id_l": [1, 2], "record_id_r": [2, 2]})
+    return Linkage(left=left, right=right, links=links).links
+
+
+def test_LinksTable_with_both_needed_by(wide_links):
+    from ibis_enum import IbisEnum
+
+    from mismo.compare import DistinctPairsComparer, EnumComparer
+
+    class Level(IbisEnum):
+        SAME = 0
+        ELSE = 1
+
+    comparer = EnumComparer(
+        "name", Level, [(_.name_l == _.name_r, Level.SAME), (True, Level.ELSE)]
+    )
+    pruned = wide_links.with_both(needed_by=[comparer])
+    assert pruned.columns == ("record_id_l", "record_id_r", "name_l", "name_r")
+    full = wide_links.with_both()
+    cols = ["record_id_l", "record_id_r", "name"]
+    assert_tables_equal(comparer(pruned).select(cols), comparer(full).select(cols))
+
+    distinct = DistinctPairsComparer(comparer, ["name"])
+    assert wide_links.with_both(needed_by=[distinct]).columns == pruned.columns
+
+    needed_by = [
+        lambda t: t.age_l - t.age_r,
+        "city_r",
+        _.city_l.upper(),
+        # passthrough columns don't count
+        lambda t: t.mutate(foo=1),
+    ]
+    assert wide_links.with_both(needed_by=needed_by).columns == (
+        "record_id_l",
+        "record_id_r",
+        "age_l",
+        "city_l",
+        "age_r",
+        "city_r",
+    )
+
+
+def test_LinksTable_with_both_needed_by_through_projections(wide_links):
+    def compare_names(t):
+        t = t.mutate(tmp=1)
+        t = t.filter(t.age_r > 0)
+        return t.mutate(m=t.name_l == t.name_r)
+
+    assert wide_links.with_both(needed_by=[compare_names]).columns == (
+        "record_id_l",
+        "record_id_r",
+        "name_l",
+        "name_r",
+        "age_r",
+    )
+    # Nothing is needed from the right, so none of its columns are added.
+    assert wide_links.with_both(
+        needed_by=[lambda t: t.mutate(m=t.age_l > 0)]
+    ).columns == (
+        "record_id_l",
+        "record_id_r",
+        "age_l",
+    )
+
+
+def test_LinksTable_with_both_needed_by_cached_comparer(wide_links, tmp_path):
+    from ibis_enum import IbisEnum
+
+    from mismo.compare import CachedComparer, EnumComparer
+
+    class Level(IbisEnum):
+        SAME = 0
+        ELSE = 1
+
+    comparer = EnumComparer(
+        "name", Level, [(_.name_l == _.name_r, Level.SAME), (True, Level.ELSE)]
+    )
+    cached = CachedComparer(comparer, tmp_path, columns=["name", "city"])
+    pruned = wide_links.with_both(needed_by=[cached])
+    assert pruned.columns == (
+        "record_id_l",
+        "record_id_r",
+        "name_l",
+        "city_l",
+        "name_r",
+        "city_r",
+    )
+    # Finding the columns didn't run the comparer and write to its cache.
+    assert not any(tmp_path.rglob("*.parquet"))
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import mismo
+from mismo import TableStats
+
+
+def test_table_stats(table_factory):
+    t = table_factory({"record_id": [1, 2, 2, None], "name": ["a", None, None, "b"]})
+    stats = TableStats.of(t, distinct=["record_id"])
+    assert stats.n_rows == 4
+    assert dict(stats.n_distinct) == {"record_id": 2}
+    assert dict(stats.n_null) == {"record_id": 1, "name": 2}
+    # cached for equal expressions
+    assert TableStats.of(t, distinct=["record_id"]) is stats
+    assert TableStats.of(t.view(), distinct=["record_id"]) is not stats
+    assert "n_rows=4" in repr(stats)
+
+
+def test_linkage_stats(table_factory):
+    left = table_factory({"record_id": [1, 2, 3]})
+    right = table_factory({"record_id": [10, 20]})
+    links = table_factory({"record_id_l": [1, 1, 2], "record_id_r": [10, 20, 20]})
+    linkage = mismo.Linkage(left=left, right=right, links=links)
+    assert dict(linkage.links.stats().n_distinct) == {
+        "record_id_l": 2,
+        "record_id_r": 2,
+    }
+    assert linkage.left.stats().n_rows == 3
+    # Each access of .links makes a new wrapper, but the stats are reused
+    assert linkage.links.stats() is linkage.links.stats()
+    assert repr(linkage) == "Linkage<left=3, right=2, links=3>"
@@ -184,3 +184,32 @@ def test_union_table_schema_consistency(table1, table_factory):
 
     with pytest.raises(RelationError):
         UnionTable([table1, mismatched_table])
+
+
+@pytest.mark.parametrize("limit", [None, 0, 2, 4, 100])
+def test_union_table_to_pyarrow_batches(table1, table2, table3, limit):
+    union_table = UnionTable([table1, table2, table3])
+    reader = union_table.to_pyarrow_batches(limit=limit, chunk_size=1)
+    assert reader.schema == union_table.schema().to_pyarrow()
+    result = reader.read_all().column("id").to_pylist()
+    assert result == [1, 2, 3, 4, 5, 6][:limit]
+
+
+def test_union_table_streams_through_linkage(table_factory, monkeypatch):
+    import mismo
+
+    calls = []
+    original = UnionTable.to_pyarrow_batches
+
+    def spy(self, /, **kwargs):
+        calls.append(len(self.tables))
+        return original(self, **kwargs)
+
+    monkeypatch.setattr(UnionTable, "to_pyarrow_batches", spy)
+    left = table_factory({"record_id": [1, 2, 3], "x": [1, 2, 3]})
+    right = table_factory({"record_id": [1, 2, 3], "x": [1, 1, 3]})
+    linker = mismo.linker.OrLinker([("x", "x"), ("record_id", "record_id")])
+    links = linker(left, right).links
+    streamed = links.to_pyarrow_batches().read_all()
+    assert calls == [2]
+    assert streamed.num_rows == links.count().execute()
@@ -72,3 +72,50 @@ def test_cache(updates: Updates):
     f = updates.cache()
     assert isinstance(f, Updates)
     assert (f.execute() == updates.execute()).all().all()
+
+
+def _rows(t):
+    return sorted(t.order_by("id").execute().itertuples(index=False, name=None))
+
+
+def test_apply_to_by_key(updates: Updates, table_factory):
+    assert updates.join_on == "id"
+    assert updates.filter(_.id.before == 3).join_on == "id"
+    assert updates.cache().join_on == "id"
+    # The rows in t don't exactly equal updates.before(),
+    # but they are still found by their id.
+    t = table_factory(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "name": ["Alice", None, "Charles", "David", "Eve"],
+            "age": [10, 20, 31, 40, 50],
+        }
+    )
+    result = updates.filter(updates.id.before >= 3).apply_to(t)
+    assert _rows(result) == [
+        (1, "Alice", 10),
+        (2, None, 20),
+        (3, "Charlie", 99),
+        (4, None, 99),
+        (5, "Eve", 50),
+    ]
+
+
+def test_merge_into(updates: Updates, backend, table_factory):
+    t = table_factory(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "name": ["Alice", None, "Charlie", "David", "Eve"],
+            "age": [10, 20, 30, 40, 50],
+        }
+    )
+    expected = _rows(updates.apply_to(t))
+    updates.merge_into(t)
+    assert _rows(backend.table(t.op().name)) == expected
+
+    with pytest.raises(TypeError, match="physical table"):
+        updates.merge_into(t.filter(_.id > 1))
+    keyless = Updates(updates.__wrapped__)
+    assert keyless.join_on is None
+    with pytest.raises(ValueError, match="join_on"):
+        keyless.merge_into(t)
@@ -7,3 +7,4 @@ from mismo.vector._vector import dot as dot
 from mismo.vector._vector import mul as mul
 from mismo.vector._vector import norm as norm
 from mismo.vector._vector import normalize as normalize
+from mismo.vector._vector import to_sparse as to_sparse
@@ -23,14 +23,17 @@ def _array_dot_product(a, b) -> float: ...  # ty:ignore[empty-body]
 def _array_cosine_similarity(a, b) -> float: ...  # ty:ignore[empty-body]
 
 
-T = TypeVar("T", ir.MapValue, ir.ArrayValue)
+T = TypeVar("T", ir.MapValue, ir.ArrayValue, ir.StructValue)
+
+_SPARSE_TYPE = dt.Struct({"indices": "array<int32>", "values": "array<float32>"})
 
 
 def dot(a: T, b: T) -> ir.FloatingValue:
     """Compute the dot product of two vectors
 
     The vectors can either be dense vectors, represented as array<numeric>,
-    or sparse vectors, represented as map<any_type, numeric>.
+    sparse vectors, represented as map<any_type, numeric>,
+    or sorted sparse vectors as created by [to_sparse][mismo.vector.to_sparse].
     Both vectors must be of the same type though.
 
     Parameters
@@ -48,7 +51,7 @@ def dot(a: T, b: T) -> ir.FloatingValue:
     Examples
     --------
     >>> import ibis
-    >>> from mismo.vector import dot
+    >>> from mismo.vector import dot, to_sparse
     >>> v1 = ibis.array([1, 2])
     >>> v2 = ibis.array([4, 5])
     >>> dot(v1, v2).execute()  # 1*4 + 2*5
@@ -57,7 +60,11 @@ def dot(a: T, b: T) -> ir.FloatingValue:
     >>> m2 = ibis.map({"b": 3, "c": 4})
     >>> dot(m1, m2).execute()  # 2*3
     6.0
+    >>> dot(to_sparse(m1), to_sparse(m2)).execute()
+    6.0
     """
+    if _is_sparse(a) and _is_sparse(b):
+        return _sparse_dot(a, b)
     a_vals, b_vals = _shared_vals(a, b)
     return _array_dot_product(a_vals, b_vals)
 
@@ -66,7 +73,8 @@ def cosine_similarity(a: T, b: T) -> ir.FloatingValue:
     """Compute the cosine similarity of two vectors
 
     The vectors can either be dense vectors, represented as array<numeric>,
-    or sparse vectors, represented as map<any_type, numeric>.
+    sparse vectors, represented as map<any_type, numeric>,
+    or sorted sparse vectors as created by [to_sparse][mismo.vector.to_sparse].
     Both vectors must be of the same type though.
 
     Parameters
@@ -76,6 +84,13 @@ def cosine_similarity(a: T, b: T) -> ir.FloatingValue:
     b :
         The second vector.
 
+    For maps, only the keys that both vectors have are used, for the norms as
+    well as for the dot product. Eg `{a: 1, b: 1}` and `{a: 2, c: 2}` have a
+    similarity of 1.0, and maps that share no keys have a similarity of NaN.
+    Sorted sparse vectors use the norms of the whole vectors, so the same
+    two vectors have a similarity of 0.5, and vectors that share no keys
+    have a similarity of 0.0. So don't mix similarities of the two kinds.
+
     Returns
     -------
     FloatingValue
@@ -98,6 +113,8 @@ def cosine_similarity(a: T, b: T) -> ir.FloatingValue:
     >>> cosine_similarity(ibis.array([1, 0]), ibis.array([0, 1])).execute()
     0.0
     """  # noqa: E501
+    if _is_sparse(a) and _is_sparse(b):
+        return _sparse_dot(a, b) / (_sparse_norm(a) * _sparse_norm(b))
     a_vals, b_vals = _shared_vals(a, b)
     return _array_cosine_similarity(a_vals, b_vals)
 
@@ -130,7 +147,8 @@ def norm(vec: T, *, metric: Literal["l1", "l2"] = "l2") -> ir.FloatingValue:
     """Compute the norm (length) of a vector.
 
     The vector can either be a dense vector, represented as array<numeric>,
-    or a sparse vector, represented as map<any_type, numeric>.
+    a sparse vector, represented as map<any_type, numeric>,
+    or a sorted sparse vector as created by [to_sparse][mismo.vector.to_sparse].
 
     Parameters
     ----------
@@ -158,6 +176,8 @@ def norm(vec: T, *, metric: Literal["l1", "l2"] = "l2") -> ir.FloatingValue:
         vals = vec
     elif isinstance(vec, ir.MapValue):
         vals = map_values(vec)
+    elif _is_sparse(vec):
+        vals = vec["values"].cast("array<float64>")
     else:
         raise ValueError(f"Unsupported type {type(vec)}")
 
@@ -185,7 +205,8 @@ def normalize(vec: T, *, metric: Literal["l1", "l2"] = "l2") -> T:
     """Normalize a vector to have unit length.
 
     The vector can either be a dense vector, represented as array<numeric>,
-    or a sparse vector, represented as map<any_type, numeric>.
+    a sparse vector, represented as map<any_type, numeric>,
+    or a sorted sparse vector as created by [to_sparse][mismo.vector.to_sparse].
     The returned vector will have the same type as the input vector.
 
     Parameters
@@ -219,10 +240,120 @@ def normalize(vec: T, *, metric: Literal["l1", "l2"] = "l2") -> T:
         vals = map_values(vec)
         normed_vals = vals.map(lambda x: x / denom)
         return cast(T, map_(map_keys(vec), normed_vals))
+    elif _is_sparse(vec):
+        value_type = vec["values"].type()
+        normed_vals = vec["values"].map(lambda x: x / denom).cast(value_type)
+        return cast(T, ibis.struct({"indices": vec["indices"], "values": normed_vals}))
     else:
         raise ValueError(f"Unsupported type {type(vec)}")
 
 
+def to_sparse(vec: ir.MapValue | ir.StructValue) -> ir.StructValue:
+    """Convert a vector to a sorted sparse vector.
+
+    A sorted sparse vector is a `struct<indices: array<int32>, values: array<float32>>`,
+    where `indices` are unique and sorted ascending,
+    and `values` holds the value at each index.
+    This is a compact representation, with integer indices no matter what
+    the keys of the map are.
+    [dot][mismo.vector.dot] of two sorted sparse vectors gives the same result
+    as for the maps they were converted from, up to the rounding of the values
+    to float32, and is a little faster.
+    See [cosine_similarity][mismo.vector.cosine_similarity] for how it differs
+    between maps and sorted sparse vectors.
+
+    Parameters
+    ----------
+    vec :
+        Either
+
+        - A sparse vector, represented as map<any_type, numeric>.
+          Integer keys are used as indices directly, so they must fit in an
+          int32. Larger keys are an error, rather than silently wrapping around.
+          Other keys are hashed into indices, so they must be converted
+          the same way for vectors that are compared against each other.
+          The values of keys that hash to the same index are summed.
+        - A `struct<indices: array<integer>, values: array<numeric>>`,
+          eg as created by [TfIdfModel.transform][mismo.sets.TfIdfModel.transform].
+          The indices must already be unique and sorted.
+
+    Returns
+    -------
+    StructValue
+        The sorted sparse vector.
+
+    Examples
+    --------
+    >>> import ibis
+    >>> from mismo.vector import to_sparse
+    >>> to_sparse(ibis.map({3: 1.5, 1: 2})).execute()
+    {'indices': [1, 3], 'values': [2.0, 1.5]}
+    """
+    if _is_sparse(vec):
+        return cast(ir.StructValue, vec.cast(_SPARSE_TYPE))
+    if not isinstance(vec, ir.MapValue):
+        raise ValueError(f"Unsupported type {type(vec)}")
+    keys = map_keys(vec)
+    vals = map_values(vec).cast("array<float32>")
+    if cast(dt.Map, vec.type()).key_type.is_integer():
+        indices = keys.cast("array<int32>").sort()
+        values = indices.map(lambda i: vec[i.cast(keys.type().value_type)])
+    else:
+        hashed = keys.map(_hash_index)
+        indices = hashed.unique().sort()
+        values = indices.map(lambda i: vals.filter(lambda v, j: hashed[j] == i).sums())
+    return cast(
+        ir.StructValue,
+        vec.isnull().ifelse(
+            ibis.null(_SPARSE_TYPE),
+            ibis.struct({"indices": indices, "values": values}).cast(_SPARSE_TYPE),
+        ),
+    )
+
+
+def _hash_index(key: ir.Value) -> ir.IntegerValue:
+    # The hash can be negative, so wrap into [0, 2**31)
+    n = 2**31
+    return ((key.hash() % n + n) % n).cast("int32")
+
+
+def _is_sparse(vec: ir.Value) -> bool:
+    if not isinstance(vec, ir.StructValue):
+        return False
+    return set(cast(dt.Struct, vec.type()).names) == {"indices", "values"}
+
+
+def _sparse_dot(a: ir.StructValue, b: ir.StructValue) -> ir.FloatingValue:
+    # duckdb's list functions have no merge of two sorted lists, so look up
+    # each index of `a` in `b`, lining up the values of `b` with those of `a`,
+    # with 0 where `b` doesn't have the index.
+    a_vals = a["values"].cast("array<float64>")
+    b_vals = b["values"].cast("array<float64>")
+    b_idx = b["indices"]
+
+    def b_val(i: ir.IntegerValue) -> ir.FloatingValue:
+        pos = _list_position(b_idx, i)
+        return pos.isnull().ifelse(0.0, _list_extract(b_vals, pos))
+
+    result = _array_dot_product(a_vals, a["indices"].map(b_val))
+    return b.isnull().ifelse(ibis.null("float64"), result)
+
+
+def _sparse_norm(vec: ir.StructValue) -> ir.FloatingValue:
+    vals = vec["values"].cast("array<float64>")
+    return _array_dot_product(vals, vals).sqrt()
+
+
+# for duckdb, 1-based, NULL if not found
+@ibis.udf.scalar.builtin(name="list_position")
+def _list_position(a, x) -> int: ...  # ty:ignore[empty-body]
+
+
+# for duckdb, 1-based
+@ibis.udf.scalar.builtin(name="list_extract")
+def _list_extract(a, i) -> float: ...  # ty:ignore[empty-body]
+
+
 def _shared_keys(a: ir.MapValue, b: ir.MapValue) -> ir.ArrayValue:
     regular = map_keys(a).filter(lambda k: b.contains(k))
     key_type = cast(dt.Map, a.type()).key_type
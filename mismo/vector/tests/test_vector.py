@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import math
+
 import ibis
+from ibis.expr import datatypes as dt
 import pandas as pd
 import pytest
 
@@ -267,3 +270,145 @@ def test_mul(a, b, expected):
         assert pd.isna(result)
     else:
         assert result == expected
+
+
+@pytest.mark.parametrize(
+    "m, expected",
+    [
+        pytest.param(
+            ibis.literal({3: 1.5, 1: 2.0}, "map<int64, float64>"),
+            {"indices": [1, 3], "values": [2.0, 1.5]},
+            id="int_keys",
+        ),
+        pytest.param(
+            ibis.literal({}, "map<int64, float64>"),
+            {"indices": [], "values": []},
+            id="empty",
+        ),
+        pytest.param(
+            ibis.literal(None, "map<int64, float64>"),
+            None,
+            id="null",
+        ),
+        pytest.param(
+            ibis.struct({"indices": [1, 4], "values": [0.5, 0.25]}),
+            {"indices": [1, 4], "values": [0.5, 0.25]},
+            id="tfidf_struct",
+        ),
+    ],
+)
+def test_to_sparse(m, expected):
+    result = vector.to_sparse(m)
+    assert result.type() == dt.dtype(
+        "struct<indices: array<int32>, values: array<float32>>"
+    )
+    assert result.execute() == expected
+
+
+def test_to_sparse_hashed_keys():
+    result = vector.to_sparse(ibis.map({"a": 1, "b": 2, "c": 3})).execute()
+    assert result["indices"] == sorted(result["indices"])
+    assert sorted(result["values"]) == [1.0, 2.0, 3.0]
+
+
+def test_to_sparse_int_keys_out_of_range():
+    with pytest.raises(Exception, match="(?i)out of range|conversion"):
+        vector.to_sparse(ibis.map({2**40: 1.0})).execute()
+
+
+def test_sparse_dot_negative_indices(table_factory):
+    t = table_factory(
+        {
+            "id": [0, 1, 2],
+            "a": [{-5: 1.0, 1: 1.0}, {-5: 2.0}, {-1: 2.0, 7: 1.0}],
+            "b": [{1: 1.0}, {}, {-5: 3.0, -1: 1.0}],
+        },
+        schema={"id": "int64", "a": "map<int32, float64>", "b": "map<int32, float64>"},
+    )
+    t = t.mutate(d=vector.dot(vector.to_sparse(t.a), vector.to_sparse(t.b)))
+    assert t.order_by("id").d.execute().tolist() == [1.0, 0.0, 2.0]
+
+
+def test_sparse_vector_ops(table_factory):
+    maps = [
+        ({"a": 1, "b": 2}, {"b": 3, "c": 4}),
+        ({"a": 1, "b": 1}, {"a": -2, "b": -2}),
+        ({}, {"a": 5}),
+        ({"x": 3, "y": 4}, {}),
+        (None, {"a": 5}),
+        ({"a": 5}, None),
+    ]
+    t = table_factory(
+        {"id": range(len(maps)), "a": [a for a, _ in maps], "b": [b for _, b in maps]},
+        schema={"id": "int64", "a": "map<string, int64>", "b": "map<string, int64>"},
+    )
+    t = t.mutate(sa=vector.to_sparse(t.a), sb=vector.to_sparse(t.b))
+    t = t.mutate(
+        map_dot=vector.dot(t.a, t.b),
+        sparse_dot=vector.dot(t.sa, t.sb),
+        map_norm=vector.norm(t.a),
+        sparse_norm=vector.norm(t.sa),
+        sparse_cos=vector.cosine_similarity(t.sa, t.sb),
+        sparse_normed_norm=vector.norm(vector.normalize(t.sa)),
+    )
+    df = t.order_by("id").execute()
+    assert df.sparse_dot.tolist()[:4] == [6.0, -4.0, 0.0, 0.0]
+    assert df.sparse_dot.isna().tolist() == [False] * 4 + [True] * 2
+    pd.testing.assert_series_equal(df.sparse_dot, df.map_dot, check_names=False)
+    pd.testing.assert_series_equal(df.sparse_norm, df.map_norm, check_names=False)
+    assert df.sparse_cos[0] == pytest.approx(6 / (5**0.5 * 5))
+    assert df.sparse_cos[1] == pytest.approx(-1.0)
+    assert df.sparse_normed_norm[0] == pytest.approx(1.0)
+
+
+def test_sparse_matches_map(table_factory):
+    maps = [
+        ({"a": 1, "b": 1}, {"a": 2, "c": 2}),
+        ({"a": 1}, {"b": 1}),
+        ({"a": 0.5}, {"a": 4}),
+        ({"a": 1}, {}),
+        ({}, {}),
+        (None, {"a": 1}),
+        ({"a": 1}, None),
+    ]
+    t = table_factory(
+        {"id": range(len(maps)), "a": [a for a, _ in maps], "b": [b for _, b in maps]},
+        schema={
+            "id": "int64",
+            "a": "map<string, float64>",
+            "b": "map<string, float64>",
+        },
+    )
+    sa, sb = vector.to_sparse(t.a), vector.to_sparse(t.b)
+    df = (
+        t.mutate(
+            map_dot=vector.dot(t.a, t.b),
+            sparse_dot=vector.dot(sa, sb),
+            full_cos=vector.dot(t.a, t.b) / (vector.norm(t.a) * vector.norm(t.b)),
+            map_cos=vector.cosine_similarity(t.a, t.b),
+            sparse_cos=vector.cosine_similarity(sa, sb),
+        )
+        .order_by("id")
+        .execute()
+    )
+    pd.testing.assert_series_equal(df.sparse_dot, df.map_dot, check_names=False)
+    # sparse vectors use the norms of the whole vectors
+    pd.testing.assert_series_equal(df.sparse_cos, df.full_cos, check_names=False)
+    # maps only use the shared keys
+    assert df.map_cos[0] == pytest.approx(1.0)
+    assert df.sparse_cos[0] == pytest.approx(0.5)
+    assert math.isnan(df.map_cos[1])
+    assert df.sparse_cos[1] == 0.0
+
+
+def test_sparse_dot_nan_and_null_values():
+    def sparse(m):
+        return vector.to_sparse(ibis.literal(m, "map<string, float64>"))
+
+    # NaN propagates and NULL values are an error, like for maps,
+    # instead of either being treated as 0
+    assert math.isnan(
+        vector.dot(sparse({"a": float("nan")}), sparse({"a": 1})).execute()
+    )
+    with pytest.raises(Exception, match="NULL"):
+        vector.dot(sparse({"a": None, "b": 1.0}), sparse({"a": 1.0})).execute()